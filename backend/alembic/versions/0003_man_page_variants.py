@@ -0,0 +1,69 @@
+"""man page variants
+
+Revision ID: 0003_man_page_variants
+Revises: 0002_dataset_release_distro
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0003_man_page_variants"
+down_revision = "0002_dataset_release_distro"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "man_page_variants",
+        sa.Column("locale", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("section", sa.String(), nullable=False),
+        sa.Column("variants", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("etag_key", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("locale", "name", "section"),
+    )
+
+    # Backfill for releases that were activated before this table existed; later
+    # activations rebuild it through app.datasets.activation.
+    op.execute(
+        """
+        INSERT INTO man_page_variants (locale, name, section, variants, etag_key)
+        SELECT
+          r.locale,
+          p.name,
+          p.section,
+          jsonb_agg(
+            jsonb_build_object(
+              'distro', r.distro,
+              'datasetReleaseId', r.dataset_release_id,
+              'contentSha256', p.content_sha256
+            )
+            ORDER BY array_position(
+              ARRAY['debian', 'ubuntu', 'fedora', 'arch', 'alpine', 'freebsd', 'macos'],
+              r.distro
+            ) NULLS LAST, r.distro
+          ),
+          string_agg(
+            concat_ws(':', r.distro, r.dataset_release_id, p.content_sha256), ','
+            ORDER BY array_position(
+              ARRAY['debian', 'ubuntu', 'fedora', 'arch', 'alpine', 'freebsd', 'macos'],
+              r.distro
+            ) NULLS LAST, r.distro
+          )
+        FROM dataset_releases r
+        JOIN man_pages p ON p.dataset_release_id = r.id
+        WHERE r.is_active
+        GROUP BY r.locale, p.name, p.section
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("man_page_variants")
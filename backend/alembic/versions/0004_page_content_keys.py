@@ -0,0 +1,102 @@
+"""page content keys
+
+Revision ID: 0004_page_content_keys
+Revises: 0003_man_page_variants
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0004_page_content_keys"
+down_revision = "0003_man_page_variants"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("man_pages", sa.Column("content_unchanged_since", sa.String(), nullable=True))
+    op.add_column(
+        "man_page_variants",
+        sa.Column("content_key", sa.Text(), nullable=False, server_default=""),
+    )
+
+    # A page's marker is the first release of its current run of identical content
+    # within (locale, distro), in ingestion order.
+    op.execute(
+        """
+        WITH ordered AS (
+          SELECT
+            p.id,
+            r.dataset_release_id,
+            r.locale,
+            r.distro,
+            p.name,
+            p.section,
+            r.ingested_at,
+            p.content_sha256 IS DISTINCT FROM lag(p.content_sha256) OVER w AS starts_run
+          FROM man_pages p
+          JOIN dataset_releases r ON r.id = p.dataset_release_id
+          WINDOW w AS (
+            PARTITION BY r.locale, r.distro, p.name, p.section
+            ORDER BY r.ingested_at, r.dataset_release_id
+          )
+        ),
+        runs AS (
+          SELECT
+            *,
+            count(*) FILTER (WHERE starts_run) OVER (
+              PARTITION BY locale, distro, name, section
+              ORDER BY ingested_at, dataset_release_id
+            ) AS run
+          FROM ordered
+        ),
+        markers AS (
+          SELECT
+            id,
+            first_value(dataset_release_id) OVER (
+              PARTITION BY locale, distro, name, section, run
+              ORDER BY ingested_at, dataset_release_id
+            ) AS since
+          FROM runs
+        )
+        UPDATE man_pages p
+        SET content_unchanged_since = markers.since
+        FROM markers
+        WHERE markers.id = p.id
+        """
+    )
+
+    op.execute(
+        """
+        UPDATE man_page_variants v
+        SET content_key = keys.content_key
+        FROM (
+          SELECT
+            r.locale,
+            p.name,
+            p.section,
+            string_agg(
+              concat_ws(':', r.distro, p.content_sha256), ','
+              ORDER BY array_position(
+                ARRAY['debian', 'ubuntu', 'fedora', 'arch', 'alpine', 'freebsd', 'macos'],
+                r.distro
+              ) NULLS LAST, r.distro
+            ) AS content_key
+          FROM dataset_releases r
+          JOIN man_pages p ON p.dataset_release_id = r.id
+          WHERE r.is_active
+          GROUP BY r.locale, p.name, p.section
+        ) keys
+        WHERE keys.locale = v.locale AND keys.name = v.name AND keys.section = v.section
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("man_page_variants", "content_key")
+    op.drop_column("man_pages", "content_unchanged_since")
@@ -0,0 +1,53 @@
+"""served content hash
+
+Revision ID: 0005_served_content_hash
+Revises: 0004_page_content_keys
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0005_served_content_hash"
+down_revision = "0004_page_content_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("man_page_content", sa.Column("served_sha256", sa.String(), nullable=True))
+
+    # Same expression as app.man.repository.SERVED_CONTENT_SHA256.
+    op.execute(
+        """
+        UPDATE man_page_content
+        SET served_sha256 = encode(
+          sha256(
+            convert_to(
+              (
+                doc || jsonb_build_object(
+                  'synopsis', synopsis, 'options', options, 'seeAlso', see_also
+                )
+              )::text,
+              'UTF8'
+            )
+          ),
+          'hex'
+        )
+        """
+    )
+
+    op.create_index(
+        "ix_man_page_content_served_sha256",
+        "man_page_content",
+        ["served_sha256"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_man_page_content_served_sha256", table_name="man_page_content")
+    op.drop_column("man_page_content", "served_sha256")
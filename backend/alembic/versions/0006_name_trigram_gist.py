@@ -0,0 +1,30 @@
+"""name trigram gist index
+
+Revision ID: 0006_name_trigram_gist
+Revises: 0005_served_content_hash
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0006_name_trigram_gist"
+down_revision = "0005_served_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_man_page_search_name_trgm_gist",
+        "man_page_search",
+        ["name_norm"],
+        postgresql_using="gist",
+        postgresql_ops={"name_norm": "gist_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_man_page_search_name_trgm_gist", table_name="man_page_search")
@@ -0,0 +1,29 @@
+"""name_norm hash index
+
+Revision ID: 0007_name_norm_hash
+Revises: 0006_name_trigram_gist
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0007_name_norm_hash"
+down_revision = "0006_name_trigram_gist"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_man_page_search_name_norm_hash",
+        "man_page_search",
+        ["name_norm"],
+        postgresql_using="hash",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_man_page_search_name_norm_hash", table_name="man_page_search")
@@ -0,0 +1,99 @@
+"""release section stats
+
+Revision ID: 0008_release_section_stats
+Revises: 0007_name_norm_hash
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0008_release_section_stats"
+down_revision = "0007_name_norm_hash"
+branch_labels = None
+depends_on = None
+
+# Mirrors app.man.sections at the time of this revision.
+_SECTION_LABELS = {
+    "1": "User Commands",
+    "2": "System Calls",
+    "3": "Library Calls",
+    "4": "Special Files",
+    "5": "File Formats",
+    "6": "Games",
+    "7": "Miscellaneous",
+    "8": "System Administration",
+    "9": "Kernel",
+}
+_SECTION_SUFFIX_LABELS = {
+    "p": "POSIX",
+    "ssl": "OpenSSL",
+}
+
+
+def _section_label(section: str) -> str:
+    section_norm = section.strip().lower()
+    if section_norm in _SECTION_LABELS:
+        return _SECTION_LABELS[section_norm]
+
+    if section_norm and section_norm[0] in _SECTION_LABELS:
+        base = _SECTION_LABELS[section_norm[0]]
+        suffix = section_norm[1:]
+        if not suffix:
+            return base
+        suffix_label = _SECTION_SUFFIX_LABELS.get(suffix)
+        return f"{base} ({suffix_label or suffix})"
+
+    return section_norm
+
+
+def upgrade() -> None:
+    op.create_table(
+        "release_section_stats",
+        sa.Column("dataset_release_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("section", sa.String(), nullable=False),
+        sa.Column("label", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["dataset_release_id"], ["dataset_releases.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("dataset_release_id", "section"),
+    )
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            """
+            SELECT dataset_release_id, section, count(*) AS total
+            FROM man_pages
+            GROUP BY dataset_release_id, section
+            """
+        )
+    ).all()
+    if rows:
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO release_section_stats (dataset_release_id, section, label, total)
+                VALUES (:dataset_release_id, :section, :label, :total)
+                """
+            ),
+            [
+                {
+                    "dataset_release_id": row.dataset_release_id,
+                    "section": row.section,
+                    "label": _section_label(row.section),
+                    "total": row.total,
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("release_section_stats")
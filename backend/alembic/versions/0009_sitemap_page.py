@@ -0,0 +1,52 @@
+"""man page sitemap shard
+
+Revision ID: 0009_sitemap_page
+Revises: 0008_release_section_stats
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0009_sitemap_page"
+down_revision = "0008_release_section_stats"
+branch_labels = None
+depends_on = None
+
+# Mirrors app.datasets.sitemap.SITEMAP_URLS_PER_FILE at the time of this revision.
+_URLS_PER_FILE = 10_000
+
+
+def upgrade() -> None:
+    op.add_column("man_pages", sa.Column("sitemap_page", sa.Integer(), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            UPDATE man_pages
+            SET sitemap_page = ranked.sitemap_page
+            FROM (
+              SELECT
+                id,
+                (row_number() OVER (
+                  PARTITION BY dataset_release_id ORDER BY name, section
+                ) - 1) / :urls_per_file + 1 AS sitemap_page
+              FROM man_pages
+            ) AS ranked
+            WHERE man_pages.id = ranked.id
+            """
+        ).bindparams(urls_per_file=_URLS_PER_FILE)
+    )
+    op.create_index(
+        "ix_man_pages_release_sitemap_page",
+        "man_pages",
+        ["dataset_release_id", "sitemap_page", "name", "section"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_man_pages_release_sitemap_page", table_name="man_pages")
+    op.drop_column("man_pages", "sitemap_page")
@@ -0,0 +1,48 @@
+"""search snippet text
+
+Revision ID: 0010_search_snippet_text
+Revises: 0009_sitemap_page
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0010_search_snippet_text"
+down_revision = "0009_sitemap_page"
+branch_labels = None
+depends_on = None
+
+# Mirrors app.man.search.SNIPPET_TEXT at the time of this revision.
+_SNIPPET_TEXT_MAX_CHARS = 4000
+
+
+def upgrade() -> None:
+    op.add_column("man_page_search", sa.Column("snippet_text", sa.Text(), nullable=True))
+    op.execute(
+        sa.text(
+            r"""
+            UPDATE man_page_search
+            SET snippet_text = left(
+              btrim(
+                regexp_replace(
+                  concat_ws(' ', man_pages.description, man_page_content.plain_text),
+                  '\s+', ' ', 'g'
+                )
+              ),
+              :max_chars
+            )
+            FROM man_pages, man_page_content
+            WHERE man_page_search.man_page_id = man_pages.id
+              AND man_page_content.man_page_id = man_pages.id
+            """
+        ).bindparams(max_chars=_SNIPPET_TEXT_MAX_CHARS)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("man_page_search", "snippet_text")
@@ -0,0 +1,85 @@
+"""search rank prior
+
+Revision ID: 0011_search_rank_prior
+Revises: 0010_search_snippet_text
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0011_search_rank_prior"
+down_revision = "0010_search_snippet_text"
+branch_labels = None
+depends_on = None
+
+# Mirrors app.datasets.link_rank at the time of this revision.
+_DAMPING = 0.85
+_ITERATIONS = 20
+
+
+def _link_rank(page_ids: list, links: set) -> dict:
+    n = len(page_ids)
+    position = {page_id: i for i, page_id in enumerate(page_ids)}
+    targets: list[list[int]] = [[] for _ in range(n)]
+    for from_id, to_id in links:
+        if from_id != to_id and from_id in position and to_id in position:
+            targets[position[from_id]].append(position[to_id])
+
+    rank = [1.0 / n] * n
+    for _ in range(_ITERATIONS):
+        dangling = sum(r for r, out in zip(rank, targets, strict=True) if not out)
+        next_rank = [(1.0 - _DAMPING + _DAMPING * dangling) / n] * n
+        for r, out in zip(rank, targets, strict=True):
+            for i in out:
+                next_rank[i] += _DAMPING * r / len(out)
+        rank = next_rank
+
+    top = max(rank)
+    return {page_id: rank[i] / top for page_id, i in position.items()}
+
+
+def upgrade() -> None:
+    op.add_column(
+        "man_page_search",
+        sa.Column("rank_prior", sa.Float(), nullable=False, server_default="0"),
+    )
+
+    conn = op.get_bind()
+    release_ids = conn.execute(sa.text("SELECT id FROM dataset_releases")).scalars().all()
+    for release_id in release_ids:
+        page_ids = (
+            conn.execute(
+                sa.text("SELECT id FROM man_pages WHERE dataset_release_id = :release_id"),
+                {"release_id": release_id},
+            )
+            .scalars()
+            .all()
+        )
+        if not page_ids:
+            continue
+        links = conn.execute(
+            sa.text(
+                """
+                SELECT l.from_page_id, l.to_page_id
+                FROM man_page_links AS l
+                JOIN man_pages AS p ON p.id = l.from_page_id
+                WHERE p.dataset_release_id = :release_id
+                  AND l.link_type IN ('see_also', 'xref')
+                """
+            ),
+            {"release_id": release_id},
+        ).all()
+        priors = _link_rank(page_ids, {(row[0], row[1]) for row in links})
+        conn.execute(
+            sa.text("UPDATE man_page_search SET rank_prior = :prior WHERE man_page_id = :page_id"),
+            [{"page_id": page_id, "prior": prior} for page_id, prior in priors.items()],
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("man_page_search", "rank_prior")
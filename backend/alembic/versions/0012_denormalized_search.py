@@ -0,0 +1,78 @@
+"""denormalized, weighted man_page_search
+
+Revision ID: 0012_denormalized_search
+Revises: 0011_search_rank_prior
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0012_denormalized_search"
+down_revision = "0011_search_rank_prior"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "man_page_search",
+        sa.Column("dataset_release_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.add_column("man_page_search", sa.Column("name", sa.String(), nullable=True))
+    op.add_column("man_page_search", sa.Column("section", sa.String(), nullable=True))
+    op.add_column("man_page_search", sa.Column("title", sa.String(), nullable=True))
+    op.add_column("man_page_search", sa.Column("description", sa.String(), nullable=True))
+
+    # Mirrors app.man.search.SEARCH_TSV at the time of this revision.
+    op.execute(
+        """
+        UPDATE man_page_search
+        SET dataset_release_id = man_pages.dataset_release_id,
+            name = man_pages.name,
+            section = man_pages.section,
+            title = man_pages.title,
+            description = man_pages.description,
+            tsv = setweight(to_tsvector('simple', man_pages.name), 'A')
+              || setweight(to_tsvector('simple', man_pages.description), 'B')
+              || setweight(
+                to_tsvector(
+                  'simple', jsonb_path_query_array(man_page_content.doc, '$.toc[*].title')
+                ),
+                'C'
+              )
+              || setweight(to_tsvector('simple', man_page_content.plain_text), 'D')
+        FROM man_pages, man_page_content
+        WHERE man_page_search.man_page_id = man_pages.id
+          AND man_page_content.man_page_id = man_pages.id
+        """
+    )
+
+    op.create_index(
+        "ix_man_page_search_release_name_norm",
+        "man_page_search",
+        ["dataset_release_id", "name_norm"],
+        postgresql_ops={"name_norm": "text_pattern_ops"},
+        postgresql_include=["man_page_id"],
+    )
+    op.drop_index("ix_man_page_search_name_norm_hash", table_name="man_page_search")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_man_page_search_name_norm_hash",
+        "man_page_search",
+        ["name_norm"],
+        postgresql_using="hash",
+    )
+    op.drop_index("ix_man_page_search_release_name_norm", table_name="man_page_search")
+    op.drop_column("man_page_search", "description")
+    op.drop_column("man_page_search", "title")
+    op.drop_column("man_page_search", "section")
+    op.drop_column("man_page_search", "name")
+    op.drop_column("man_page_search", "dataset_release_id")
@@ -0,0 +1,221 @@
+"""partition man_page_search by dataset release
+
+Revision ID: 0013_partition_man_page_search
+Revises: 0012_denormalized_search
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0013_partition_man_page_search"
+down_revision = "0012_denormalized_search"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    "man_page_id, tsv, name_norm, desc_norm, snippet_text, rank_prior, "
+    "dataset_release_id, name, section, title, description"
+)
+
+
+def _create_table(name: str, *, partitioned: bool) -> None:
+    kwargs = {"postgresql_partition_by": "LIST (dataset_release_id)"} if partitioned else {}
+    op.create_table(
+        name,
+        sa.Column("man_page_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tsv", postgresql.TSVECTOR(), nullable=False),
+        sa.Column("name_norm", sa.Text(), nullable=False),
+        sa.Column("desc_norm", sa.Text(), nullable=False),
+        sa.Column("snippet_text", sa.Text(), nullable=True),
+        sa.Column("rank_prior", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("dataset_release_id", postgresql.UUID(as_uuid=True), nullable=not partitioned),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("section", sa.String(), nullable=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        **kwargs,
+    )
+
+
+def _create_constraints_and_indexes() -> None:
+    op.create_foreign_key(
+        "man_page_search_man_page_id_fkey",
+        "man_page_search",
+        "man_pages",
+        ["man_page_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index("ix_man_page_search_tsv", "man_page_search", ["tsv"], postgresql_using="gin")
+    op.create_index(
+        "ix_man_page_search_release_name_norm",
+        "man_page_search",
+        ["dataset_release_id", "name_norm"],
+        postgresql_ops={"name_norm": "text_pattern_ops"},
+        postgresql_include=["man_page_id"],
+    )
+    op.create_index(
+        "ix_man_page_search_name_trgm",
+        "man_page_search",
+        ["name_norm"],
+        postgresql_using="gin",
+        postgresql_ops={"name_norm": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_man_page_search_name_trgm_gist",
+        "man_page_search",
+        ["name_norm"],
+        postgresql_using="gist",
+        postgresql_ops={"name_norm": "gist_trgm_ops"},
+    )
+    op.create_index(
+        "ix_man_page_search_desc_trgm",
+        "man_page_search",
+        ["desc_norm"],
+        postgresql_using="gin",
+        postgresql_ops={"desc_norm": "gin_trgm_ops"},
+    )
+
+
+def _attach_partition(conn, release_id) -> None:
+    # Mirrors app.datasets.partitions.attach_search_partition at the time of this revision.
+    partition = f"man_page_search_{release_id.hex}"
+    default_check = f"man_page_search_default_not_{release_id.hex}"
+    params = {"release_id": release_id}
+    conn.execute(sa.text(f"CREATE TABLE {partition} (LIKE man_page_search INCLUDING DEFAULTS)"))
+    conn.execute(
+        sa.text(
+            f"INSERT INTO {partition} SELECT * FROM man_page_search_default "
+            "WHERE dataset_release_id = :release_id"
+        ),
+        params,
+    )
+    conn.execute(
+        sa.text("DELETE FROM man_page_search_default WHERE dataset_release_id = :release_id"),
+        params,
+    )
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE {partition} ADD CONSTRAINT {partition}_pkey "
+            "PRIMARY KEY (man_page_id, dataset_release_id)"
+        )
+    )
+    indexes = conn.execute(
+        sa.text(
+            "SELECT schemaname, indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = 'man_page_search' "
+            "AND starts_with(indexname, 'ix_man_page_search_')"
+        )
+    ).all()
+    for index in indexes:
+        head = f"CREATE INDEX {index.indexname} ON ONLY {index.schemaname}.man_page_search "
+        suffix = index.indexname.removeprefix("ix_man_page_search_")
+        conn.execute(
+            sa.text(
+                f"CREATE INDEX ix_search_{release_id.hex}_{suffix} ON {partition} "
+                f"{index.indexdef.removeprefix(head)}"
+            )
+        )
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE {partition} ADD CONSTRAINT {partition}_bound "
+            f"CHECK (dataset_release_id IS NOT NULL AND dataset_release_id = '{release_id}')"
+        )
+    )
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE man_page_search_default ADD CONSTRAINT {default_check} "
+            f"CHECK (dataset_release_id IS NULL OR dataset_release_id <> '{release_id}')"
+        )
+    )
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE man_page_search ATTACH PARTITION {partition} "
+            f"FOR VALUES IN ('{release_id}')"
+        )
+    )
+    conn.execute(sa.text(f"ALTER TABLE {partition} DROP CONSTRAINT {partition}_bound"))
+    conn.execute(sa.text(f"ALTER TABLE man_page_search_default DROP CONSTRAINT {default_check}"))
+
+
+def upgrade() -> None:
+    # Rows of releases that were never activated don't have their release copied yet.
+    op.execute(
+        """
+        UPDATE man_page_search
+        SET dataset_release_id = man_pages.dataset_release_id
+        FROM man_pages
+        WHERE man_page_search.man_page_id = man_pages.id
+          AND man_page_search.dataset_release_id IS NULL
+        """
+    )
+
+    _create_table("man_page_search_partitioned", partitioned=True)
+    op.execute(
+        "CREATE TABLE man_page_search_default PARTITION OF man_page_search_partitioned DEFAULT"
+    )
+    op.execute(
+        f"INSERT INTO man_page_search_partitioned ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM man_page_search"
+    )
+    op.drop_table("man_page_search")
+    op.rename_table("man_page_search_partitioned", "man_page_search")
+    op.create_primary_key(
+        "man_page_search_pkey", "man_page_search", ["man_page_id", "dataset_release_id"]
+    )
+    _create_constraints_and_indexes()
+
+    # Activated releases get their own partition, as activation now gives them.
+    conn = op.get_bind()
+    release_ids = conn.execute(
+        sa.text("SELECT DISTINCT dataset_release_id FROM man_page_search WHERE name IS NOT NULL")
+    ).scalars()
+    for release_id in list(release_ids):
+        _attach_partition(conn, release_id)
+
+    # Ingestion doesn't know about the partition key; take it from the page.
+    op.execute(
+        """
+        CREATE FUNCTION man_page_search_set_release() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+          IF NEW.dataset_release_id IS NULL THEN
+            SELECT dataset_release_id INTO NEW.dataset_release_id
+            FROM man_pages WHERE id = NEW.man_page_id;
+          END IF;
+          RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER man_page_search_set_release
+        BEFORE INSERT ON man_page_search
+        FOR EACH ROW EXECUTE FUNCTION man_page_search_set_release()
+        """
+    )
+
+
+def downgrade() -> None:
+    _create_table("man_page_search_unpartitioned", partitioned=False)
+    op.execute(
+        f"INSERT INTO man_page_search_unpartitioned ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM man_page_search"
+    )
+    # Before this revision, rows not yet filled at activation had no release.
+    op.execute(
+        "UPDATE man_page_search_unpartitioned SET dataset_release_id = NULL WHERE name IS NULL"
+    )
+    # Drops the release partitions and the trigger with it.
+    op.drop_table("man_page_search")
+    op.execute("DROP FUNCTION man_page_search_set_release()")
+    op.rename_table("man_page_search_unpartitioned", "man_page_search")
+    op.create_primary_key("man_page_search_pkey", "man_page_search", ["man_page_id"])
+    _create_constraints_and_indexes()
@@ -0,0 +1,78 @@
+"""release-free page variants
+
+Revision ID: 0014_release_free_page_variants
+Revises: 0013_partition_man_page_search
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0014_release_free_page_variants"
+down_revision = "0013_partition_man_page_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Page bodies no longer carry release ids, so neither do their variants, and the
+    # response cache no longer needs a key that changes with them.
+    op.drop_column("man_page_variants", "etag_key")
+    op.execute(
+        """
+        UPDATE man_page_variants v
+        SET variants = (
+          SELECT jsonb_agg(item - 'datasetReleaseId' ORDER BY ord)
+          FROM jsonb_array_elements(v.variants) WITH ORDINALITY AS items(item, ord)
+        )
+        WHERE v.variants <> '[]'::jsonb
+        """
+    )
+
+
+def downgrade() -> None:
+    op.add_column(
+        "man_page_variants",
+        sa.Column("etag_key", sa.Text(), nullable=False, server_default=""),
+    )
+    # Mirrors app.datasets.activation.rebuild_page_variants before this revision.
+    op.execute(
+        """
+        UPDATE man_page_variants v
+        SET variants = keys.variants, etag_key = keys.etag_key
+        FROM (
+          SELECT
+            r.locale,
+            p.name,
+            p.section,
+            jsonb_agg(
+              jsonb_build_object(
+                'distro', r.distro,
+                'datasetReleaseId', r.dataset_release_id,
+                'contentSha256', p.content_sha256
+              )
+              ORDER BY array_position(
+                ARRAY['debian', 'ubuntu', 'fedora', 'arch', 'alpine', 'freebsd', 'macos'],
+                r.distro
+              ) NULLS LAST, r.distro
+            ) AS variants,
+            string_agg(
+              concat_ws(':', r.distro, r.dataset_release_id, p.content_sha256), ','
+              ORDER BY array_position(
+                ARRAY['debian', 'ubuntu', 'fedora', 'arch', 'alpine', 'freebsd', 'macos'],
+                r.distro
+              ) NULLS LAST, r.distro
+            ) AS etag_key
+          FROM dataset_releases r
+          JOIN man_pages p ON p.dataset_release_id = r.id
+          WHERE r.is_active
+          GROUP BY r.locale, p.name, p.section
+        ) keys
+        WHERE keys.locale = v.locale AND keys.name = v.name AND keys.section = v.section
+        """
+    )
+    op.alter_column("man_page_variants", "etag_key", server_default=None)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+
+from fastapi import APIRouter, Request, Response
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.schemas import ManPageContent
+from app.core.errors import APIError
+from app.db.session import get_session
+from app.man.repository import load_served_content
+from app.security.deps import rate_limit_page
+from app.web.http_cache import maybe_not_modified
+from app.web.response_cache import cached_json_response
+from app.web.server_timing import attach_server_timing, elapsed_ms, mark, server_timing_seed
+
+router = APIRouter()
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_SHA256_RE = re.compile(r"[0-9a-f]{64}")
+# Content outlives releases, so it has its own response cache namespace; entries are
+# never dropped on activation and expire with the L2 TTL.
+_CACHE_NAMESPACE = "content"
+
+
+@router.get("/content/{sha256}", response_model=ManPageContent)
+async def get_content(
+    request: Request,
+    sha256: str,
+    _: None = Depends(rate_limit_page),  # noqa: B008
+    session: AsyncSession = Depends(get_session),  # noqa: B008
+) -> ManPageContent | Response:
+    # Content is addressed by the hash of its served bytes, so it never changes.
+    server_timing = server_timing_seed(request)
+    if not _SHA256_RE.fullmatch(sha256):
+        raise APIError(
+            status_code=400,
+            code="INVALID_CONTENT_HASH",
+            message="Content hash must be 64 lowercase hex digits",
+        )
+
+    # The body is fixed by the hash, so the etag can be strong.
+    etag = f'"{sha256}"'
+    not_modified = maybe_not_modified(request, etag=etag, cache_control=IMMUTABLE_CACHE_CONTROL)
+    if not_modified is not None:
+        attach_server_timing(not_modified, server_timing)
+        return not_modified
+
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=_CACHE_NAMESPACE,
+        etag=sha256,
+        fill=lambda: _content_body(session, sha256, server_timing=server_timing),
+    )
+    res = cached_json_response(request, cached, etag=etag, cache_control=IMMUTABLE_CACHE_CONTROL)
+    attach_server_timing(res, server_timing)
+    return res
+
+
+async def _content_body(
+    session: AsyncSession,
+    sha256: str,
+    *,
+    server_timing: list[tuple[str, float]],
+) -> bytes:
+    content_started = mark()
+    content_json = await load_served_content(session, served_sha256=sha256)
+    server_timing.append(("load_content", elapsed_ms(content_started)))
+    if content_json is None:
+        raise APIError(status_code=404, code="CONTENT_NOT_FOUND", message="Content not found")
+    return content_json.encode("utf-8")
@@ -30,7 +30,9 @@ async def list_licenses(
     session: AsyncSession = Depends(get_session),  # noqa: B008
 ) -> LicensesResponse | Response:
     distro_norm = normalize_distro(distro)
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
 
     cache_control = "public, max-age=300"
     etag = compute_weak_etag("licenses", release.dataset_release_id)
@@ -99,7 +101,9 @@ async def get_license(
         raise APIError(status_code=400, code="INVALID_PACKAGE", message="Invalid package name")
 
     distro_norm = normalize_distro(distro)
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
 
     cache_control = "public, max-age=300"
     etag = compute_weak_etag("license", release.dataset_release_id, pkg)
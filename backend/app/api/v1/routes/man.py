@@ -3,20 +3,21 @@ from __future__ import annotations
 from fastapi import APIRouter, Query, Request, Response
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas import (
     AmbiguousPageResponse,
+    ManPageEnvelopeResponse,
     ManPageMetaResponse,
     ManPageResponse,
     RelatedResponse,
 )
 from app.core.errors import APIError
-from app.datasets.active import require_active_release
-from app.datasets.distro import DISTRO_ORDER_INDEX, normalize_distro
+from app.datasets.active import dataset_unavailable, get_active_release, require_active_release
+from app.datasets.distro import normalize_distro
 from app.db.models import DatasetRelease, ManPage
 from app.db.session import get_session
+from app.man.etags import page_etag_digest
 from app.man.normalize import (
     normalize_name,
     normalize_section,
@@ -24,13 +25,21 @@ from app.man.normalize import (
     validate_section,
 )
 from app.man.repository import (
+    PageBundle,
     get_page,
     get_page_with_content,
-    list_pages_by_name,
     list_related_pages,
+    load_page_bundle,
 )
 from app.security.deps import rate_limit_page
-from app.web.http_cache import compute_weak_etag, maybe_not_modified, set_cache_headers
+from app.web.http_cache import (
+    compute_weak_etag,
+    format_weak_etag,
+    maybe_not_modified,
+    set_cache_headers,
+)
+from app.web.raw_json import RawJSONResponse, dump_json_bytes, splice_json_object
+from app.web.response_cache import cached_json_response
 from app.web.server_timing import attach_server_timing, elapsed_ms, mark, server_timing_seed
 
 router = APIRouter()
@@ -43,7 +52,6 @@ router = APIRouter()
 )
 async def get_man_by_name(
     request: Request,
-    response: Response,
     name: str,
     distro: str | None = Query(default=None),
     _: None = Depends(rate_limit_page),  # noqa: B008
@@ -54,13 +62,14 @@ async def get_man_by_name(
     validate_name(name_norm)
 
     distro_norm = normalize_distro(distro)
-    release_started = mark()
-    release = await require_active_release(session, distro=distro_norm)
-    server_timing.append(("active_release", elapsed_ms(release_started)))
-    pages_started = mark()
-    pages = await list_pages_by_name(session, release_id=release.id, name=name_norm)
-    server_timing.append(("lookup_pages", elapsed_ms(pages_started)))
-
+    bundle_started = mark()
+    bundle = await _load_page_bundle(request, session, distro=distro_norm, name=name_norm)
+    server_timing.append(("load_page", elapsed_ms(bundle_started)))
+
+    if bundle is None:
+        raise dataset_unavailable()
+    release = bundle.release
+    pages = bundle.pages
     if not pages:
         raise APIError(status_code=404, code="PAGE_NOT_FOUND", message="Page not found")
 
@@ -97,54 +106,36 @@ async def get_man_by_name(
         attach_server_timing(res, server_timing)
         return res
 
-    page = pages[0]
-    page_content_started = mark()
-    page_with_content = await get_page_with_content(
-        session, release_id=release.id, name=name_norm, section=page.section
-    )
-    server_timing.append(("load_page_content", elapsed_ms(page_content_started)))
-    if page_with_content is None:
+    man_page = pages[0]
+    content_json = bundle.content_json
+    if content_json is None:
         raise APIError(status_code=404, code="PAGE_NOT_FOUND", message="Page not found")
 
-    man_page, content = page_with_content
-    variants_started = mark()
-    variants = await _list_page_variants(
-        session,
-        locale=release.locale,
-        name=man_page.name,
-        section=man_page.section,
-    )
-    server_timing.append(("load_variants", elapsed_ms(variants_started)))
-    variants_etag = _variants_etag_key(variants)
-    etag = compute_weak_etag(
-        "man-by-name",
-        release.dataset_release_id,
-        man_page.content_sha256,
-        variants_etag,
+    variants = bundle.variants
+    etag = format_weak_etag(
+        page_etag_digest(man_page, variants_content_key=bundle.variants_content_key)
     )
     not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
     if not_modified is not None:
         attach_server_timing(not_modified, server_timing)
         return not_modified
 
-    content_payload = dict(content.doc)
-    content_payload["synopsis"] = content.synopsis
-    content_payload["options"] = content.options
-    content_payload["seeAlso"] = content.see_also
-
-    set_cache_headers(response, etag=etag, cache_control=cache_control)
-    attach_server_timing(response, server_timing)
-    return {
-        "page": _serialize_page(man_page, release),
-        "content": content_payload,
-        "variants": variants,
-    }
+    body = _render_page(
+        man_page,
+        release,
+        content_json=content_json,
+        variants=variants,
+        server_timing=server_timing,
+    )
+    res = RawJSONResponse(content=body)
+    set_cache_headers(res, etag=etag, cache_control=cache_control)
+    attach_server_timing(res, server_timing)
+    return res
 
 
 @router.get("/man/{name}/{section}", response_model=ManPageResponse)
 async def get_man_by_name_and_section(
     request: Request,
-    response: Response,
     name: str,
     section: str,
     distro: str | None = Query(default=None),
@@ -158,53 +149,130 @@ async def get_man_by_name_and_section(
     validate_section(section_norm)
 
     distro_norm = normalize_distro(distro)
-    release_started = mark()
-    release = await require_active_release(session, distro=distro_norm)
-    server_timing.append(("active_release", elapsed_ms(release_started)))
-
     cache_control = "public, max-age=300"
-    page_content_started = mark()
-    page_with_content = await get_page_with_content(
-        session, release_id=release.id, name=name_norm, section=section_norm
+
+    response_cache = request.app.state.response_cache
+
+    index_started = mark()
+    indexed = await _indexed_etag(
+        request, session, distro=distro_norm, name=name_norm, section=section_norm
+    )
+    if indexed is not None:
+        release, etag_digest = indexed
+        etag = format_weak_etag(etag_digest)
+        server_timing.append(("etag_index", elapsed_ms(index_started)))
+        not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
+        if not_modified is not None:
+            attach_server_timing(not_modified, server_timing)
+            return not_modified
+
+        cache_started = mark()
+        cached = await response_cache.get(
+            namespace=release.dataset_release_id, etag=etag_digest.hex()
+        )
+        server_timing.append(("response_cache", elapsed_ms(cache_started)))
+        if cached is not None:
+            res = cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+            attach_server_timing(res, server_timing)
+            return res
+
+    bundle_started = mark()
+    bundle = await _load_page_bundle(
+        request, session, distro=distro_norm, name=name_norm, section=section_norm
     )
-    server_timing.append(("load_page_content", elapsed_ms(page_content_started)))
+    server_timing.append(("load_page", elapsed_ms(bundle_started)))
 
-    if page_with_content is None:
+    if bundle is None:
+        raise dataset_unavailable()
+    if not bundle.pages or bundle.content_json is None:
         raise APIError(status_code=404, code="PAGE_NOT_FOUND", message="Page not found")
 
-    man_page, content = page_with_content
-    variants_started = mark()
-    variants = await _list_page_variants(
+    release = bundle.release
+    man_page = bundle.pages[0]
+    content_json = bundle.content_json
+    variants = bundle.variants
+    etag_digest = page_etag_digest(man_page, variants_content_key=bundle.variants_content_key)
+    etag = format_weak_etag(etag_digest)
+    not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
+    if not_modified is not None:
+        attach_server_timing(not_modified, server_timing)
+        return not_modified
+
+    body = _render_page(
+        man_page,
+        release,
+        content_json=content_json,
+        variants=variants,
+        server_timing=server_timing,
+    )
+    cached = await response_cache.put(
+        namespace=release.dataset_release_id,
+        etag=etag_digest.hex(),
+        body=body,
+    )
+    res = cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+    attach_server_timing(res, server_timing)
+    return res
+
+
+@router.get("/man/{name}/{section}/envelope", response_model=ManPageEnvelopeResponse)
+async def get_man_envelope_by_name_and_section(
+    request: Request,
+    name: str,
+    section: str,
+    distro: str | None = Query(default=None),
+    _: None = Depends(rate_limit_page),  # noqa: B008
+    session: AsyncSession = Depends(get_session),  # noqa: B008
+) -> ManPageEnvelopeResponse | Response:
+    # The page without its content, which is referenced by an immutable /content URL.
+    server_timing = server_timing_seed(request)
+    name_norm = normalize_name(name)
+    validate_name(name_norm)
+    section_norm = normalize_section(section)
+    validate_section(section_norm)
+
+    distro_norm = normalize_distro(distro)
+    cache_control = "public, max-age=300"
+
+    bundle_started = mark()
+    bundle = await _load_page_bundle(
+        request,
         session,
-        locale=release.locale,
-        name=man_page.name,
-        section=man_page.section,
+        distro=distro_norm,
+        name=name_norm,
+        section=section_norm,
+        include_content=False,
     )
-    server_timing.append(("load_variants", elapsed_ms(variants_started)))
-    variants_etag = _variants_etag_key(variants)
+    server_timing.append(("load_page", elapsed_ms(bundle_started)))
+
+    if bundle is None:
+        raise dataset_unavailable()
+    if not bundle.pages or bundle.served_sha256 is None:
+        raise APIError(status_code=404, code="PAGE_NOT_FOUND", message="Page not found")
+
+    man_page = bundle.pages[0]
     etag = compute_weak_etag(
-        "man-by-name-section",
-        release.dataset_release_id,
-        man_page.content_sha256,
-        variants_etag,
+        "man-page-envelope",
+        page_etag_digest(man_page, variants_content_key=bundle.variants_content_key).hex(),
+        bundle.served_sha256,
     )
     not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
     if not_modified is not None:
         attach_server_timing(not_modified, server_timing)
         return not_modified
 
-    content_payload = dict(content.doc)
-    content_payload["synopsis"] = content.synopsis
-    content_payload["options"] = content.options
-    content_payload["seeAlso"] = content.see_also
-
-    set_cache_headers(response, etag=etag, cache_control=cache_control)
-    attach_server_timing(response, server_timing)
-    return {
-        "page": _serialize_page(man_page, release),
-        "content": content_payload,
-        "variants": variants,
+    payload = {
+        "page": _serialize_page(man_page, bundle.release),
+        "content": {
+            "sha256": bundle.served_sha256,
+            "url": str(request.app.url_path_for("get_content", sha256=bundle.served_sha256)),
+        },
+        "variants": bundle.variants,
     }
+    res = RawJSONResponse(content=dump_json_bytes(payload))
+    set_cache_headers(res, etag=etag, cache_control=cache_control)
+    attach_server_timing(res, server_timing)
+    return res
 
 
 @router.get("/man/{name}/{section}/meta", response_model=ManPageMetaResponse)
@@ -225,7 +293,9 @@ async def get_man_meta_by_name_and_section(
 
     distro_norm = normalize_distro(distro)
     release_started = mark()
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
     server_timing.append(("active_release", elapsed_ms(release_started)))
 
     cache_control = "public, max-age=300"
@@ -238,8 +308,7 @@ async def get_man_meta_by_name_and_section(
 
     etag = compute_weak_etag(
         "man-by-name-section-meta",
-        release.dataset_release_id,
-        man_page.content_sha256,
+        page_etag_digest(man_page, variants_content_key="").hex(),
     )
     not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
     if not_modified is not None:
@@ -256,7 +325,6 @@ async def get_man_meta_by_name_and_section(
 @router.get("/man/{name}/{section}/related", response_model=RelatedResponse)
 async def get_related(
     request: Request,
-    response: Response,
     name: str,
     section: str,
     distro: str | None = Query(default=None),
@@ -271,7 +339,9 @@ async def get_related(
 
     distro_norm = normalize_distro(distro)
     release_started = mark()
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
     server_timing.append(("active_release", elapsed_ms(release_started)))
     cache_control = "public, max-age=300"
     etag = compute_weak_etag(
@@ -285,6 +355,30 @@ async def get_related(
         attach_server_timing(not_modified, server_timing)
         return not_modified
 
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=release.dataset_release_id,
+        etag=etag,
+        fill=lambda: _related_body(
+            session,
+            release,
+            name_norm=name_norm,
+            section_norm=section_norm,
+            server_timing=server_timing,
+        ),
+    )
+    res = cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+    attach_server_timing(res, server_timing)
+    return res
+
+
+async def _related_body(
+    session: AsyncSession,
+    release: DatasetRelease,
+    *,
+    name_norm: str,
+    section_norm: str,
+    server_timing: list[tuple[str, float]],
+) -> bytes:
     page_started = mark()
     page_with_content = await get_page_with_content(
         session, release_id=release.id, name=name_norm, section=section_norm
@@ -299,9 +393,7 @@ async def get_related(
     related_pages = await list_related_pages(session, from_page_id=man_page.id)
     server_timing.append(("load_related", elapsed_ms(related_started)))
 
-    set_cache_headers(response, etag=etag, cache_control=cache_control)
-    attach_server_timing(response, server_timing)
-    return {
+    payload = {
         "items": [
             {
                 "name": page.name,
@@ -312,56 +404,85 @@ async def get_related(
             for page in related_pages
         ]
     }
+    return dump_json_bytes(payload)
 
 
-async def _list_page_variants(
+async def _load_page_bundle(
+    request: Request,
     session: AsyncSession,
     *,
-    locale: str,
+    distro: str,
     name: str,
-    section: str,
-) -> list[dict[str, str]]:
-    rows = (
-        await session.execute(
-            select(
-                DatasetRelease.distro,
-                DatasetRelease.dataset_release_id,
-                ManPage.content_sha256,
-            )
-            .join(ManPage, ManPage.dataset_release_id == DatasetRelease.id)
-            .where(DatasetRelease.is_active)
-            .where(DatasetRelease.locale == locale)
-            .where(ManPage.name == name)
-            .where(ManPage.section == section)
-        )
-    ).all()
-
-    variants = [
-        {
-            "distro": row.distro,
-            "datasetReleaseId": row.dataset_release_id,
-            "contentSha256": row.content_sha256,
-        }
-        for row in rows
-        if isinstance(row.distro, str)
-        and isinstance(row.dataset_release_id, str)
-        and isinstance(row.content_sha256, str)
-    ]
-
-    variants.sort(key=lambda v: (DISTRO_ORDER_INDEX.get(v["distro"], 99), v["distro"]))
-    return variants
+    section: str | None = None,
+    include_content: bool = True,
+) -> PageBundle | None:
+    # Concurrent misses for one page (a new release, a page going viral) share one query.
+    return await request.app.state.page_loads.do(
+        ("page", distro, name, section, include_content),
+        lambda: load_page_bundle(
+            session,
+            distro=distro,
+            name=name,
+            section=section,
+            include_content=include_content,
+        ),
+    )
 
 
-def _variants_etag_key(variants: list[dict[str, str]]) -> str:
-    return ",".join(
-        f"{v.get('distro', '')}:{v.get('datasetReleaseId', '')}:{v.get('contentSha256', '')}"
-        for v in variants
+async def _indexed_etag(
+    request: Request,
+    session: AsyncSession,
+    *,
+    distro: str,
+    name: str,
+    section: str,
+) -> tuple[DatasetRelease, bytes] | None:
+    """Look up the page etag in the per-release etag index, without loading the page.
+
+    Returns None when the index isn't built yet (a build is scheduled) or doesn't
+    know the page; the caller then takes the normal path.
+    """
+    release = await get_active_release(
+        session, distro=distro, cache=request.app.state.active_releases
+    )
+    if release is None:
+        return None
+    page_etags = request.app.state.page_etags
+    index = page_etags.get(release.id)
+    if index is None:
+        page_etags.schedule_build(release, request.app.state.db_sessionmaker)
+        return None
+    etag_digest = index.get(name=name, section=section)
+    if etag_digest is None:
+        return None
+    return release, etag_digest
+
+
+def _render_page(
+    man_page: ManPage,
+    release: DatasetRelease,
+    *,
+    content_json: str,
+    variants: list[dict[str, str]],
+    server_timing: list[tuple[str, float]],
+) -> bytes:
+    # Content was validated against the document model at ingest, so it is spliced in
+    # as stored instead of round-tripping tens of thousands of nodes through pydantic.
+    render_started = mark()
+    body = splice_json_object(
+        [
+            ("page", dump_json_bytes(_serialize_page(man_page, release))),
+            ("content", content_json.encode("utf-8")),
+            ("variants", dump_json_bytes(variants)),
+        ]
     )
+    server_timing.append(("render", elapsed_ms(render_started)))
+    return body
 
 
 def _serialize_page(man_page: ManPage, release: DatasetRelease) -> dict[str, str | None]:
+    # Only what page_etag_digest covers: the etag survives releases, so must the body.
     return {
-        "id": str(man_page.id),
         "locale": release.locale,
         "distro": release.distro,
         "name": man_page.name,
@@ -370,5 +491,5 @@ def _serialize_page(man_page: ManPage, release: DatasetRelease) -> dict[str, str
         "description": man_page.description,
         "sourcePackage": man_page.source_package,
         "sourcePackageVersion": man_page.source_package_version,
-        "datasetReleaseId": release.dataset_release_id,
+        "contentUnchangedSince": man_page.content_unchanged_since,
     }
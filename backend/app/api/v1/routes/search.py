@@ -1,22 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
+from typing import Any, Literal
 
 from fastapi import APIRouter, Query, Request, Response
 from fastapi.params import Depends
-from sqlalchemy import case, func, select
+from sqlalchemy import func, select
 from sqlalchemy.exc import DataError, ProgrammingError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.v1.schemas import SearchResponse
+from app.api.v1.schemas import SearchFacets, SearchResponse, SectionFacet
 from app.core.errors import APIError
 from app.datasets.active import require_active_release
 from app.datasets.distro import normalize_distro
-from app.db.models import ManPage, ManPageContent, ManPageSearch
-from app.db.session import get_session
+from app.db.models import DatasetRelease, ManPageSearch
+from app.db.session import get_session, get_session_maker
+from app.man.name_index import NameIndexes
 from app.man.normalize import normalize_section, validate_section
-from app.security.deps import rate_limit_search
-from app.web.http_cache import compute_weak_etag, maybe_not_modified, set_cache_headers
+from app.man.query_cost import estimate_query_cost, plan_cost
+from app.man.search import SearchKey, count_section_facets, run_tiered_search
+from app.man.sections import section_label
+from app.man.trigram import SEARCH_SIMILARITY_THRESHOLD, nearest_names, set_similarity_threshold
+from app.security.deps import charge_search_cost, rate_limit_search
+from app.web.cursor import decode_cursor, encode_cursor, invalid_cursor
+from app.web.http_cache import compute_weak_etag, maybe_not_modified
+from app.web.raw_json import dump_json_bytes
+from app.web.response_cache import cached_json_response
 from app.web.server_timing import attach_server_timing, elapsed_ms, mark, server_timing_seed
 
 router = APIRouter()
@@ -29,29 +39,44 @@ def _normalize_query(q: str) -> str:
 @router.get("/search", response_model=SearchResponse)
 async def search(
     request: Request,
-    response: Response,
     q: str = Query(min_length=1, max_length=200),
     section: str | None = None,
     limit: int = Query(default=20, ge=1, le=50),
     offset: int = Query(default=0, ge=0, le=5000),
+    cursor: str | None = Query(default=None),
     distro: str | None = Query(default=None),
+    facets: Literal["section"] | None = Query(default=None),
     _: None = Depends(rate_limit_search),  # noqa: B008
     session: AsyncSession = Depends(get_session),  # noqa: B008
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),  # noqa: B008
 ) -> SearchResponse | Response:
     server_timing = server_timing_seed(request)
     query = _normalize_query(q)
     if not query:
         raise APIError(status_code=400, code="INVALID_QUERY", message="Query is required")
+    query_cost = estimate_query_cost(query)
+    if query_cost.too_complex:
+        raise APIError(
+            status_code=400,
+            code="QUERY_TOO_COMPLEX",
+            message="Search query has too many terms or operators",
+        )
+    # rate_limit_search took one token; OR-heavy and short-term queries pay more.
+    await charge_search_cost(request, cost=query_cost.cost)
 
-    query_norm = query.lower()
     section_norm = None
     if section is not None:
         section_norm = normalize_section(section)
         validate_section(section_norm)
 
+    # A cursor (from nextCursor) takes precedence over offset.
+    after = _parse_search_cursor(cursor) if cursor is not None else None
+
     distro_norm = normalize_distro(distro)
     release_started = mark()
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
     server_timing.append(("active_release", elapsed_ms(release_started)))
 
     cache_control = "public, max-age=300"
@@ -62,111 +87,115 @@ async def search(
         section_norm or "",
         str(limit),
         str(offset),
+        cursor or "",
+        facets or "",
     )
     not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
     if not_modified is not None:
         attach_server_timing(not_modified, server_timing)
         return not_modified
 
-    tsquery = func.websearch_to_tsquery("simple", query)
-
-    similarity_name = func.similarity(ManPageSearch.name_norm, query_norm)
-    similarity_desc = func.similarity(ManPageSearch.desc_norm, query_norm)
-    similarity_best = func.greatest(similarity_name, similarity_desc)
-
-    score = (
-        case((ManPageSearch.name_norm == query_norm, 1000), else_=0)
-        + case((ManPageSearch.name_norm.like(f"{query_norm}%"), 100), else_=0)
-        + (func.ts_rank_cd(ManPageSearch.tsv, tsquery) * 10)
-        + (similarity_best * 2)
+    cache_started = mark()
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=release.dataset_release_id,
+        etag=etag,
+        fill=lambda: _search_body(
+            session,
+            session_maker,
+            release,
+            query=query,
+            section_norm=section_norm,
+            limit=limit,
+            offset=offset,
+            after=after,
+            section_facets=facets == "section",
+            max_plan_cost=(
+                request.app.state.settings.search_max_plan_cost if query_cost.cost > 1 else 0.0
+            ),
+            name_indexes=request.app.state.name_indexes,
+            server_timing=server_timing,
+        ),
     )
+    server_timing.append(("response_cache", elapsed_ms(cache_started)))
+    res = cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+    attach_server_timing(res, server_timing)
+    return res
 
-    where_clauses = [
-        ManPage.dataset_release_id == release.id,
-        func.coalesce(ManPageSearch.tsv.op("@@")(tsquery), False)
-        | ManPageSearch.name_norm.like(f"{query_norm}%")
-        | (similarity_best > 0.3),
-    ]
 
-    if section_norm is not None:
-        where_clauses.append(ManPage.section == section_norm)
-
-    headline_opts = "MaxFragments=2, MinWords=3, MaxWords=15, StartSel=⟪, StopSel=⟫"
+async def _search_body(
+    session: AsyncSession,
+    session_maker: async_sessionmaker[AsyncSession],
+    release: DatasetRelease,
+    *,
+    query: str,
+    section_norm: str | None,
+    limit: int,
+    offset: int,
+    after: SearchKey | None,
+    section_facets: bool,
+    max_plan_cost: float,
+    name_indexes: NameIndexes,
+    server_timing: list[tuple[str, float]],
+) -> bytes:
+    if max_plan_cost:
+        await _check_plan_cost(
+            session,
+            release,
+            query=query,
+            max_plan_cost=max_plan_cost,
+            server_timing=server_timing,
+        )
 
+    # Suggestions (and facets) don't depend on the ranking, so they run alongside it
+    # on connections of their own; search_fanout is the wall time of every branch.
     try:
-        search_started = mark()
-        ranked_results = (
-            await session.execute(
-                select(
-                    ManPage.id,
-                    ManPage.name,
-                    ManPage.section,
-                    ManPage.title,
-                    ManPage.description,
-                )
-                .join(ManPageSearch, ManPageSearch.man_page_id == ManPage.id)
-                .where(*where_clauses)
-                .order_by(
-                    score.desc(),
-                    func.length(ManPage.name).asc(),
-                    ManPage.section.asc(),
-                    ManPage.id.asc(),
+        fanout_started = mark()
+        async with asyncio.TaskGroup() as tasks:
+            ranked_task = tasks.create_task(
+                _ranked_results(
+                    session,
+                    release,
+                    query=query,
+                    section_norm=section_norm,
+                    limit=limit,
+                    offset=offset,
+                    after=after,
+                    server_timing=server_timing,
                 )
-                .limit(limit + 1)
-                .offset(offset)
             )
-        ).all()
-        server_timing.append(("search_rank", elapsed_ms(search_started)))
-
-        has_more = len(ranked_results) > limit
-        visible_results = ranked_results[:limit]
-
-        highlights_by_page_id: dict[uuid.UUID, str] = {}
-        if visible_results:
-            headline_started = mark()
-            page_ids = [row.id for row in visible_results]
-            highlights = (
-                await session.execute(
-                    select(
-                        ManPageContent.man_page_id,
-                        func.ts_headline(
-                            "simple",
-                            ManPageContent.plain_text,
-                            tsquery,
-                            headline_opts,
-                        ).label("hl"),
-                    ).where(ManPageContent.man_page_id.in_(page_ids))
+            suggestions_task = tasks.create_task(
+                _suggestions(
+                    session_maker,
+                    release,
+                    query=query,
+                    name_indexes=name_indexes,
+                    server_timing=server_timing,
                 )
-            ).all()
-            highlights_by_page_id = {row.man_page_id: row.hl for row in highlights if row.hl}
-            server_timing.append(("search_headline", elapsed_ms(headline_started)))
-        else:
-            server_timing.append(("search_headline", 0.0))
-
-        suggestions_started = mark()
-        suggestions = (
-            await session.execute(
-                select(ManPageSearch.name_norm)
-                .join(ManPage, ManPage.id == ManPageSearch.man_page_id)
-                .where(ManPage.dataset_release_id == release.id)
-                .where(func.similarity(ManPageSearch.name_norm, query_norm) > 0.3)
-                .order_by(func.similarity(ManPageSearch.name_norm, query_norm).desc())
-                .limit(5)
             )
-        ).scalars()
-        server_timing.append(("search_suggest", elapsed_ms(suggestions_started)))
-    except (DataError, ProgrammingError):
+            facets_task = None
+            if section_facets:
+                facets_task = tasks.create_task(
+                    _section_facets(
+                        session_maker, release, query=query, server_timing=server_timing
+                    )
+                )
+        server_timing.append(("search_fanout", elapsed_ms(fanout_started)))
+    except* (DataError, ProgrammingError):
+        # A failing branch cancels the others before we get here.
         raise APIError(
             status_code=400,
             code="INVALID_QUERY",
             message="Invalid search query",
         ) from None
 
-    next_offset = offset + len(visible_results) if has_more else None
+    visible_results, has_more, highlights_by_page_id = ranked_task.result()
+    suggestions = suggestions_task.result()
+    facets = SearchFacets(section=facets_task.result()) if facets_task is not None else None
+
+    next_offset = offset + len(visible_results) if has_more and after is None else None
+    next_cursor = _search_cursor(visible_results[-1]) if has_more else None
 
-    set_cache_headers(response, etag=etag, cache_control=cache_control)
-    attach_server_timing(response, server_timing)
-    return SearchResponse(
+    payload = SearchResponse(
         query=query,
         results=[
             {
@@ -181,4 +210,156 @@ async def search(
         suggestions=list(dict.fromkeys(suggestions)),
         hasMore=has_more,
         nextOffset=next_offset,
+        nextCursor=next_cursor,
+        facets=facets,
     )
+    return dump_json_bytes(payload.model_dump(mode="json"))
+
+
+async def _check_plan_cost(
+    session: AsyncSession,
+    release: DatasetRelease,
+    *,
+    query: str,
+    max_plan_cost: float,
+    server_timing: list[tuple[str, float]],
+) -> None:
+    explain_started = mark()
+    try:
+        cost = await plan_cost(session, release_id=release.id, query=query)
+    except (DataError, ProgrammingError):
+        raise APIError(
+            status_code=400,
+            code="INVALID_QUERY",
+            message="Invalid search query",
+        ) from None
+    server_timing.append(("search_explain", elapsed_ms(explain_started)))
+    if cost > max_plan_cost:
+        raise APIError(
+            status_code=400,
+            code="QUERY_TOO_COMPLEX",
+            message="Search query is too expensive",
+        )
+
+
+async def _ranked_results(
+    session: AsyncSession,
+    release: DatasetRelease,
+    *,
+    query: str,
+    section_norm: str | None,
+    limit: int,
+    offset: int,
+    after: SearchKey | None,
+    server_timing: list[tuple[str, float]],
+) -> tuple[list[Any], bool, dict[uuid.UUID, str]]:
+    tsquery = func.websearch_to_tsquery("simple", query)
+    headline_opts = "MaxFragments=2, MinWords=3, MaxWords=15, StartSel=⟪, StopSel=⟫"
+
+    await set_similarity_threshold(session, SEARCH_SIMILARITY_THRESHOLD)
+    search_started = mark()
+    ranked_results = await run_tiered_search(
+        session,
+        release_id=release.id,
+        query=query,
+        section_norm=section_norm,
+        limit=limit + 1,
+        offset=0 if after is not None else offset,
+        after=after,
+        server_timing=server_timing,
+    )
+    server_timing.append(("search_rank", elapsed_ms(search_started)))
+
+    has_more = len(ranked_results) > limit
+    visible_results = ranked_results[:limit]
+
+    highlights_by_page_id: dict[uuid.UUID, str] = {}
+    if visible_results:
+        headline_started = mark()
+        page_ids = [row.id for row in visible_results]
+        highlights = (
+            await session.execute(
+                select(
+                    ManPageSearch.man_page_id,
+                    func.ts_headline(
+                        "simple",
+                        ManPageSearch.snippet_text,
+                        tsquery,
+                        headline_opts,
+                    ).label("hl"),
+                )
+                .where(ManPageSearch.dataset_release_id == release.id)
+                .where(ManPageSearch.man_page_id.in_(page_ids))
+            )
+        ).all()
+        highlights_by_page_id = {row.man_page_id: row.hl for row in highlights if row.hl}
+        server_timing.append(("search_headline", elapsed_ms(headline_started)))
+    else:
+        server_timing.append(("search_headline", 0.0))
+    return visible_results, has_more, highlights_by_page_id
+
+
+async def _section_facets(
+    session_maker: async_sessionmaker[AsyncSession],
+    release: DatasetRelease,
+    *,
+    query: str,
+    server_timing: list[tuple[str, float]],
+) -> list[SectionFacet]:
+    facets_started = mark()
+    async with session_maker() as session:
+        await set_similarity_threshold(session, SEARCH_SIMILARITY_THRESHOLD)
+        counts = await count_section_facets(session, release_id=release.id, query=query)
+    server_timing.append(("search_facets", elapsed_ms(facets_started)))
+    return [
+        SectionFacet(section=section, label=section_label(section), count=count)
+        for section, count in counts
+    ]
+
+
+async def _suggestions(
+    session_maker: async_sessionmaker[AsyncSession],
+    release: DatasetRelease,
+    *,
+    query: str,
+    name_indexes: NameIndexes,
+    server_timing: list[tuple[str, float]],
+) -> list[str]:
+    suggestions_started = mark()
+    index = name_indexes.get(release.id)
+    if index is not None:
+        pages = index.nearest(query.lower(), threshold=SEARCH_SIMILARITY_THRESHOLD, limit=5)
+        server_timing.append(("search_suggest_memory", elapsed_ms(suggestions_started)))
+        return [page.name_norm for page in pages]
+
+    name_indexes.schedule_build(release, session_maker)
+    async with session_maker() as session:
+        # similarity_threshold is transaction-local: set it on this connection too.
+        await set_similarity_threshold(session, SEARCH_SIMILARITY_THRESHOLD)
+        suggestions = (
+            await session.execute(
+                nearest_names(release.id, query.lower(), ManPageSearch.name_norm).limit(5)
+            )
+        ).scalars()
+        names = list(suggestions)
+    server_timing.append(("search_suggest", elapsed_ms(suggestions_started)))
+    return names
+
+
+_SEARCH_CURSOR_TYPES = (int, float, int, str, str)
+
+
+def _search_cursor(row: Any) -> str:
+    return encode_cursor(
+        "search", [row.tier, float(row.score), row.name_length, row.section, str(row.id)]
+    )
+
+
+def _parse_search_cursor(cursor: str) -> SearchKey:
+    tier, score, name_length, section, page_id = decode_cursor(
+        cursor, kind="search", types=_SEARCH_CURSOR_TYPES
+    )
+    try:
+        return SearchKey(tier, float(score), name_length, section, uuid.UUID(page_id))
+    except ValueError:
+        raise invalid_cursor() from None
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
+import uuid
+
 from fastapi import APIRouter, Query, Request, Response
 from fastapi.params import Depends
-from sqlalchemy import func, select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas import SectionLabel, SectionResponse
 from app.core.errors import APIError
 from app.datasets.active import require_active_release
 from app.datasets.distro import normalize_distro
-from app.db.models import ManPage
+from app.datasets.stats import get_section_total, list_section_stats
+from app.db.models import DatasetRelease, ManPage
 from app.db.session import get_session
 from app.man.normalize import normalize_section, validate_section
-from app.man.sections import SECTION_LABELS
+from app.man.sections import section_label
 from app.security.deps import rate_limit_page
-from app.web.http_cache import compute_weak_etag, maybe_not_modified, set_cache_headers
+from app.web.cursor import decode_cursor, encode_cursor, invalid_cursor
+from app.web.http_cache import compute_weak_etag, maybe_not_modified
+from app.web.raw_json import dump_json_bytes
+from app.web.response_cache import cached_json_response
 
 router = APIRouter()
 
@@ -22,13 +28,14 @@ router = APIRouter()
 @router.get("/sections", response_model=list[SectionLabel])
 async def list_sections(
     request: Request,
-    response: Response,
     distro: str | None = Query(default=None),
     _: None = Depends(rate_limit_page),  # noqa: B008
     session: AsyncSession = Depends(get_session),  # noqa: B008
 ) -> list[SectionLabel] | Response:
     distro_norm = normalize_distro(distro)
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
 
     cache_control = "public, max-age=300"
     etag = compute_weak_etag("sections", release.dataset_release_id)
@@ -36,33 +43,41 @@ async def list_sections(
     if not_modified is not None:
         return not_modified
 
-    set_cache_headers(response, etag=etag, cache_control=cache_control)
-    sections = (
-        await session.execute(
-            select(ManPage.section).where(ManPage.dataset_release_id == release.id).distinct()
-        )
-    ).scalars()
-    values = sorted({s for s in sections if isinstance(s, str) and s}, key=_section_sort_key)
-    return [{"section": section, "label": _section_label(section)} for section in values]
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=release.dataset_release_id,
+        etag=etag,
+        fill=lambda: _sections_body(session, release),
+    )
+    return cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+
+
+async def _sections_body(session: AsyncSession, release: DatasetRelease) -> bytes:
+    stats = await list_section_stats(session, release_id=release.id)
+    return dump_json_bytes(
+        [{"section": stat.section, "label": stat.label} for stat in stats if stat.section]
+    )
 
 
 @router.get("/section/{section}", response_model=SectionResponse)
 async def list_section(
     request: Request,
-    response: Response,
     section: str,
     limit: int = Query(default=200, ge=1, le=500),
     offset: int = Query(default=0, ge=0, le=5000),
+    cursor: str | None = Query(default=None),
     distro: str | None = Query(default=None),
     _: None = Depends(rate_limit_page),  # noqa: B008
     session: AsyncSession = Depends(get_session),  # noqa: B008
 ) -> SectionResponse | Response:
     section_norm = normalize_section(section)
     validate_section(section_norm)
+    # A cursor (from nextCursor) takes precedence over offset.
+    after = _parse_section_cursor(cursor) if cursor is not None else None
 
     distro_norm = normalize_distro(distro)
-    release = await require_active_release(session, distro=distro_norm)
-    label = _section_label(section_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
 
     cache_control = "public, max-age=300"
     etag = compute_weak_etag(
@@ -71,38 +86,61 @@ async def list_section(
         section_norm,
         str(limit),
         str(offset),
+        cursor or "",
     )
     not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
     if not_modified is not None:
         return not_modified
 
-    total = await session.scalar(
-        select(func.count())
-        .select_from(ManPage)
-        .where(ManPage.dataset_release_id == release.id)
-        .where(ManPage.section == section_norm)
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=release.dataset_release_id,
+        etag=etag,
+        fill=lambda: _section_body(
+            session, release, section_norm=section_norm, limit=limit, offset=offset, after=after
+        ),
     )
+    return cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+
+
+async def _section_body(
+    session: AsyncSession,
+    release: DatasetRelease,
+    *,
+    section_norm: str,
+    limit: int,
+    offset: int,
+    after: tuple[str, uuid.UUID] | None,
+) -> bytes:
+    total = await get_section_total(session, release_id=release.id, section=section_norm)
     if not total:
         raise APIError(status_code=404, code="SECTION_NOT_FOUND", message="Section not found")
 
-    pages = (
-        await session.execute(
-            select(ManPage)
-            .where(ManPage.dataset_release_id == release.id)
-            .where(ManPage.section == section_norm)
-            .order_by(ManPage.name.asc(), ManPage.id.asc())
-            .limit(limit)
-            .offset(offset)
-        )
-    ).scalars()
-
-    set_cache_headers(response, etag=etag, cache_control=cache_control)
-    return SectionResponse(
+    query = (
+        select(ManPage)
+        .where(ManPage.dataset_release_id == release.id)
+        .where(ManPage.section == section_norm)
+        .order_by(ManPage.name.asc(), ManPage.id.asc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        # Range scan on ix_man_pages_release_section_name from the last name served.
+        query = query.where(tuple_(ManPage.name, ManPage.id) > tuple_(*after))
+    else:
+        query = query.offset(offset)
+    fetched = list((await session.execute(query)).scalars())
+    pages = fetched[:limit]
+    next_cursor = (
+        encode_cursor("section", [pages[-1].name, str(pages[-1].id)])
+        if len(fetched) > limit
+        else None
+    )
+
+    payload = SectionResponse(
         section=section_norm,
-        label=label,
+        label=section_label(section_norm),
         limit=limit,
         offset=offset,
-        total=int(total or 0),
+        total=total,
         results=[
             {
                 "name": page.name,
@@ -112,34 +150,14 @@ async def list_section(
             }
             for page in pages
         ],
+        nextCursor=next_cursor,
     )
+    return dump_json_bytes(payload.model_dump(mode="json"))
 
 
-def _section_sort_key(section: str) -> tuple[int, int, str]:
-    if section and section[0].isdigit():
-        digit = int(section[0])
-        suffix = section[1:]
-        return (0, digit, suffix)
-    return (1, 0, section)
-
-
-_SECTION_SUFFIX_LABELS: dict[str, str] = {
-    "p": "POSIX",
-    "ssl": "OpenSSL",
-}
-
-
-def _section_label(section: str) -> str:
-    section_norm = normalize_section(section)
-    if section_norm in SECTION_LABELS:
-        return SECTION_LABELS[section_norm]
-
-    if section_norm and section_norm[0] in SECTION_LABELS:
-        base = SECTION_LABELS[section_norm[0]]
-        suffix = section_norm[1:]
-        if not suffix:
-            return base
-        suffix_label = _SECTION_SUFFIX_LABELS.get(suffix)
-        return f"{base} ({suffix_label or suffix})"
-
-    return section_norm
+def _parse_section_cursor(cursor: str) -> tuple[str, uuid.UUID]:
+    name, page_id = decode_cursor(cursor, kind="section", types=(str, str))
+    try:
+        return name, uuid.UUID(page_id)
+    except ValueError:
+        raise invalid_cursor() from None
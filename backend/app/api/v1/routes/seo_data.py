@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import uuid
+
 from fastapi import APIRouter, Query, Request, Response
 from fastapi.params import Depends
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas import SeoReleasesResponse, SeoSitemapPageResponse
+from app.core.errors import APIError
 from app.datasets.active import get_active_release
 from app.datasets.distro import SUPPORTED_DISTROS, normalize_distro
+from app.datasets.sitemap import SITEMAP_URLS_PER_FILE, render_sitemap_xml
+from app.datasets.stats import list_active_release_page_counts
 from app.db.models import ManPage
 from app.db.session import get_session
 from app.web.http_cache import compute_weak_etag, maybe_not_modified, set_cache_headers
+from app.web.response_cache import cached_response
 
 router = APIRouter()
 
-SITEMAP_URLS_PER_FILE = 10_000
-
 
 @router.get("/seo/releases", include_in_schema=False, response_model=SeoReleasesResponse)
 async def list_seo_releases(
@@ -28,28 +32,21 @@ async def list_seo_releases(
     items: list[dict[str, object]] = []
     etag_parts: list[str] = ["seo-releases", str(SITEMAP_URLS_PER_FILE)]
 
-    for distro in sorted(SUPPORTED_DISTROS):
-        release = await get_active_release(session, distro=distro)
-        if release is None:
+    # One query for every active release and its page count, ordered by distro.
+    for release, page_count in await list_active_release_page_counts(session):
+        if release.distro not in SUPPORTED_DISTROS:
             continue
 
-        total = await session.scalar(
-            select(func.count())
-            .select_from(ManPage)
-            .where(ManPage.dataset_release_id == release.id)
-        )
-        page_count = int(total or 0)
-
         items.append(
             {
-                "distro": distro,
+                "distro": release.distro,
                 "datasetReleaseId": release.dataset_release_id,
                 "ingestedAt": release.ingested_at.isoformat(),
                 "pageCount": page_count,
             }
         )
 
-        etag_parts.append(distro)
+        etag_parts.append(release.distro)
         etag_parts.append(release.dataset_release_id)
         etag_parts.append(str(page_count))
 
@@ -71,7 +68,9 @@ async def list_sitemap_page_items(
     session: AsyncSession = Depends(get_session),  # noqa: B008
 ) -> SeoSitemapPageResponse | Response:
     distro_norm = normalize_distro(distro)
-    release = await get_active_release(session, distro=distro_norm)
+    release = await get_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
     if release is None:
         return Response(status_code=404)
 
@@ -81,32 +80,80 @@ async def list_sitemap_page_items(
     if not_modified is not None:
         return not_modified
 
-    offset = (page - 1) * SITEMAP_URLS_PER_FILE
-    rows = await session.execute(
-        select(ManPage.name, ManPage.section)
-        .where(ManPage.dataset_release_id == release.id)
-        .order_by(ManPage.name.asc(), ManPage.section.asc())
-        .limit(SITEMAP_URLS_PER_FILE)
-        .offset(offset)
-    )
-
-    raw_items = rows.all()
-    if not raw_items:
-        return Response(status_code=404)
-
-    items: list[dict[str, str]] = []
-    for name, section in raw_items:
-        if not isinstance(name, str) or not name:
-            continue
-        if not isinstance(section, str) or not section:
-            continue
-        items.append({"name": name, "section": section})
-
+    items = await _sitemap_items(session, release_id=release.id, page=page)
     if not items:
         return Response(status_code=404)
 
     set_cache_headers(response, etag=etag, cache_control=cache_control)
     return {
-        "items": items,
+        "items": [{"name": name, "section": section} for name, section in items],
         "page": page,
     }
+
+
+@router.get("/seo/sitemap-page.xml", include_in_schema=False)
+async def get_sitemap_page_xml(
+    request: Request,
+    distro: str = Query(min_length=1, max_length=50),
+    page: int = Query(ge=1),
+    session: AsyncSession = Depends(get_session),  # noqa: B008
+) -> Response:
+    # The finished <urlset> for crawlers, served gzipped from the response cache.
+    # Never derived from the Host header: a forged one would be cached for everyone.
+    public_base_url = request.app.state.settings.public_base_url
+    if not public_base_url:
+        raise APIError(
+            status_code=503,
+            code="PUBLIC_BASE_URL_UNSET",
+            message="Sitemaps need PUBLIC_BASE_URL to be configured",
+        )
+    origin = public_base_url.rstrip("/")
+
+    distro_norm = normalize_distro(distro)
+    release = await get_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
+    if release is None:
+        return Response(status_code=404)
+
+    cache_control = "public, max-age=3600"
+    etag = compute_weak_etag(
+        "seo-sitemap-page-xml", distro_norm, release.dataset_release_id, str(page), origin
+    )
+    not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
+    if not_modified is not None:
+        return not_modified
+
+    async def _fill() -> bytes:
+        items = await _sitemap_items(session, release_id=release.id, page=page)
+        if not items:
+            raise APIError(status_code=404, code="SITEMAP_PAGE_NOT_FOUND", message="Not found")
+        return render_sitemap_xml(origin=origin, distro=distro_norm, items=items)
+
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=release.dataset_release_id, etag=etag, fill=_fill
+    )
+    return cached_response(
+        request,
+        cached,
+        etag=etag,
+        cache_control=cache_control,
+        media_type="application/xml; charset=utf-8",
+    )
+
+
+async def _sitemap_items(
+    session: AsyncSession, *, release_id: uuid.UUID, page: int
+) -> list[tuple[str, str]]:
+    # One shard is a range read on ix_man_pages_release_sitemap_page, not an OFFSET scan.
+    rows = await session.execute(
+        select(ManPage.name, ManPage.section)
+        .where(ManPage.dataset_release_id == release_id)
+        .where(ManPage.sitemap_page == page)
+        .order_by(ManPage.name.asc(), ManPage.section.asc())
+    )
+    return [
+        (name, section)
+        for name, section in rows.all()
+        if isinstance(name, str) and name and isinstance(section, str) and section
+    ]
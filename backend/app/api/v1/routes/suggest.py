@@ -2,17 +2,21 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Query, Request, Response
 from fastapi.params import Depends
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.v1.schemas import SuggestResponse
+from app.api.v1.schemas import CompleteResponse, SuggestResponse
 from app.datasets.active import require_active_release
 from app.datasets.distro import normalize_distro
-from app.db.models import ManPage, ManPageSearch
-from app.db.session import get_session
+from app.db.models import DatasetRelease, ManPageSearch
+from app.db.session import get_session, get_session_maker
+from app.man.name_index import NameIndexes
 from app.man.normalize import normalize_name, validate_name
+from app.man.trigram import SUGGEST_SIMILARITY_THRESHOLD, nearest_names, set_similarity_threshold
 from app.security.deps import rate_limit_search
 from app.web.http_cache import compute_weak_etag, maybe_not_modified, set_cache_headers
+from app.web.raw_json import dump_json_bytes
+from app.web.response_cache import cached_json_response
 
 router = APIRouter()
 
@@ -20,17 +24,19 @@ router = APIRouter()
 @router.get("/suggest", response_model=SuggestResponse)
 async def suggest(
     request: Request,
-    response: Response,
     name: str = Query(min_length=1, max_length=200),
     distro: str | None = Query(default=None),
     _: None = Depends(rate_limit_search),  # noqa: B008
     session: AsyncSession = Depends(get_session),  # noqa: B008
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),  # noqa: B008
 ) -> SuggestResponse | Response:
     name_norm = normalize_name(name)
     validate_name(name_norm)
 
     distro_norm = normalize_distro(distro)
-    release = await require_active_release(session, distro=distro_norm)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
 
     cache_control = "public, max-age=300"
     etag = compute_weak_etag("suggest", release.dataset_release_id, name_norm)
@@ -38,20 +44,50 @@ async def suggest(
     if not_modified is not None:
         return not_modified
 
-    rows = (
-        await session.execute(
-            select(ManPage.name, ManPage.section, ManPage.description)
-            .join(ManPageSearch, ManPageSearch.man_page_id == ManPage.id)
-            .where(ManPage.dataset_release_id == release.id)
-            .where(func.similarity(ManPageSearch.name_norm, name_norm) > 0.2)
-            .order_by(
-                func.similarity(ManPageSearch.name_norm, name_norm).desc(),
-                ManPage.name.asc(),
-                ManPage.section.asc(),
+    cached = await request.app.state.response_cache.get_or_fill(
+        namespace=release.dataset_release_id,
+        etag=etag,
+        fill=lambda: _suggest_body(
+            session,
+            release,
+            name_norm,
+            name_indexes=request.app.state.name_indexes,
+            session_maker=session_maker,
+        ),
+    )
+    return cached_json_response(request, cached, etag=etag, cache_control=cache_control)
+
+
+async def _suggest_body(
+    session: AsyncSession,
+    release: DatasetRelease,
+    name_norm: str,
+    *,
+    name_indexes: NameIndexes,
+    session_maker: async_sessionmaker[AsyncSession],
+) -> bytes:
+    index = name_indexes.get(release.id)
+    if index is not None:
+        rows = [
+            (page.name, page.section, page.description)
+            for page in index.nearest(name_norm, threshold=SUGGEST_SIMILARITY_THRESHOLD, limit=10)
+        ]
+    else:
+        name_indexes.schedule_build(release, session_maker)
+        await set_similarity_threshold(session, SUGGEST_SIMILARITY_THRESHOLD)
+        rows = (
+            await session.execute(
+                nearest_names(
+                    release.id,
+                    name_norm,
+                    ManPageSearch.name,
+                    ManPageSearch.section,
+                    ManPageSearch.description,
+                )
+                .order_by(ManPageSearch.name.asc(), ManPageSearch.section.asc())
+                .limit(10)
             )
-            .limit(10)
-        )
-    ).all()
+        ).all()
 
     suggestions: list[dict[str, str]] = []
     for row in rows:
@@ -64,5 +100,64 @@ async def suggest(
             continue
         suggestions.append({"name": name_val, "section": section_val, "description": desc_val})
 
+    return dump_json_bytes({"query": name_norm, "suggestions": suggestions})
+
+
+@router.get("/complete", response_model=CompleteResponse)
+async def complete(
+    request: Request,
+    response: Response,
+    prefix: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=10, ge=1, le=50),
+    distro: str | None = Query(default=None),
+    _: None = Depends(rate_limit_search),  # noqa: B008
+    session: AsyncSession = Depends(get_session),  # noqa: B008
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_session_maker),  # noqa: B008
+) -> CompleteResponse | Response:
+    # Prefix completion for the command palette: a bisect over the sorted names of the
+    # release's name index, so no response cache; Postgres only until the index is built.
+    prefix_norm = normalize_name(prefix)
+    validate_name(prefix_norm)
+
+    distro_norm = normalize_distro(distro)
+    release = await require_active_release(
+        session, distro=distro_norm, cache=request.app.state.active_releases
+    )
+
+    cache_control = "public, max-age=300"
+    etag = compute_weak_etag("complete", release.dataset_release_id, prefix_norm, str(limit))
+    not_modified = maybe_not_modified(request, etag=etag, cache_control=cache_control)
+    if not_modified is not None:
+        return not_modified
+
+    name_indexes: NameIndexes = request.app.state.name_indexes
+    index = name_indexes.get(release.id)
+    if index is not None:
+        rows = [
+            (page.name, page.section, page.description)
+            for page in index.complete(prefix_norm, limit=limit)
+        ]
+    else:
+        name_indexes.schedule_build(release, session_maker)
+        rows = (
+            await session.execute(
+                select(ManPageSearch.name, ManPageSearch.section, ManPageSearch.description)
+                .where(ManPageSearch.dataset_release_id == release.id)
+                .where(ManPageSearch.name_norm.startswith(prefix_norm, autoescape=True))
+                .order_by(
+                    ManPageSearch.name_norm.asc(),
+                    ManPageSearch.name.asc(),
+                    ManPageSearch.section.asc(),
+                )
+                .limit(limit)
+            )
+        ).all()
+
     set_cache_headers(response, etag=etag, cache_control=cache_control)
-    return {"query": name_norm, "suggestions": suggestions}
+    return CompleteResponse(
+        prefix=prefix_norm,
+        completions=[
+            {"name": name, "section": section, "description": description}
+            for name, section, description in rows
+        ],
+    )
@@ -30,12 +30,26 @@ class SearchResult(BaseModel):
     highlights: list[str]
 
 
+class SectionFacet(BaseModel):
+    section: str
+    label: str
+    count: int
+
+
+class SearchFacets(BaseModel):
+    section: list[SectionFacet]
+
+
 class SearchResponse(BaseModel):
     query: str
     results: list[SearchResult]
     suggestions: list[str]
     hasMore: bool
     nextOffset: int | None = None
+    # Opaque keyset cursor for the next page; cheaper than nextOffset on deep pages.
+    nextCursor: str | None = None
+    # Only with ?facets=section: hits per section across the whole query.
+    facets: SearchFacets | None = None
 
 
 class Suggestion(BaseModel):
@@ -49,6 +63,11 @@ class SuggestResponse(BaseModel):
     suggestions: list[Suggestion]
 
 
+class CompleteResponse(BaseModel):
+    prefix: str
+    completions: list[Suggestion]
+
+
 class SectionLabel(BaseModel):
     section: str
     label: str
@@ -68,6 +87,7 @@ class SectionResponse(BaseModel):
     offset: int
     total: int
     results: list[SectionPage]
+    nextCursor: str | None = None
 
 
 class LicensePackage(BaseModel):
@@ -251,7 +271,6 @@ class SeeAlsoRef(BaseModel):
 
 
 class ManPage(BaseModel):
-    id: str
     locale: str
     distro: str
     name: str
@@ -260,7 +279,9 @@ class ManPage(BaseModel):
     description: str
     sourcePackage: str | None = None
     sourcePackageVersion: str | None = None
-    datasetReleaseId: str
+    # Release since which the page content is unchanged (same etag across releases).
+    # Page bodies carry no other release ids, so a 304 never leaves one stale.
+    contentUnchangedSince: str | None = None
 
 
 class ManPageContent(DocumentModel):
@@ -271,7 +292,6 @@ class ManPageContent(DocumentModel):
 
 class ManPageVariant(BaseModel):
     distro: str
-    datasetReleaseId: str
     contentSha256: str
 
 
@@ -285,6 +305,18 @@ class ManPageMetaResponse(BaseModel):
     page: ManPage
 
 
+class ContentRef(BaseModel):
+    sha256: str
+    # Immutable: cacheable forever by browsers and CDNs.
+    url: str
+
+
+class ManPageEnvelopeResponse(BaseModel):
+    page: ManPage
+    content: ContentRef
+    variants: list[ManPageVariant]
+
+
 class AmbiguousOption(BaseModel):
     section: str
     title: str
@@ -27,9 +27,35 @@ class Settings(BaseSettings):
 
     rate_limit_search_per_minute: int = 60
     rate_limit_page_per_minute: int = 300
+    # Searches that already look expensive are EXPLAINed and rejected past this
+    # planner cost; 0 skips the EXPLAIN.
+    search_max_plan_cost: float = 0.0
 
     trusted_proxy_cidrs: str = ""
 
+    # Safety net for missed release-activation messages on Redis pub/sub.
+    active_release_cache_ttl_seconds: float = 60.0
+    # Activation announcements clear the etag indexes, and the listener clears them
+    # again on every resubscribe, so this is a last resort, not a refresh interval:
+    # each expiry reloads the release's whole page table.
+    page_etag_index_ttl_seconds: float = 24 * 60 * 60
+    page_etag_index_max_releases: int = 16
+    name_index_ttl_seconds: float = 3600.0
+    name_index_max_releases: int = 16
+
+    response_cache_l1_max_bytes: int = 64 * 1024 * 1024
+    response_cache_l2_ttl_seconds: int = 24 * 60 * 60
+    # Cross-worker fill lock for response cache misses; 0 coalesces per worker only.
+    response_cache_fill_lock_seconds: float = 5.0
+
+    # Top requests over the window are replayed after each release activation.
+    hot_keys_window_hours: int = 24
+    hot_keys_flush_seconds: float = 30.0
+    cache_warmup_top_n: int = 500
+    cache_warmup_concurrency: int = 4
+    # One worker warms per activation; the lock expires if that worker dies mid-run.
+    cache_warmup_lock_seconds: float = 600.0
+
     sentry_dsn: str = ""
     vite_sentry_dsn: str = ""
     vite_plausible_domain: str = ""
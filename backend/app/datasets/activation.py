@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from redis.asyncio import from_url
+from sqlalchemy import String, bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.orm import aliased
+
+from app.core.config import Settings
+from app.core.logging import configure_logging, get_logger
+from app.datasets.distro import DISTRO_ORDER
+from app.datasets.link_rank import link_rank
+from app.datasets.partitions import attach_search_partition
+from app.datasets.release_cache import publish_release_change
+from app.datasets.sitemap import SITEMAP_URLS_PER_FILE
+from app.db.models import (
+    DatasetRelease,
+    ManPage,
+    ManPageContent,
+    ManPageLink,
+    ManPageSearch,
+    ManPageVariants,
+    ReleaseSectionStat,
+)
+from app.man.repository import SERVED_CONTENT_SHA256
+from app.man.search import SEARCH_TSV, SNIPPET_TEXT
+from app.man.sections import section_label
+from app.web.response_cache import drop_release_namespace
+
+
+async def activate_release(conn: AsyncConnection, *, dataset_release_id: str) -> list[str]:
+    """Make a release the active one for its (locale, distro) and rebuild derived tables.
+
+    Runs inside the caller's transaction so readers never see a half-built activation.
+    Returns the dataset_release_ids that were deactivated.
+    """
+    row = (
+        await conn.execute(
+            select(DatasetRelease.id, DatasetRelease.locale, DatasetRelease.distro).where(
+                DatasetRelease.dataset_release_id == dataset_release_id
+            )
+        )
+    ).one_or_none()
+    if row is None:
+        raise LookupError(f"unknown dataset release: {dataset_release_id}")
+
+    # Deactivate first: uq_dataset_releases_active_locale_distro allows one active row.
+    deactivated = (
+        await conn.execute(
+            update(DatasetRelease)
+            .where(DatasetRelease.is_active)
+            .where(DatasetRelease.locale == row.locale)
+            .where(DatasetRelease.distro == row.distro)
+            .where(DatasetRelease.id != row.id)
+            .values(is_active=False)
+            .returning(DatasetRelease.id, DatasetRelease.dataset_release_id)
+        )
+    ).all()
+    await conn.execute(
+        update(DatasetRelease).where(DatasetRelease.id == row.id).values(is_active=True)
+    )
+
+    await mark_unchanged_content(
+        conn,
+        release_id=row.id,
+        dataset_release_id=dataset_release_id,
+        previous_release_ids=[old.id for old in deactivated],
+    )
+    await hash_served_content(conn, release_id=row.id)
+    await fill_search_documents(conn, release_id=row.id)
+    await rebuild_release_stats(conn, release_id=row.id)
+    await assign_sitemap_pages(conn, release_id=row.id)
+    await assign_rank_priors(conn, release_id=row.id)
+    await rebuild_page_variants(conn, locale=row.locale)
+    # Last: its partition locks are held until the caller commits.
+    await attach_search_partition(conn, release_id=row.id)
+    return [old.dataset_release_id for old in deactivated]
+
+
+async def mark_unchanged_content(
+    conn: AsyncConnection,
+    *,
+    release_id: UUID,
+    dataset_release_id: str,
+    previous_release_ids: list[UUID],
+) -> None:
+    """Set man_pages.content_unchanged_since for a release's pages on first activation.
+
+    Pages whose content matches the previously active release carry its marker forward,
+    so their etags (which don't include the release) survive the new release.
+    """
+    if previous_release_ids:
+        previous = aliased(ManPage, name="previous")
+        previous_release = aliased(DatasetRelease, name="previous_release")
+        await conn.execute(
+            update(ManPage)
+            .where(ManPage.dataset_release_id == release_id)
+            .where(ManPage.content_unchanged_since.is_(None))
+            .where(previous.dataset_release_id.in_(previous_release_ids))
+            .where(previous.name == ManPage.name)
+            .where(previous.section == ManPage.section)
+            .where(previous.content_sha256 == ManPage.content_sha256)
+            .where(previous_release.id == previous.dataset_release_id)
+            .values(
+                content_unchanged_since=func.coalesce(
+                    previous.content_unchanged_since, previous_release.dataset_release_id
+                )
+            )
+        )
+    await conn.execute(
+        update(ManPage)
+        .where(ManPage.dataset_release_id == release_id)
+        .where(ManPage.content_unchanged_since.is_(None))
+        .values(content_unchanged_since=dataset_release_id)
+    )
+
+
+async def hash_served_content(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Set man_page_content.served_sha256 for a release's pages that don't have it yet."""
+    await conn.execute(
+        update(ManPageContent)
+        .where(
+            ManPageContent.man_page_id.in_(
+                select(ManPage.id).where(ManPage.dataset_release_id == release_id)
+            )
+        )
+        .where(ManPageContent.served_sha256.is_(None))
+        .values(served_sha256=SERVED_CONTENT_SHA256)
+    )
+
+
+async def fill_search_documents(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Complete man_page_search rows of a release's pages that weren't activated yet.
+
+    Copies the man_pages fields search needs, weights tsv (SEARCH_TSV) and cuts the
+    highlight snippet, in one pass over the pages' content.
+    """
+    await conn.execute(
+        update(ManPageSearch)
+        .where(ManPageSearch.man_page_id == ManPage.id)
+        .where(ManPageContent.man_page_id == ManPage.id)
+        .where(ManPage.dataset_release_id == release_id)
+        .where(ManPageSearch.dataset_release_id == release_id)
+        .where(ManPageSearch.name.is_(None))
+        .values(
+            name=ManPage.name,
+            section=ManPage.section,
+            title=ManPage.title,
+            description=ManPage.description,
+            tsv=SEARCH_TSV,
+            snippet_text=SNIPPET_TEXT,
+        )
+    )
+
+
+async def rebuild_release_stats(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Recompute release_section_stats (per-section page totals) for one release."""
+    totals = (
+        await conn.execute(
+            select(ManPage.section, func.count().label("total"))
+            .where(ManPage.dataset_release_id == release_id)
+            .group_by(ManPage.section)
+        )
+    ).all()
+    await conn.execute(
+        delete(ReleaseSectionStat).where(ReleaseSectionStat.dataset_release_id == release_id)
+    )
+    if totals:
+        await conn.execute(
+            insert(ReleaseSectionStat),
+            [
+                {
+                    "dataset_release_id": release_id,
+                    "section": row.section,
+                    "label": section_label(row.section),
+                    "total": row.total,
+                }
+                for row in totals
+            ],
+        )
+
+
+async def assign_sitemap_pages(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Set man_pages.sitemap_page: SITEMAP_URLS_PER_FILE pages per shard, by (name, section)."""
+    position = func.row_number().over(order_by=(ManPage.name.asc(), ManPage.section.asc()))
+    ranked = (
+        select(
+            ManPage.id,
+            ((position - 1) // SITEMAP_URLS_PER_FILE + 1).label("sitemap_page"),
+        )
+        .where(ManPage.dataset_release_id == release_id)
+        .subquery()
+    )
+    await conn.execute(
+        update(ManPage)
+        .where(ManPage.id == ranked.c.id)
+        .where(ManPage.sitemap_page.is_distinct_from(ranked.c.sitemap_page))
+        .values(sitemap_page=ranked.c.sitemap_page)
+    )
+
+
+async def assign_rank_priors(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Set man_page_search.rank_prior: link_rank() over the release's see-also/xref links."""
+    page_ids = (
+        await conn.execute(select(ManPage.id).where(ManPage.dataset_release_id == release_id))
+    ).scalars()
+    links = (
+        await conn.execute(
+            select(ManPageLink.from_page_id, ManPageLink.to_page_id)
+            .join(ManPage, ManPage.id == ManPageLink.from_page_id)
+            .where(ManPage.dataset_release_id == release_id)
+            .where(ManPageLink.link_type.in_(["see_also", "xref"]))
+        )
+    ).all()
+    priors = link_rank(list(page_ids), [(link.from_page_id, link.to_page_id) for link in links])
+    if priors:
+        await conn.execute(
+            update(ManPageSearch)
+            .where(ManPageSearch.dataset_release_id == release_id)
+            .where(ManPageSearch.man_page_id == bindparam("page_id"))
+            .values(rank_prior=bindparam("prior")),
+            [{"page_id": page_id, "prior": prior} for page_id, prior in priors.items()],
+        )
+
+
+async def rebuild_page_variants(conn: AsyncConnection, *, locale: str) -> None:
+    distro_order = literal(list(DISTRO_ORDER), ARRAY(String))
+    variant_order = (
+        func.array_position(distro_order, DatasetRelease.distro).asc().nulls_last(),
+        DatasetRelease.distro.asc(),
+    )
+
+    variants = func.jsonb_agg(
+        aggregate_order_by(
+            func.jsonb_build_object(
+                "distro",
+                DatasetRelease.distro,
+                "contentSha256",
+                ManPage.content_sha256,
+            ),
+            *variant_order,
+        )
+    )
+    content_key = func.string_agg(
+        func.concat_ws(":", DatasetRelease.distro, ManPage.content_sha256),
+        aggregate_order_by(literal(","), *variant_order),
+    )
+
+    await conn.execute(delete(ManPageVariants).where(ManPageVariants.locale == locale))
+    await conn.execute(
+        insert(ManPageVariants).from_select(
+            ["locale", "name", "section", "variants", "content_key"],
+            select(
+                DatasetRelease.locale,
+                ManPage.name,
+                ManPage.section,
+                variants,
+                content_key,
+            )
+            .join(ManPage, ManPage.dataset_release_id == DatasetRelease.id)
+            .where(DatasetRelease.is_active)
+            .where(DatasetRelease.locale == locale)
+            .group_by(DatasetRelease.locale, ManPage.name, ManPage.section),
+        )
+    )
+
+
+async def _activate(dataset_release_id: str) -> None:
+    settings = Settings()
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    try:
+        async with engine.begin() as conn:
+            deactivated = await activate_release(conn, dataset_release_id=dataset_release_id)
+    finally:
+        await engine.dispose()
+
+    get_logger(action="activate_release").info(
+        "release_activated", dataset_release_id=dataset_release_id
+    )
+
+    redis = from_url(settings.redis_url)
+    try:
+        await publish_release_change(redis, dataset_release_id=dataset_release_id)
+        for old_release_id in deactivated:
+            await drop_release_namespace(redis, dataset_release_id=old_release_id)
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Activate a dataset release")
+    parser.add_argument("dataset_release_id")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(_activate(args.dataset_release_id))
+
+
+if __name__ == "__main__":
+    main()
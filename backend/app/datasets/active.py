@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import APIError
+from app.datasets.release_cache import ActiveReleaseCache
 from app.db.models import DatasetRelease
 
 
@@ -12,8 +13,16 @@ async def get_active_release(
     *,
     locale: str = "en",
     distro: str = "debian",
+    cache: ActiveReleaseCache | None = None,
 ) -> DatasetRelease | None:
-    return await session.scalar(
+    generation = 0
+    if cache is not None:
+        hit, cached = cache.get(locale=locale, distro=distro)
+        if hit:
+            return cached
+        generation = cache.generation
+
+    release = await session.scalar(
         select(DatasetRelease)
         .where(DatasetRelease.is_active)
         .where(DatasetRelease.locale == locale)
@@ -22,18 +31,30 @@ async def get_active_release(
         .limit(1)
     )
 
+    if cache is not None:
+        if isinstance(release, DatasetRelease):
+            # Outlives this session; a later rollback must not expire its attributes.
+            session.expunge(release)
+        cache.put(locale=locale, distro=distro, release=release, generation=generation)
+    return release
+
 
 async def require_active_release(
     session: AsyncSession,
     *,
     locale: str = "en",
     distro: str = "debian",
+    cache: ActiveReleaseCache | None = None,
 ) -> DatasetRelease:
-    active = await get_active_release(session, locale=locale, distro=distro)
+    active = await get_active_release(session, locale=locale, distro=distro, cache=cache)
     if active is None:
-        raise APIError(
-            status_code=503,
-            code="DATASET_UNAVAILABLE",
-            message="Dataset is not available yet",
-        )
+        raise dataset_unavailable()
     return active
+
+
+def dataset_unavailable() -> APIError:
+    return APIError(
+        status_code=503,
+        code="DATASET_UNAVAILABLE",
+        message="Dataset is not available yet",
+    )
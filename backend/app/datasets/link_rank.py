@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from uuid import UUID
+
+LINK_RANK_DAMPING = 0.85
+LINK_RANK_ITERATIONS = 20
+
+
+def link_rank(
+    page_ids: Sequence[UUID],
+    links: Iterable[tuple[UUID, UUID]],
+    *,
+    damping: float = LINK_RANK_DAMPING,
+    iterations: int = LINK_RANK_ITERATIONS,
+) -> dict[UUID, float]:
+    """PageRank of a release's pages over its (from, to) links, scaled so the top is 1.0.
+
+    Duplicate links and self-links count once and not at all; links to pages outside
+    ``page_ids`` are dropped. Pages without outgoing links spread their rank evenly.
+    """
+    n = len(page_ids)
+    if n == 0:
+        return {}
+    position = {page_id: i for i, page_id in enumerate(page_ids)}
+    targets: list[list[int]] = [[] for _ in range(n)]
+    for from_id, to_id in set(links):
+        if from_id == to_id or from_id not in position or to_id not in position:
+            continue
+        targets[position[from_id]].append(position[to_id])
+
+    rank = [1.0 / n] * n
+    for _ in range(iterations):
+        dangling = sum(r for r, out in zip(rank, targets, strict=True) if not out)
+        base = (1.0 - damping + damping * dangling) / n
+        next_rank = [base] * n
+        for r, out in zip(rank, targets, strict=True):
+            if out:
+                share = damping * r / len(out)
+                for i in out:
+                    next_rank[i] += share
+        rank = next_rank
+
+    top = max(rank)
+    return {page_id: rank[i] / top for page_id, i in position.items()}
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Rows of releases ingested but not activated yet; ingestion inserts land here. Each
+# activation moves its release out and retirement deletes abandoned ones, so it stays
+# close to empty.
+SEARCH_DEFAULT_PARTITION = "man_page_search_default"
+
+_SEARCH_INDEX_PREFIX = "ix_man_page_search_"
+
+
+def search_partition_name(release_id: UUID) -> str:
+    return f"man_page_search_{release_id.hex}"
+
+
+def _search_partition_index_name(release_id: UUID, parent_index: str) -> str:
+    # ix_man_page_search_<hex>_... would pass Postgres' 63-character limit.
+    return f"ix_search_{release_id.hex}_{parent_index.removeprefix(_SEARCH_INDEX_PREFIX)}"
+
+
+async def has_search_partition(conn: AsyncConnection, *, release_id: UUID) -> bool:
+    partition = await conn.scalar(select(func.to_regclass(search_partition_name(release_id))))
+    return partition is not None
+
+
+async def attach_search_partition(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Move a release's man_page_search rows out of the default partition into their own.
+
+    The rows are copied into a plain table nobody reads yet, which then gets the
+    parent's primary key and indexes, so ATTACH adopts those instead of building
+    them. Two CHECK constraints prove the new partition's bound and that the default
+    partition has no rows for the release, so ATTACH scans neither table for it. The
+    default partition's CHECK is validated with one scan of the default partition.
+    ATTACH still clones the man_pages foreign key and validates it by scanning the
+    new partition, holding SHARE ROW EXCLUSIVE on man_pages, which blocks writes but
+    not reads. A pre-created foreign key would be adopted but would take ACCESS
+    EXCLUSIVE on man_pages instead.
+
+    ATTACH holds SHARE UPDATE EXCLUSIVE on man_page_search, so reads and writes go on.
+    It takes ACCESS EXCLUSIVE on the new and default partitions, which is held until
+    the caller commits, so activation runs this last. A release that already has its
+    partition is left alone.
+    """
+    if await has_search_partition(conn, release_id=release_id):
+        return
+    # Identifiers are built from the UUID's hex digits and its literal, never user text.
+    partition = search_partition_name(release_id)
+    default_check = f"{SEARCH_DEFAULT_PARTITION}_not_{release_id.hex}"
+    params = {"release_id": release_id}
+    await conn.execute(text(f"CREATE TABLE {partition} (LIKE man_page_search INCLUDING DEFAULTS)"))
+    await conn.execute(
+        text(
+            f"INSERT INTO {partition} SELECT * FROM {SEARCH_DEFAULT_PARTITION} "
+            "WHERE dataset_release_id = :release_id"
+        ),
+        params,
+    )
+    await conn.execute(
+        text(f"DELETE FROM {SEARCH_DEFAULT_PARTITION} WHERE dataset_release_id = :release_id"),
+        params,
+    )
+
+    await conn.execute(
+        text(
+            f"ALTER TABLE {partition} ADD CONSTRAINT {partition}_pkey "
+            "PRIMARY KEY (man_page_id, dataset_release_id)"
+        )
+    )
+    parent_indexes = await conn.execute(
+        text(
+            "SELECT schemaname, indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = 'man_page_search' "
+            "AND starts_with(indexname, :prefix)"
+        ),
+        {"prefix": _SEARCH_INDEX_PREFIX},
+    )
+    for index in parent_indexes.all():
+        head = f"CREATE INDEX {index.indexname} ON ONLY {index.schemaname}.man_page_search "
+        if not index.indexdef.startswith(head):
+            raise RuntimeError(f"unexpected man_page_search index: {index.indexdef}")
+        name = _search_partition_index_name(release_id, index.indexname)
+        await conn.execute(
+            text(f"CREATE INDEX {name} ON {partition} {index.indexdef.removeprefix(head)}")
+        )
+
+    # Worded as Postgres words the partition constraints, so it can prove them.
+    await conn.execute(
+        text(
+            f"ALTER TABLE {partition} ADD CONSTRAINT {partition}_bound "
+            f"CHECK (dataset_release_id IS NOT NULL AND dataset_release_id = '{release_id}')"
+        )
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE {SEARCH_DEFAULT_PARTITION} ADD CONSTRAINT {default_check} "
+            f"CHECK (dataset_release_id IS NULL OR dataset_release_id <> '{release_id}')"
+        )
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE man_page_search ATTACH PARTITION {partition} "
+            f"FOR VALUES IN ('{release_id}')"
+        )
+    )
+    await conn.execute(text(f"ALTER TABLE {partition} DROP CONSTRAINT {partition}_bound"))
+    await conn.execute(
+        text(f"ALTER TABLE {SEARCH_DEFAULT_PARTITION} DROP CONSTRAINT {default_check}")
+    )
+
+
+async def drop_search_partition(conn: AsyncConnection, *, release_id: UUID) -> None:
+    """Drop a release's man_page_search partition: its rows and index entries at once."""
+    if await has_search_partition(conn, release_id=release_id):
+        await conn.execute(text(f"DROP TABLE {search_partition_name(release_id)}"))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.logging import get_logger
+from app.db.models import DatasetRelease
+
+RELEASES_CHANNEL = "betterman:releases"
+
+_LISTEN_RETRY_MAX_SECONDS = 30.0
+
+
+class ActiveReleaseCache:
+    """Per-worker cache of the active release for each (locale, distro).
+
+    Entries are dropped when a release activation is announced on RELEASES_CHANNEL;
+    the TTL bounds staleness if a message is missed while Redis is unreachable.
+    """
+
+    def __init__(self, *, ttl_seconds: float):
+        self._ttl_seconds = ttl_seconds
+        self._entries: dict[tuple[str, str], tuple[float, DatasetRelease | None]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, *, locale: str, distro: str) -> tuple[bool, DatasetRelease | None]:
+        entry = self._entries.get((locale, distro))
+        if entry is None:
+            return False, None
+        expires_at, release = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop((locale, distro), None)
+            return False, None
+        return True, release
+
+    def put(
+        self,
+        *,
+        locale: str,
+        distro: str,
+        release: DatasetRelease | None,
+        generation: int,
+    ) -> None:
+        # A lookup that raced with an invalidation must not resurrect the old release.
+        if generation != self._generation:
+            return
+        self._entries[(locale, distro)] = (time.monotonic() + self._ttl_seconds, release)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+
+async def publish_release_change(redis: Redis, *, dataset_release_id: str) -> None:
+    try:
+        await redis.publish(RELEASES_CHANNEL, dataset_release_id)
+    except RedisError as exc:
+        # Workers fall back to the cache TTL.
+        get_logger(action="release_cache").warning("release_publish_failed", error=str(exc))
+
+
+async def listen_for_release_changes(redis: Redis, on_change: Callable[[], None]) -> None:
+    """Call ``on_change`` for every announced activation and after each (re)subscribe."""
+    logger = get_logger(action="release_cache")
+    backoff = 1.0
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(RELEASES_CHANNEL)
+                # Anything may have changed while we were not subscribed.
+                on_change()
+                backoff = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    on_change()
+                    logger.info("release_caches_invalidated")
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, OSError) as exc:
+            logger.warning("release_listen_failed", error=str(exc), retry_in_s=backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _LISTEN_RETRY_MAX_SECONDS)
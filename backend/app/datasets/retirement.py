@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from redis.asyncio import from_url
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import Settings
+from app.core.logging import configure_logging, get_logger
+from app.datasets.partitions import drop_search_partition
+from app.db.models import DatasetRelease
+from app.web.response_cache import drop_release_namespace
+
+
+async def retire_release(conn: AsyncConnection, *, dataset_release_id: str) -> None:
+    """Delete an inactive release and everything derived from it.
+
+    The release's man_page_search partition is dropped first, so its rows and index
+    entries go without a scan or vacuum; the remaining tables follow by cascade.
+    """
+    row = (
+        await conn.execute(
+            select(DatasetRelease.id, DatasetRelease.is_active).where(
+                DatasetRelease.dataset_release_id == dataset_release_id
+            )
+        )
+    ).one_or_none()
+    if row is None:
+        raise LookupError(f"unknown dataset release: {dataset_release_id}")
+    if row.is_active:
+        raise ValueError(f"dataset release is active: {dataset_release_id}")
+
+    await drop_search_partition(conn, release_id=row.id)
+    await conn.execute(delete(DatasetRelease).where(DatasetRelease.id == row.id))
+
+
+async def _retire(dataset_release_id: str) -> None:
+    settings = Settings()
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    try:
+        async with engine.begin() as conn:
+            await retire_release(conn, dataset_release_id=dataset_release_id)
+    finally:
+        await engine.dispose()
+
+    get_logger(action="retire_release").info(
+        "release_retired", dataset_release_id=dataset_release_id
+    )
+
+    redis = from_url(settings.redis_url)
+    try:
+        await drop_release_namespace(redis, dataset_release_id=dataset_release_id)
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retire an inactive dataset release")
+    parser.add_argument("dataset_release_id")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(_retire(args.dataset_release_id))
+
+
+if __name__ == "__main__":
+    main()
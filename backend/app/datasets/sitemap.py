@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+# Sitemap protocol limit is 50k URLs; smaller shards keep each file cheap to build.
+SITEMAP_URLS_PER_FILE = 10_000
+
+
+def render_sitemap_xml(*, origin: str, distro: str, items: Iterable[tuple[str, str]]) -> bytes:
+    """A <urlset> of the man page URLs of (name, section) items, as the frontend links them."""
+    # The default distro is served without the query parameter (see withDistro in nextjs).
+    query = "" if distro == "debian" else f"?distro={quote(distro, safe='')}"
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for name, section in items:
+        loc = f"{origin}/man/{quote(name, safe='')}/{quote(section, safe='')}{query}"
+        lines.append(f"  <url>\n    <loc>{escape(loc)}</loc>\n  </url>")
+    lines.append("</urlset>")
+    return ("\n".join(lines) + "\n").encode()
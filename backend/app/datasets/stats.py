@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DatasetRelease, ReleaseSectionStat
+from app.man.sections import section_sort_key
+
+
+@dataclass(frozen=True)
+class SectionStat:
+    section: str
+    label: str
+    total: int
+
+
+async def list_section_stats(session: AsyncSession, *, release_id: uuid.UUID) -> list[SectionStat]:
+    """Per-section page totals of a release, in display order."""
+    rows = (
+        await session.execute(
+            select(
+                ReleaseSectionStat.section,
+                ReleaseSectionStat.label,
+                ReleaseSectionStat.total,
+            ).where(ReleaseSectionStat.dataset_release_id == release_id)
+        )
+    ).all()
+    stats = [SectionStat(section=r.section, label=r.label, total=r.total) for r in rows]
+    return sorted(stats, key=lambda stat: section_sort_key(stat.section))
+
+
+async def get_section_total(
+    session: AsyncSession, *, release_id: uuid.UUID, section: str
+) -> int | None:
+    return await session.scalar(
+        select(ReleaseSectionStat.total)
+        .where(ReleaseSectionStat.dataset_release_id == release_id)
+        .where(ReleaseSectionStat.section == section)
+    )
+
+
+async def get_page_count(session: AsyncSession, *, release_id: uuid.UUID) -> int:
+    total = await session.scalar(
+        select(func.sum(ReleaseSectionStat.total)).where(
+            ReleaseSectionStat.dataset_release_id == release_id
+        )
+    )
+    return int(total or 0)
+
+
+async def list_active_release_page_counts(
+    session: AsyncSession, *, locale: str = "en"
+) -> list[tuple[DatasetRelease, int]]:
+    """Every active release of a locale with its page count, in one query."""
+    page_count = func.coalesce(func.sum(ReleaseSectionStat.total), 0)
+    rows = (
+        await session.execute(
+            select(DatasetRelease, page_count)
+            .outerjoin(
+                ReleaseSectionStat,
+                ReleaseSectionStat.dataset_release_id == DatasetRelease.id,
+            )
+            .where(DatasetRelease.is_active)
+            .where(DatasetRelease.locale == locale)
+            .group_by(DatasetRelease.id)
+            .order_by(DatasetRelease.distro.asc())
+        )
+    ).all()
+    return [(release, int(count)) for release, count in rows]
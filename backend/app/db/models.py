@@ -6,8 +6,10 @@ from datetime import datetime
 from sqlalchemy import (
     Boolean,
     DateTime,
+    Float,
     ForeignKey,
     Index,
+    Integer,
     String,
     Text,
     UniqueConstraint,
@@ -60,7 +62,13 @@ class ManPage(Base):
     source_package_version: Mapped[str | None] = mapped_column(String, nullable=True)
 
     content_sha256: Mapped[str] = mapped_column(String, nullable=False)
+    # dataset_release_id where this content_sha256 was first served for the page in a
+    # row of consecutive releases of its (locale, distro); set at activation.
+    content_unchanged_since: Mapped[str | None] = mapped_column(String, nullable=True)
     has_parse_warnings: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # 1-based sitemap shard of the page within its release, in (name, section) order;
+    # set at activation.
+    sitemap_page: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     __table_args__ = (
         UniqueConstraint(
@@ -70,6 +78,13 @@ class ManPage(Base):
             name="uq_man_pages_release_name_section",
         ),
         Index("ix_man_pages_release_section_name", "dataset_release_id", "section", "name"),
+        Index(
+            "ix_man_pages_release_sitemap_page",
+            "dataset_release_id",
+            "sitemap_page",
+            "name",
+            "section",
+        ),
     )
 
 
@@ -88,6 +103,11 @@ class ManPageContent(Base):
     synopsis: Mapped[object | None] = mapped_column(JSONB, nullable=True)
     options: Mapped[object | None] = mapped_column(JSONB, nullable=True)
     see_also: Mapped[object | None] = mapped_column(JSONB, nullable=True)
+    # sha256 of the served content JSON (doc plus the extracted sections), set at
+    # activation; addresses the immutable /content/{sha256} resource.
+    served_sha256: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    __table_args__ = (Index("ix_man_page_content_served_sha256", "served_sha256"),)
 
 
 class ManPageSearch(Base):
@@ -99,24 +119,57 @@ class ManPageSearch(Base):
         primary_key=True,
     )
 
+    # Weighted at activation (see app.man.search.SEARCH_TSV): name A, description B,
+    # headings C, body D.
     tsv: Mapped[object] = mapped_column(TSVECTOR, nullable=False)
     name_norm: Mapped[str] = mapped_column(Text, nullable=False)
     desc_norm: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    # Partition key: activation moves a release's rows out of man_page_search_default
+    # into a partition of their own (app.datasets.partitions). Filled from man_pages
+    # by a trigger when an insert leaves it out.
+    dataset_release_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    # Copies of the man_pages fields search filters on and returns, so the search
+    # paths never join back to man_pages; set at activation.
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    section: Mapped[str | None] = mapped_column(String, nullable=True)
+    title: Mapped[str | None] = mapped_column(String, nullable=True)
+    description: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Bounded highlight source (see app.man.search.SNIPPET_TEXT); set at activation.
+    snippet_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Link-graph rank of the page within its release, top page 1.0; set at activation.
+    rank_prior: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")
 
     __table_args__ = (
         Index("ix_man_page_search_tsv", "tsv", postgresql_using="gin"),
+        # Exact and prefix tiers: one release's names, in byte order so `LIKE 'x%'`
+        # is a range scan.
+        Index(
+            "ix_man_page_search_release_name_norm",
+            "dataset_release_id",
+            "name_norm",
+            postgresql_ops={"name_norm": "text_pattern_ops"},
+            postgresql_include=["man_page_id"],
+        ),
         Index(
             "ix_man_page_search_name_trgm",
             "name_norm",
             postgresql_using="gin",
             postgresql_ops={"name_norm": "gin_trgm_ops"},
         ),
+        # GiST also answers `ORDER BY name_norm <-> q` (nearest names first); GIN can't.
+        Index(
+            "ix_man_page_search_name_trgm_gist",
+            "name_norm",
+            postgresql_using="gist",
+            postgresql_ops={"name_norm": "gist_trgm_ops"},
+        ),
         Index(
             "ix_man_page_search_desc_trgm",
             "desc_norm",
             postgresql_using="gin",
             postgresql_ops={"desc_norm": "gin_trgm_ops"},
         ),
+        {"postgresql_partition_by": "LIST (dataset_release_id)"},
     )
 
 
@@ -141,6 +194,35 @@ class ManPageLink(Base):
     )
 
 
+class ManPageVariants(Base):
+    """Cross-distro variants of a page across active releases, rebuilt at activation."""
+
+    __tablename__ = "man_page_variants"
+
+    locale: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    section: Mapped[str] = mapped_column(String, primary_key=True)
+
+    variants: Mapped[list] = mapped_column(JSONB, nullable=False)
+    # "distro:contentSha256,..." - changes only when a variant's content does.
+    content_key: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+
+class ReleaseSectionStat(Base):
+    """Pages per section of a dataset release, rebuilt at activation."""
+
+    __tablename__ = "release_section_stats"
+
+    dataset_release_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("dataset_releases.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    section: Mapped[str] = mapped_column(String, primary_key=True)
+    label: Mapped[str] = mapped_column(String, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class License(Base):
     __tablename__ = "licenses"
 
@@ -32,3 +32,8 @@ async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_maker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """For queries that run concurrently with the request's session, on their own connections."""
+    return request.app.state.db_sessionmaker
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from time import perf_counter
 from urllib.parse import urlparse
 from uuid import uuid4
@@ -17,9 +18,16 @@ from app.core.config import Settings
 from app.core.errors import APIError
 from app.core.logging import configure_logging, get_logger
 from app.core.observability import init_sentry
+from app.datasets.release_cache import ActiveReleaseCache, listen_for_release_changes
 from app.db.session import create_engine, create_session_maker
+from app.man.etag_index import PageEtagIndexes
+from app.man.name_index import NameIndexes
 from app.security.headers import SecurityHeadersMiddleware
 from app.security.request_ip import get_client_ip
+from app.web.hot_keys import HotKeyTracker, flush_hot_keys_periodically
+from app.web.response_cache import ResponseCache
+from app.web.single_flight import SingleFlight
+from app.web.warmup import WARMUP_STATE_KEY, CacheWarmer
 
 
 def create_app() -> FastAPI:
@@ -29,10 +37,55 @@ def create_app() -> FastAPI:
 
     db_engine = create_engine(settings)
     redis: Redis = from_url(settings.redis_url)
+    active_releases = ActiveReleaseCache(ttl_seconds=settings.active_release_cache_ttl_seconds)
+    page_etags = PageEtagIndexes(
+        ttl_seconds=settings.page_etag_index_ttl_seconds,
+        max_releases=settings.page_etag_index_max_releases,
+    )
+    name_indexes = NameIndexes(
+        ttl_seconds=settings.name_index_ttl_seconds,
+        max_releases=settings.name_index_max_releases,
+    )
+    response_cache = ResponseCache(
+        redis,
+        l1_max_bytes=settings.response_cache_l1_max_bytes,
+        l2_ttl_seconds=settings.response_cache_l2_ttl_seconds,
+        fill_lock_seconds=settings.response_cache_fill_lock_seconds,
+    )
+    hot_keys = HotKeyTracker(window_hours=settings.hot_keys_window_hours)
 
     @asynccontextmanager
     async def lifespan(_app: FastAPI):
+        cache_warmer = CacheWarmer(
+            _app,
+            redis,
+            hot_keys,
+            limit=settings.cache_warmup_top_n,
+            concurrency=settings.cache_warmup_concurrency,
+            lock_seconds=settings.cache_warmup_lock_seconds,
+        )
+
+        def _on_release_change() -> None:
+            active_releases.invalidate()
+            page_etags.invalidate()
+            # Also runs once the listener first subscribes, i.e. on worker startup.
+            cache_warmer.schedule()
+
+        background = [
+            asyncio.create_task(listen_for_release_changes(redis, _on_release_change)),
+            asyncio.create_task(
+                flush_hot_keys_periodically(
+                    redis, hot_keys, interval_seconds=settings.hot_keys_flush_seconds
+                )
+            ),
+        ]
         yield
+        for task in background:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await cache_warmer.aclose()
+        await hot_keys.flush(redis)
         await db_engine.dispose()
         await redis.aclose()
 
@@ -53,6 +106,12 @@ def create_app() -> FastAPI:
     app.state.db_engine = db_engine
     app.state.db_sessionmaker = create_session_maker(db_engine)
     app.state.redis = redis
+    app.state.active_releases = active_releases
+    app.state.page_etags = page_etags
+    app.state.name_indexes = name_indexes
+    app.state.response_cache = response_cache
+    app.state.page_loads = SingleFlight()
+    app.state.hot_keys = hot_keys
 
     csp_script_src_extra: list[str] = []
     csp_connect_src_extra: list[str] = []
@@ -113,6 +172,10 @@ def create_app() -> FastAPI:
 
         response.headers.setdefault("X-Request-ID", request_id)
 
+        warmup = getattr(request.state, WARMUP_STATE_KEY, False)
+        if request.method == "GET" and response.status_code == 200 and not warmup:
+            hot_keys.record(request.url.path, request.url.query)
+
         get_logger(
             request_id=request_id,
             ip=get_client_ip(request),
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import cast
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DatasetRelease, ManPage, ManPageVariants
+from app.man.etags import page_etag_digest
+from app.man.release_index import ReleaseIndexes
+
+_DIGEST_SIZE = 20
+
+
+def _page_key(name: str, section: str) -> int:
+    digest = hashlib.blake2b(f"{name}\0{section}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+@dataclass(frozen=True)
+class PageEtagIndex:
+    """Sorted 64-bit (name, section) keys with the matching etag digests.
+
+    Roughly 28 bytes per page, so a 50k-page release stays under 2 MiB.
+    """
+
+    keys: array
+    digests: bytes
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple[str, str, bytes]]) -> PageEtagIndex:
+        digests: dict[int, bytes | None] = {}
+        for name, section, etag_digest in rows:
+            key = _page_key(name, section)
+            # Two pages sharing a key can't be told apart; let both take the slow path.
+            digests[key] = None if key in digests else etag_digest
+        kept = sorted((k, d) for k, d in digests.items() if d is not None)
+        return cls(
+            keys=array("Q", (k for k, _ in kept)),
+            digests=b"".join(d for _, d in kept),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.keys.itemsize * len(self.keys) + len(self.digests)
+
+    def get(self, *, name: str, section: str) -> bytes | None:
+        key = _page_key(name, section)
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        return self.digests[i * _DIGEST_SIZE : (i + 1) * _DIGEST_SIZE]
+
+
+class PageEtagIndexes(ReleaseIndexes):
+    """Per-worker etag indexes for /man/{name}/{section}, one per dataset release.
+
+    Page etags also cover the other distros' variants, so every release activation
+    clears all indexes. An announcement missed while Redis was unreachable is covered
+    by the listener clearing them again on resubscribe; the long TTL is a backstop.
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_releases: int):
+        super().__init__(
+            name="page_etag_index",
+            load=_load_page_etag_index,
+            ttl_seconds=ttl_seconds,
+            max_releases=max_releases,
+        )
+
+    def get(self, release_id: UUID) -> PageEtagIndex | None:
+        return cast(PageEtagIndex | None, super().get(release_id))
+
+
+async def _load_page_etag_index(session: AsyncSession, release: DatasetRelease) -> PageEtagIndex:
+    return PageEtagIndex.from_rows(await load_page_etag_rows(session, release=release))
+
+
+async def load_page_etag_rows(
+    session: AsyncSession, *, release: DatasetRelease
+) -> list[tuple[str, str, bytes]]:
+    result = await session.execute(
+        select(
+            ManPage.name,
+            ManPage.section,
+            ManPage.content_sha256,
+            ManPage.content_unchanged_since,
+            ManPage.title,
+            ManPage.description,
+            ManPage.source_package,
+            ManPage.source_package_version,
+            ManPageVariants.content_key,
+        )
+        .outerjoin(
+            ManPageVariants,
+            and_(
+                ManPageVariants.locale == release.locale,
+                ManPageVariants.name == ManPage.name,
+                ManPageVariants.section == ManPage.section,
+            ),
+        )
+        .where(ManPage.dataset_release_id == release.id)
+    )
+    return [
+        (
+            page.name,
+            page.section,
+            page_etag_digest(page, variants_content_key=page.content_key or ""),
+        )
+        for page in result.all()
+    ]
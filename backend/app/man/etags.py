@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.web.http_cache import weak_etag_digest
+
+
+class PageIdentity(Protocol):
+    content_sha256: str
+    content_unchanged_since: str | None
+    title: str
+    description: str
+    source_package: str | None
+    source_package_version: str | None
+
+
+def page_etag_digest(page: PageIdentity, *, variants_content_key: str) -> bytes:
+    """ETag of a man page response, shared by the routes and the etag index.
+
+    Built from what the reader sees rather than the release, so a page whose content
+    survives a re-ingest keeps its etag and revalidations keep getting 304s.
+    """
+    return weak_etag_digest(
+        "man-page",
+        page.content_sha256,
+        page.content_unchanged_since or "",
+        page.title,
+        page.description,
+        page.source_package or "",
+        page.source_package_version or "",
+        variants_content_key,
+    )
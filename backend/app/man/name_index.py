@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import heapq
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import NamedTuple, cast
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DatasetRelease, ManPageSearch
+from app.man.release_index import ReleaseIndexes
+
+# pg_trgm's word characters: alphanumerics; everything else separates words.
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """pg_trgm's trigram set: per word, padded with two spaces before and one after."""
+    out: set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        out.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(out)
+
+
+class NamedPage(NamedTuple):
+    name_norm: str
+    name: str
+    section: str
+    description: str
+
+
+@dataclass(frozen=True)
+class NameIndex:
+    """Trigram inverted index over the distinct name_norm values of a release.
+
+    Answers nearest_names() in memory with pg_trgm's semantics: similarity is shared
+    trigrams over the union, ``%`` is similarity >= threshold, and results come
+    nearest first, then by (name, section). ``names`` is sorted, so prefix
+    completion is a bisect.
+    """
+
+    names: list[str]
+    # Per name: number of distinct trigrams, and its pages as [start, end) into pages.
+    trigram_counts: array
+    page_starts: array
+    pages: list[NamedPage]
+    postings: dict[str, array]
+
+    @classmethod
+    def from_pages(cls, pages: list[NamedPage]) -> NameIndex:
+        pages = sorted(pages, key=lambda p: (p.name_norm, p.name, p.section))
+        names: list[str] = []
+        trigram_counts = array("I")
+        page_starts = array("I")
+        postings: dict[str, array] = {}
+        for i, page in enumerate(pages):
+            if names and names[-1] == page.name_norm:
+                continue
+            name_id = len(names)
+            names.append(page.name_norm)
+            page_starts.append(i)
+            grams = trigrams(page.name_norm)
+            trigram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, array("I")).append(name_id)
+        page_starts.append(len(pages))
+        return cls(
+            names=names,
+            trigram_counts=trigram_counts,
+            page_starts=page_starts,
+            pages=pages,
+            postings=postings,
+        )
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate heap size: strings, tuples, arrays and the postings dict."""
+        size = sys.getsizeof(self.names) + sys.getsizeof(self.pages)
+        size += sum(sys.getsizeof(name) for name in self.names)
+        for page in self.pages:
+            size += sys.getsizeof(page) + sum(sys.getsizeof(field) for field in page[1:])
+        size += sys.getsizeof(self.trigram_counts) + sys.getsizeof(self.page_starts)
+        size += sys.getsizeof(self.postings)
+        size += sum(sys.getsizeof(g) + sys.getsizeof(p) for g, p in self.postings.items())
+        return size
+
+    def complete(self, prefix: str, *, limit: int) -> list[NamedPage]:
+        """Pages whose name_norm starts with ``prefix``, by (name_norm, name, section)."""
+        out: list[NamedPage] = []
+        name_id = bisect_left(self.names, prefix)
+        while name_id < len(self.names) and self.names[name_id].startswith(prefix):
+            for i in range(self.page_starts[name_id], self.page_starts[name_id + 1]):
+                if len(out) == limit:
+                    return out
+                out.append(self.pages[i])
+            name_id += 1
+        return out
+
+    def nearest(self, query_norm: str, *, threshold: float, limit: int) -> list[NamedPage]:
+        """Pages whose name_norm is ``%``-similar to ``query_norm``, nearest first."""
+        query_grams = trigrams(query_norm)
+        if not query_grams or limit <= 0:
+            return []
+        shared: Counter[int] = Counter()
+        for gram in query_grams:
+            posting = self.postings.get(gram)
+            if posting is not None:
+                shared.update(posting)
+
+        query_count = len(query_grams)
+        candidates: list[tuple[float, NamedPage]] = []
+        for name_id, common in shared.items():
+            similarity = common / (query_count + self.trigram_counts[name_id] - common)
+            if similarity < threshold:
+                continue
+            distance = 1.0 - similarity
+            start, end = self.page_starts[name_id], self.page_starts[name_id + 1]
+            candidates.extend((distance, page) for page in self.pages[start:end])
+        return [
+            page
+            for _distance, page in heapq.nsmallest(
+                limit, candidates, key=lambda c: (c[0], c[1].name, c[1].section)
+            )
+        ]
+
+
+class NameIndexes(ReleaseIndexes):
+    """Per-worker name indexes for /suggest, /complete and search suggestions.
+
+    A release's names never change, so nothing invalidates these; the LRU and TTL
+    only bound memory. Until a release's index is built, callers query Postgres.
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_releases: int):
+        super().__init__(
+            name="name_index",
+            load=_load_name_index,
+            ttl_seconds=ttl_seconds,
+            max_releases=max_releases,
+        )
+
+    def get(self, release_id: UUID) -> NameIndex | None:
+        return cast(NameIndex | None, super().get(release_id))
+
+
+async def _load_name_index(session: AsyncSession, release: DatasetRelease) -> NameIndex:
+    result = await session.execute(
+        select(
+            ManPageSearch.name_norm,
+            ManPageSearch.name,
+            ManPageSearch.section,
+            ManPageSearch.description,
+        ).where(ManPageSearch.dataset_release_id == release.id)
+    )
+    return NameIndex.from_pages([NamedPage(*row) for row in result.all()])
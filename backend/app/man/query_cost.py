@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import re
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.db.models import ManPageSearch
+from app.man.search import search_match_condition
+
+# Past these a query is rejected outright: each term and OR branch is another
+# bitmap scan for the full-text and fuzzy tier, and every match gets ranked.
+SEARCH_MAX_TERMS = 12
+SEARCH_MAX_OR_OPERATORS = 4
+# Most rate-limit tokens one search is charged; an ordinary query costs 1.
+SEARCH_MAX_COST = 5
+# Words shorter than a trigram share trigrams with a large part of the names.
+_SHORT_TERM_CHARS = 3
+
+# websearch_to_tsquery's tokens: quoted phrases and whitespace-separated words.
+_TOKEN_RE = re.compile(r'"[^"]*"?|\S+')
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class QueryCost:
+    """How expensive a search query looks from its text, before anything runs."""
+
+    terms: int
+    or_operators: int
+    short_terms: int
+
+    @property
+    def too_complex(self) -> bool:
+        return self.terms > SEARCH_MAX_TERMS or self.or_operators > SEARCH_MAX_OR_OPERATORS
+
+    @property
+    def cost(self) -> int:
+        """Rate-limit tokens: 1, plus one per OR, per 4 terms past 4 and per 2 short terms."""
+        extra = self.or_operators + max(0, self.terms - 4) // 4 + self.short_terms // 2
+        return min(1 + extra, SEARCH_MAX_COST)
+
+
+def estimate_query_cost(query: str) -> QueryCost:
+    terms = or_operators = short_terms = 0
+    for token in _TOKEN_RE.findall(query):
+        if token.lower() == "or":
+            or_operators += 1
+            continue
+        for word in _WORD_RE.findall(token):
+            terms += 1
+            if len(word) < _SHORT_TERM_CHARS:
+                short_terms += 1
+    return QueryCost(terms=terms, or_operators=or_operators, short_terms=short_terms)
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bound parameters bound."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON)
+def _compile_explain_json(element: _ExplainJSON, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def plan_cost(session: AsyncSession, *, release_id: uuid.UUID, query: str) -> float:
+    """The planner's total cost for matching ``query`` in a release; EXPLAIN only."""
+    statement = (
+        select(func.count())
+        .select_from(ManPageSearch)
+        .where(ManPageSearch.dataset_release_id == release_id)
+        .where(search_match_condition(query))
+    )
+    # The query text stays a bind parameter; it is never rendered into the SQL.
+    plan = (await session.execute(_ExplainJSON(statement))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return float(plan[0]["Plan"]["Total Cost"])
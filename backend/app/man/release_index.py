@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Protocol
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.logging import get_logger
+from app.db.models import DatasetRelease
+
+
+class ReleaseIndex(Protocol):
+    @property
+    def memory_bytes(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+
+class ReleaseIndexes:
+    """Per-worker in-memory indexes, one per dataset release, built in the background.
+
+    Kept in an LRU of ``max_releases`` entries that expire after ``ttl_seconds``.
+    ``load`` reads a release from the database and builds its index; it runs at most
+    once at a time per release, and requests never wait on it. Subclasses narrow the
+    index type of get().
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        load: Callable[[AsyncSession, DatasetRelease], Awaitable[ReleaseIndex]],
+        ttl_seconds: float,
+        max_releases: int,
+    ):
+        self._name = name
+        self._load = load
+        self._ttl_seconds = ttl_seconds
+        self._max_releases = max_releases
+        self._indexes: OrderedDict[UUID, tuple[float, ReleaseIndex]] = OrderedDict()
+        self._building: dict[UUID, asyncio.Task[None]] = {}
+        self._generation = 0
+
+    def get(self, release_id: UUID) -> ReleaseIndex | None:
+        entry = self._indexes.get(release_id)
+        if entry is None:
+            return None
+        expires_at, index = entry
+        if expires_at <= time.monotonic():
+            self._indexes.pop(release_id, None)
+            return None
+        self._indexes.move_to_end(release_id)
+        return index
+
+    def put(self, release_id: UUID, index: ReleaseIndex, *, generation: int) -> None:
+        if generation != self._generation:
+            return
+        self._indexes[release_id] = (time.monotonic() + self._ttl_seconds, index)
+        self._indexes.move_to_end(release_id)
+        while len(self._indexes) > self._max_releases:
+            self._indexes.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._indexes.clear()
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(index.memory_bytes for _expires_at, index in self._indexes.values())
+
+    def schedule_build(
+        self,
+        release: DatasetRelease,
+        session_maker: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """Build the index for ``release`` in the background; requests never wait on it."""
+        if release.id in self._building:
+            return
+        task = asyncio.create_task(self._build(release, session_maker, self._generation))
+        self._building[release.id] = task
+        task.add_done_callback(lambda _t: self._building.pop(release.id, None))
+
+    async def _build(
+        self,
+        release: DatasetRelease,
+        session_maker: async_sessionmaker[AsyncSession],
+        generation: int,
+    ) -> None:
+        logger = get_logger(action=self._name, dataset_release_id=release.dataset_release_id)
+        try:
+            async with session_maker() as session:
+                index = await self._load(session, release)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"{self._name}_build_failed", error=str(exc))
+            return
+
+        self.put(release.id, index, generation=generation)
+        logger.info(
+            f"{self._name}_built",
+            entries=len(index),
+            memory_bytes=index.memory_bytes,
+            total_memory_bytes=self.memory_bytes,
+        )
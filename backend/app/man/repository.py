@@ -1,23 +1,13 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import dataclass
 
-from sqlalchemy import select
+from sqlalchemy import Text, and_, case, cast, func, null, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.db.models import ManPage, ManPageContent, ManPageLink
-
-
-async def list_pages_by_name(
-    session: AsyncSession, *, release_id: uuid.UUID, name: str
-) -> list[ManPage]:
-    result = await session.execute(
-        select(ManPage)
-        .where(ManPage.dataset_release_id == release_id)
-        .where(ManPage.name == name)
-        .order_by(ManPage.section.asc(), ManPage.id.asc())
-    )
-    return list(result.scalars())
+from app.db.models import DatasetRelease, ManPage, ManPageContent, ManPageLink, ManPageVariants
 
 
 async def get_page_with_content(
@@ -37,6 +27,156 @@ async def get_page_with_content(
     return row[0], row[1]
 
 
+# The served content object is the stored doc plus the extracted sections. Postgres
+# renders it to JSON text so the page endpoint can splice it into the response body
+# without decoding and re-encoding the whole tree in Python.
+_CONTENT_JSON_TEXT = cast(
+    ManPageContent.doc.op("||")(
+        func.jsonb_build_object(
+            "synopsis",
+            ManPageContent.synopsis,
+            "options",
+            ManPageContent.options,
+            "seeAlso",
+            ManPageContent.see_also,
+        )
+    ),
+    Text,
+)
+_CONTENT_JSON = _CONTENT_JSON_TEXT.label("content_json")
+
+# Hash of exactly the bytes served for the content, stored as
+# man_page_content.served_sha256 at activation (and by migration 0005).
+SERVED_CONTENT_SHA256 = func.encode(func.sha256(func.convert_to(_CONTENT_JSON_TEXT, "UTF8")), "hex")
+
+
+@dataclass(frozen=True)
+class PageBundle:
+    release: DatasetRelease
+    pages: list[ManPage]
+    # Only loaded when exactly one page matched; otherwise the caller answers 409.
+    content_json: str | None
+    served_sha256: str | None
+    variants: list[dict[str, str]]
+    variants_content_key: str
+
+
+async def load_page_bundle(
+    session: AsyncSession,
+    *,
+    locale: str = "en",
+    distro: str,
+    name: str,
+    section: str | None = None,
+    include_content: bool = True,
+) -> PageBundle | None:
+    """Resolve the active release, matching pages, content and variants in one round trip.
+
+    Variants come from the man_page_variants table built at release activation. With
+    ``include_content=False`` only the content hash is loaded, for envelope responses.
+
+    Returns None when there is no active release; an empty ``pages`` list means the
+    release exists but the page does not.
+    """
+    active = (
+        select(DatasetRelease)
+        .where(DatasetRelease.is_active)
+        .where(DatasetRelease.locale == locale)
+        .where(DatasetRelease.distro == distro)
+        .order_by(DatasetRelease.ingested_at.desc())
+        .limit(1)
+        .subquery("active_release")
+    )
+    release = aliased(DatasetRelease, active)
+
+    page_match = and_(ManPage.dataset_release_id == release.id, ManPage.name == name)
+    if section is not None:
+        page_match = and_(page_match, ManPage.section == section)
+
+    content_json = (
+        select(_CONTENT_JSON)
+        .where(ManPageContent.man_page_id == ManPage.id)
+        .correlate(ManPage)
+        .scalar_subquery()
+    )
+    served_sha256 = (
+        select(ManPageContent.served_sha256)
+        .where(ManPageContent.man_page_id == ManPage.id)
+        .correlate(ManPage)
+        .scalar_subquery()
+    )
+
+    # Window count lets the single-match branch load content in the same statement
+    # while ambiguous names only pay for the page rows.
+    single_match = func.count(ManPage.id).over() == 1
+    rows = (
+        await session.execute(
+            select(
+                release,
+                ManPage,
+                (case((single_match, content_json)) if include_content else null()).label(
+                    "content_json"
+                ),
+                case((single_match, served_sha256)).label("served_sha256"),
+                ManPageVariants.variants,
+                ManPageVariants.content_key.label("variants_content_key"),
+            )
+            .select_from(release)
+            .outerjoin(ManPage, page_match)
+            .outerjoin(
+                ManPageVariants,
+                and_(
+                    ManPageVariants.locale == release.locale,
+                    ManPageVariants.name == ManPage.name,
+                    ManPageVariants.section == ManPage.section,
+                ),
+            )
+            .order_by(ManPage.section.asc(), ManPage.id.asc())
+        )
+    ).all()
+
+    if not rows:
+        return None
+
+    pages = [row[1] for row in rows if row[1] is not None]
+    first = rows[0]
+    single = len(pages) == 1
+    return PageBundle(
+        release=first[0],
+        pages=pages,
+        content_json=first.content_json if single else None,
+        served_sha256=first.served_sha256 if single else None,
+        variants=_coerce_variants(first.variants) if single else [],
+        variants_content_key=(first.variants_content_key or "") if single else "",
+    )
+
+
+def _coerce_variants(raw: object) -> list[dict[str, str]]:
+    # Stored in DISTRO_ORDER by rebuild_page_variants at activation.
+    if not isinstance(raw, list):
+        return []
+
+    variants = [
+        {
+            "distro": item["distro"],
+            "contentSha256": item["contentSha256"],
+        }
+        for item in raw
+        if isinstance(item, dict)
+        and isinstance(item.get("distro"), str)
+        and isinstance(item.get("contentSha256"), str)
+    ]
+    return variants
+
+
+async def load_served_content(session: AsyncSession, *, served_sha256: str) -> str | None:
+    """Content JSON text whose served hash is ``served_sha256``, from any release."""
+    result = await session.execute(
+        select(_CONTENT_JSON).where(ManPageContent.served_sha256 == served_sha256).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
 async def get_page(
     session: AsyncSession, *, release_id: uuid.UUID, name: str, section: str
 ) -> ManPage | None:
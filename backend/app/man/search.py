@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    and_,
+    case,
+    func,
+    literal,
+    literal_column,
+    not_,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ManPage, ManPageContent, ManPageSearch
+from app.man.sections import section_sort_key
+from app.man.trigram import similar_to
+from app.web.server_timing import elapsed_ms, mark
+
+# Highlights are cut from man_page_search.snippet_text, not the full plain text:
+# ts_headline re-parses its whole input, and plain text runs to hundreds of KB.
+SNIPPET_TEXT_MAX_CHARS = 4000
+
+# Description then plain text, whitespace collapsed and truncated; stored as
+# man_page_search.snippet_text at activation (and by migration 0010).
+SNIPPET_TEXT = func.left(
+    func.btrim(
+        func.regexp_replace(
+            func.concat_ws(" ", ManPage.description, ManPageContent.plain_text), r"\s+", " ", "g"
+        )
+    ),
+    SNIPPET_TEXT_MAX_CHARS,
+)
+
+# The weighted search document, stored as man_page_search.tsv at activation (and by
+# migration 0012): name A, description B, section headings C, body D. ts_rank_cd
+# then counts a hit in a name or heading for more than one deep in the body.
+SEARCH_TSV = (
+    func.setweight(func.to_tsvector("simple", ManPage.name), literal_column("'A'"))
+    .op("||")(
+        func.setweight(func.to_tsvector("simple", ManPage.description), literal_column("'B'"))
+    )
+    .op("||")(
+        func.setweight(
+            func.to_tsvector(
+                "simple",
+                func.jsonb_path_query_array(
+                    ManPageContent.doc, literal_column("'$.toc[*].title'::jsonpath")
+                ),
+            ),
+            literal_column("'C'"),
+        )
+    )
+    .op("||")(
+        func.setweight(func.to_tsvector("simple", ManPageContent.plain_text), literal_column("'D'"))
+    )
+)
+
+
+class SearchKey(NamedTuple):
+    """Sort key of a search result, as carried by a keyset cursor."""
+
+    tier: int
+    score: float
+    name_length: int
+    section: str
+    id: uuid.UUID
+
+
+@dataclass(frozen=True)
+class SearchTier:
+    name: str
+    # Matches only rows no earlier tier matched, so tiers concatenate without dupes.
+    condition: ColumnElement[bool]
+
+
+class _Matches(NamedTuple):
+    exact: ColumnElement[bool]
+    prefix: ColumnElement[bool]
+    fulltext: ColumnElement[bool]
+    fuzzy: ColumnElement[bool]
+
+
+def _matches(query_norm: str, tsquery: ColumnElement[Any]) -> _Matches:
+    return _Matches(
+        exact=ManPageSearch.name_norm == query_norm,
+        prefix=ManPageSearch.name_norm.like(f"{query_norm}%"),
+        fulltext=ManPageSearch.tsv.bool_op("@@")(tsquery),
+        fuzzy=or_(
+            similar_to(ManPageSearch.name_norm, query_norm),
+            similar_to(ManPageSearch.desc_norm, query_norm),
+        ),
+    )
+
+
+def search_tiers(query_norm: str, tsquery: ColumnElement[Any]) -> list[SearchTier]:
+    """Exact name, name prefix, then full text and fuzzy: most likely hits first.
+
+    The exact and prefix bonuses of search_score put those rows above the rest, so
+    they can run as tiers of their own. Full-text and fuzzy scores overlap (a close
+    name can outrank a weak body match), so they share one tier ranked by score.
+    """
+    exact, prefix, fulltext, fuzzy = _matches(query_norm, tsquery)
+    return [
+        SearchTier("exact", exact),
+        SearchTier("prefix", and_(prefix, not_(exact))),
+        SearchTier("text", and_(or_(fulltext, fuzzy), not_(prefix))),
+    ]
+
+
+# Weight of man_page_search.rank_prior (0..1, the page's link-graph rank): puts the
+# well-linked page first among similarly relevant ones; tiers still come first.
+SEARCH_PRIOR_WEIGHT = 2.0
+
+
+def search_score(query_norm: str, tsquery: ColumnElement[Any]) -> ColumnElement[Any]:
+    similarity_best = func.greatest(
+        func.similarity(ManPageSearch.name_norm, query_norm),
+        func.similarity(ManPageSearch.desc_norm, query_norm),
+    )
+    return (
+        case((ManPageSearch.name_norm == query_norm, 1000), else_=0)
+        + case((ManPageSearch.name_norm.like(f"{query_norm}%"), 100), else_=0)
+        + (func.ts_rank_cd(ManPageSearch.tsv, tsquery) * 10)
+        + (similarity_best * 2)
+        + (ManPageSearch.rank_prior * SEARCH_PRIOR_WEIGHT)
+    )
+
+
+async def run_tiered_search(
+    session: AsyncSession,
+    *,
+    release_id: uuid.UUID,
+    query: str,
+    section_norm: str | None,
+    limit: int,
+    offset: int,
+    after: SearchKey | None = None,
+    server_timing: list[tuple[str, float]],
+) -> list[Row[Any]]:
+    """Rows ``offset`` to ``offset + limit`` of the ranked results, tier by tier.
+
+    Results are ordered by tier, then by the search score within a tier, which is the
+    score order (see search_tiers). A tier only runs while earlier ones haven't filled
+    the page, so an exact command name never pays for the full-text or fuzzy scans.
+    Each tier that runs gets a timing entry.
+
+    With ``after`` (from a cursor) the page starts past that key instead: earlier
+    tiers are not queried at all, and nothing before the key is computed and dropped.
+    Rows carry ``tier``, ``score`` and ``name_length`` for the next cursor.
+    """
+    query_norm = query.lower()
+    tsquery = func.websearch_to_tsquery("simple", query)
+    score = search_score(query_norm, tsquery)
+    name_length = func.length(ManPageSearch.name)
+
+    filters = [ManPageSearch.dataset_release_id == release_id]
+    if section_norm is not None:
+        filters.append(ManPageSearch.section == section_norm)
+
+    rows: list[Row[Any]] = []
+    skip = offset
+    for tier_index, tier in enumerate(search_tiers(query_norm, tsquery)):
+        want = limit - len(rows)
+        if want <= 0:
+            break
+        conditions = [*filters, tier.condition]
+        if after is not None:
+            if tier_index < after.tier:
+                continue
+            if tier_index == after.tier:
+                conditions.append(
+                    or_(
+                        score < after.score,
+                        and_(
+                            score == after.score,
+                            tuple_(name_length, ManPageSearch.section, ManPageSearch.man_page_id)
+                            > tuple_(after.name_length, after.section, after.id),
+                        ),
+                    )
+                )
+
+        tier_started = mark()
+        tier_rows = (
+            await session.execute(
+                select(
+                    ManPageSearch.man_page_id.label("id"),
+                    ManPageSearch.name,
+                    ManPageSearch.section,
+                    ManPageSearch.title,
+                    ManPageSearch.description,
+                    literal(tier_index).label("tier"),
+                    score.label("score"),
+                    name_length.label("name_length"),
+                )
+                .where(*conditions)
+                .order_by(
+                    score.desc(),
+                    name_length.asc(),
+                    ManPageSearch.section.asc(),
+                    ManPageSearch.man_page_id.asc(),
+                )
+                .limit(want)
+                .offset(skip)
+            )
+        ).all()
+        if tier_rows:
+            rows.extend(tier_rows)
+            skip = 0
+        elif skip:
+            # The whole tier lies before the requested page; skip past it.
+            skip -= (
+                await session.execute(
+                    select(func.count()).select_from(ManPageSearch).where(*conditions)
+                )
+            ).scalar_one()
+        server_timing.append((f"search_{tier.name}", elapsed_ms(tier_started)))
+    return rows
+
+
+def search_match_condition(query: str) -> ColumnElement[bool]:
+    """Rows any search tier matches: the union the tiers partition."""
+    return or_(*_matches(query.lower(), func.websearch_to_tsquery("simple", query)))
+
+
+async def count_section_facets(
+    session: AsyncSession,
+    *,
+    release_id: uuid.UUID,
+    query: str,
+) -> list[tuple[str, int]]:
+    """Search hits per section, over every tier, as (section, count) in display order.
+
+    One grouped scan of the same matches the tiers rank; the caller's section filter
+    doesn't apply, so each count is what ``/search?section=`` would find. Fuzzy
+    matches need the session's similarity threshold set, as for the tiers.
+    """
+    rows = (
+        await session.execute(
+            select(ManPageSearch.section, func.count())
+            .where(ManPageSearch.dataset_release_id == release_id)
+            .where(search_match_condition(query))
+            .group_by(ManPageSearch.section)
+        )
+    ).all()
+    counts = [(section, int(count)) for section, count in rows]
+    return sorted(counts, key=lambda item: section_sort_key(item[0]))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from app.man.normalize import normalize_section
+
 SECTION_LABELS: dict[str, str] = {
     "1": "User Commands",
     "2": "System Calls",
@@ -11,3 +13,32 @@ SECTION_LABELS: dict[str, str] = {
     "8": "System Administration",
     "9": "Kernel",
 }
+
+_SECTION_SUFFIX_LABELS: dict[str, str] = {
+    "p": "POSIX",
+    "ssl": "OpenSSL",
+}
+
+
+def section_sort_key(section: str) -> tuple[int, int, str]:
+    if section and section[0].isdigit():
+        digit = int(section[0])
+        suffix = section[1:]
+        return (0, digit, suffix)
+    return (1, 0, section)
+
+
+def section_label(section: str) -> str:
+    section_norm = normalize_section(section)
+    if section_norm in SECTION_LABELS:
+        return SECTION_LABELS[section_norm]
+
+    if section_norm and section_norm[0] in SECTION_LABELS:
+        base = SECTION_LABELS[section_norm[0]]
+        suffix = section_norm[1:]
+        if not suffix:
+            return base
+        suffix_label = _SECTION_SUFFIX_LABELS.get(suffix)
+        return f"{base} ({suffix_label or suffix})"
+
+    return section_norm
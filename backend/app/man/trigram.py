@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ManPageSearch
+
+# pg_trgm can only answer `%` (and order by `<->`) from the trigram indexes; a
+# `similarity(...) > x` comparison is a function call and scans every row. `%` reads
+# its cutoff from pg_trgm.similarity_threshold, set per transaction below.
+SEARCH_SIMILARITY_THRESHOLD = 0.3
+SUGGEST_SIMILARITY_THRESHOLD = 0.2
+
+
+async def set_similarity_threshold(session: AsyncSession, threshold: float) -> None:
+    """Set the `%` cutoff for the rest of the session's current transaction."""
+    await session.scalar(
+        select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True))
+    )
+
+
+def similar_to(column: ColumnElement[str], query_norm: str) -> ColumnElement[bool]:
+    """``column % query_norm``: GIN/GiST-indexable similarity above the threshold."""
+    return column.bool_op("%")(query_norm)
+
+
+def nearest_names(release_id: uuid.UUID, query_norm: str, *columns: Any) -> Select[Any]:
+    """Names similar to ``query_norm`` in a release, nearest first (GiST KNN order)."""
+    return (
+        select(*columns)
+        .select_from(ManPageSearch)
+        .where(ManPageSearch.dataset_release_id == release_id)
+        .where(similar_to(ManPageSearch.name_norm, query_norm))
+        .order_by(ManPageSearch.name_norm.op("<->")(query_norm).asc())
+    )
@@ -6,9 +6,12 @@ from fastapi import Request
 
 from app.security.rate_limit import enforce_rate_limit
 from app.security.request_ip import get_client_ip
+from app.web.warmup import WARMUP_STATE_KEY
 
 
 async def rate_limit_search(request: Request) -> None:
+    if getattr(request.state, WARMUP_STATE_KEY, False):
+        return
     settings = request.app.state.settings
     redis = request.app.state.redis
     ip = get_client_ip(request)
@@ -21,7 +24,22 @@ async def rate_limit_search(request: Request) -> None:
     request.state.rate_limit_ms = (perf_counter() - start) * 1000.0
 
 
+async def charge_search_cost(request: Request, *, cost: int) -> None:
+    """Charge an expensive search ``cost - 1`` requests beyond what rate_limit_search took."""
+    if cost <= 1 or getattr(request.state, WARMUP_STATE_KEY, False):
+        return
+    settings = request.app.state.settings
+    await enforce_rate_limit(
+        redis=request.app.state.redis,
+        key=f"search:{get_client_ip(request)}",
+        limit=settings.rate_limit_search_per_minute,
+        cost=cost - 1,
+    )
+
+
 async def rate_limit_page(request: Request) -> None:
+    if getattr(request.state, WARMUP_STATE_KEY, False):
+        return
     settings = request.app.state.settings
     redis = request.app.state.redis
     ip = get_client_ip(request)
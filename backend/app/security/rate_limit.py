@@ -41,7 +41,7 @@ def _gc_memory_buckets(*, now: float) -> None:
 
 
 def _enforce_in_memory_rate_limit(
-    *, key: str, now_bucket: int, limit: int, window_seconds: int
+    *, key: str, now_bucket: int, limit: int, window_seconds: int, cost: int
 ) -> None:
     now = time.time()
     _gc_memory_buckets(now=now)
@@ -52,7 +52,7 @@ def _enforce_in_memory_rate_limit(
         counter = _Counter(count=0, expires_at=(now_bucket + 1) * window_seconds)
         _memory_buckets[bucket_key] = counter
 
-    counter.count += 1
+    counter.count += cost
     if counter.count > limit:
         raise APIError(status_code=429, code="RATE_LIMITED", message="Too many requests")
 
@@ -63,14 +63,16 @@ async def enforce_rate_limit(
     key: str,
     limit: int,
     window_seconds: int = 60,
+    cost: int = 1,
 ) -> None:
+    """Charge ``cost`` requests against ``key``'s fixed window; 429 past ``limit``."""
     logger = get_logger(action="rate_limit")
     now_bucket = int(time.time() / window_seconds)
     redis_key = f"rl:{key}:{now_bucket}"
 
     try:
-        current = await redis.incr(redis_key)
-        if current == 1:
+        current = await redis.incrby(redis_key, cost)
+        if current == cost:
             await redis.expire(redis_key, window_seconds)
 
         if current > limit:
@@ -84,4 +86,5 @@ async def enforce_rate_limit(
             now_bucket=now_bucket,
             limit=limit,
             window_seconds=window_seconds,
+            cost=cost,
         )
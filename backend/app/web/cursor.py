@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from app.core.errors import APIError
+
+_MAX_CURSOR_LENGTH = 512
+
+
+def encode_cursor(kind: str, key: Sequence[str | int | float]) -> str:
+    """Opaque keyset pagination token: the sort key of the last row of a page."""
+    raw = json.dumps([kind, *key], separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str, *, kind: str, types: Sequence[type]) -> list[str | int | float]:
+    """Sort key of a token from encode_cursor(kind, ...), checked against ``types``."""
+    try:
+        if len(token) > _MAX_CURSOR_LENGTH:
+            raise ValueError("cursor too long")
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value = json.loads(raw)
+    except (ValueError, binascii.Error):
+        raise invalid_cursor() from None
+
+    if not isinstance(value, list) or not value or value[0] != kind:
+        raise invalid_cursor()
+    key = value[1:]
+    if len(key) != len(types):
+        raise invalid_cursor()
+    for item, expected in zip(key, types, strict=True):
+        # JSON has one number type; accept ints where floats are expected, never bools.
+        if isinstance(item, bool):
+            raise invalid_cursor()
+        if expected is float and isinstance(item, int):
+            continue
+        if not isinstance(item, expected):
+            raise invalid_cursor()
+    return key
+
+
+def invalid_cursor() -> APIError:
+    return APIError(status_code=400, code="INVALID_CURSOR", message="Invalid cursor")
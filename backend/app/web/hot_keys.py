@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from urllib.parse import parse_qsl, urlencode
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.logging import get_logger
+
+HOT_KEYS_PREFIX = "betterman:hot"
+
+# Read endpoints whose responses are worth prefilling after a release activation.
+_TRACKED_PREFIXES = (
+    "/api/v1/man/",
+    "/api/v1/content/",
+    "/api/v1/search",
+    "/api/v1/section/",
+    "/api/v1/sections",
+)
+_MAX_KEY_LENGTH = 512
+_MAX_LOCAL_KEYS = 10_000
+
+
+def request_key(path: str, query: str) -> str | None:
+    """Canonical "path?query" for a tracked request, or None if it isn't tracked."""
+    if not path.startswith(_TRACKED_PREFIXES):
+        return None
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    key = f"{path}?{urlencode(params)}" if params else path
+    if len(key) > _MAX_KEY_LENGTH:
+        return None
+    return key
+
+
+def _bucket_key(hour: int) -> str:
+    return f"{HOT_KEYS_PREFIX}:{hour}"
+
+
+class HotKeyTracker:
+    """Per-worker request counts, periodically added to hourly Redis sorted sets."""
+
+    def __init__(self, *, window_hours: int):
+        self._window_hours = window_hours
+        self._counts: Counter[str] = Counter()
+
+    def record(self, path: str, query: str) -> None:
+        key = request_key(path, query)
+        if key is None:
+            return
+        if key not in self._counts and len(self._counts) >= _MAX_LOCAL_KEYS:
+            # Bounded between flushes; already-hot keys keep counting.
+            return
+        self._counts[key] += 1
+
+    async def flush(self, redis: Redis) -> None:
+        if not self._counts:
+            return
+        counts, self._counts = self._counts, Counter()
+        bucket = _bucket_key(int(time.time() // 3600))
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, count in counts.items():
+                    pipe.zincrby(bucket, count, key)
+                pipe.expire(bucket, (self._window_hours + 1) * 3600)
+                await pipe.execute()
+        except RedisError as exc:
+            get_logger(action="hot_keys").warning("hot_keys_flush_failed", error=str(exc))
+
+    async def top_keys(self, redis: Redis, *, limit: int) -> list[str]:
+        """Most requested keys over the window, across all workers."""
+        now_hour = int(time.time() // 3600)
+        totals: Counter[str] = Counter()
+        try:
+            for hour in range(now_hour - self._window_hours + 1, now_hour + 1):
+                rows = await redis.zrevrange(_bucket_key(hour), 0, limit * 2, withscores=True)
+                for key, score in rows:
+                    totals[key.decode() if isinstance(key, bytes) else key] += score
+        except RedisError as exc:
+            get_logger(action="hot_keys").warning("hot_keys_read_failed", error=str(exc))
+        return [key for key, _ in totals.most_common(limit)]
+
+
+async def flush_hot_keys_periodically(
+    redis: Redis, tracker: HotKeyTracker, *, interval_seconds: float
+) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await tracker.flush(redis)
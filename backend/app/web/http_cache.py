@@ -1,15 +1,33 @@
 from __future__ import annotations
 
 import hashlib
+import re
 
 from fastapi import Request
 from starlette.responses import Response
 
+_WEAK_ETAG_RE = re.compile(r'^W/"([0-9a-f]{40})"$')
 
-def compute_weak_etag(*parts: str) -> str:
+
+def weak_etag_digest(*parts: str) -> bytes:
     raw = "|".join(parts).encode("utf-8")
-    digest = hashlib.sha1(raw).hexdigest()  # noqa: S324 (non-crypto; cache key only)
-    return f'W/"{digest}"'
+    return hashlib.sha1(raw).digest()  # noqa: S324 (non-crypto; cache key only)
+
+
+def format_weak_etag(digest: bytes) -> str:
+    return f'W/"{digest.hex()}"'
+
+
+def compute_weak_etag(*parts: str) -> str:
+    return format_weak_etag(weak_etag_digest(*parts))
+
+
+def parse_weak_etag(value: str) -> bytes | None:
+    """Return the digest of a single etag produced by compute_weak_etag, else None."""
+    match = _WEAK_ETAG_RE.fullmatch(value.strip())
+    if match is None:
+        return None
+    return bytes.fromhex(match.group(1))
 
 
 def maybe_not_modified(request: Request, *, etag: str, cache_control: str) -> Response | None:
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+
+from starlette.responses import Response
+
+
+def dump_json_bytes(value: object) -> bytes:
+    # Matches starlette's JSONResponse.render so spliced bodies stay byte-compatible.
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def splice_json_object(fields: list[tuple[str, bytes]]) -> bytes:
+    """Build a JSON object from already-encoded member values.
+
+    Values are trusted to be valid JSON; nothing is parsed or re-encoded.
+    """
+    parts: list[bytes] = []
+    for key, value in fields:
+        parts.append(dump_json_bytes(key) + b":" + value)
+    return b"{" + b",".join(parts) + b"}"
+
+
+class RawJSONResponse(Response):
+    media_type = "application/json"
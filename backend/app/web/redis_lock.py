@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+# Delete the lock only if we still own it (it may have expired and been re-taken).
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+  return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def acquire_lock(redis: Redis, key: str, *, seconds: float) -> str | None:
+    """Take a lock shared by all workers, expiring after ``seconds``.
+
+    Returns the token to pass to release_lock, or None if another worker holds the
+    lock. When Redis is down there is nobody to coordinate with, so the caller gets a
+    token and goes ahead.
+    """
+    token = uuid4().hex
+    try:
+        locked = await redis.set(key, token, nx=True, px=int(seconds * 1000))
+    except RedisError:
+        return token
+    return token if locked else None
+
+
+async def release_lock(redis: Redis, key: str, token: str) -> None:
+    """Release a lock taken by acquire_lock, unless it has expired and been re-taken."""
+    try:
+        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+    except RedisError:
+        pass  # Expires on its own.
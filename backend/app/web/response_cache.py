@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.logging import get_logger
+from app.web.http_cache import set_cache_headers
+from app.web.raw_json import RawJSONResponse
+from app.web.redis_lock import acquire_lock, release_lock
+from app.web.single_flight import SingleFlight
+
+# Same threshold as the GZipMiddleware in app.main.
+_GZIP_MIN_BYTES = 1024
+_STATUS_PREFIX_BYTES = 3
+_FILL_LOCK_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status_code: int
+    body: bytes
+    gzip_body: bytes | None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+def _cached(status_code: int, body: bytes) -> CachedResponse:
+    gzip_body = None
+    if len(body) >= _GZIP_MIN_BYTES:
+        gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+    return CachedResponse(status_code=status_code, body=body, gzip_body=gzip_body)
+
+
+def _redis_key(namespace: str, etag: str) -> str:
+    return f"rc:{namespace}:{etag}"
+
+
+def _lock_key(namespace: str, etag: str) -> str:
+    # Outside the rc:{namespace}: prefix so drop_release_namespace leaves live locks alone.
+    return f"rc-lock:{namespace}:{etag}"
+
+
+class ResponseCache:
+    """Serialized response bodies keyed by (dataset_release_id, etag).
+
+    L1 is a per-worker LRU bounded by body bytes and also holds a gzip copy; L2 is
+    Redis, shared by all workers. Etags already change with everything a body depends
+    on, so entries are never stale; namespacing by release lets activation drop the
+    L2 entries of releases that stop being served (see drop_release_namespace).
+
+    Misses go through get_or_fill, which coalesces concurrent fills of one key within
+    the worker and, with ``fill_lock_seconds`` set, across workers via a Redis lock.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        l1_max_bytes: int,
+        l2_ttl_seconds: int,
+        fill_lock_seconds: float = 0.0,
+    ):
+        self._redis = redis
+        self._l1_max_bytes = l1_max_bytes
+        self._l2_ttl_seconds = l2_ttl_seconds
+        self._fill_lock_seconds = fill_lock_seconds
+        self._l1: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+        self._l1_bytes = 0
+        self._flights = SingleFlight()
+
+    async def get(self, *, namespace: str, etag: str) -> CachedResponse | None:
+        key = (namespace, etag)
+        cached = self._l1.get(key)
+        if cached is not None:
+            self._l1.move_to_end(key)
+            return cached
+
+        try:
+            raw = await self._redis.get(_redis_key(namespace, etag))
+        except RedisError as exc:
+            get_logger(action="response_cache").warning("response_cache_get_failed", error=str(exc))
+            return None
+        if not raw or len(raw) < _STATUS_PREFIX_BYTES:
+            return None
+
+        cached = _cached(int(raw[:_STATUS_PREFIX_BYTES]), raw[_STATUS_PREFIX_BYTES:])
+        self._l1_put(key, cached)
+        return cached
+
+    async def put(
+        self, *, namespace: str, etag: str, body: bytes, status_code: int = 200
+    ) -> CachedResponse:
+        cached = _cached(status_code, body)
+        self._l1_put((namespace, etag), cached)
+        try:
+            await self._redis.set(
+                _redis_key(namespace, etag),
+                f"{status_code:03d}".encode() + body,
+                ex=self._l2_ttl_seconds,
+            )
+        except RedisError as exc:
+            get_logger(action="response_cache").warning("response_cache_put_failed", error=str(exc))
+        return cached
+
+    async def get_or_fill(
+        self,
+        *,
+        namespace: str,
+        etag: str,
+        fill: Callable[[], Awaitable[bytes]],
+    ) -> CachedResponse:
+        """Return the cached body, running ``fill`` once per key on a miss.
+
+        Exceptions raised by ``fill`` (e.g. APIError 404) reach every coalesced caller
+        and are not cached.
+        """
+        cached = await self.get(namespace=namespace, etag=etag)
+        if cached is not None:
+            return cached
+        return await self._flights.do(
+            (namespace, etag), lambda: self._fill(namespace=namespace, etag=etag, fill=fill)
+        )
+
+    async def _fill(
+        self,
+        *,
+        namespace: str,
+        etag: str,
+        fill: Callable[[], Awaitable[bytes]],
+    ) -> CachedResponse:
+        if self._fill_lock_seconds <= 0:
+            return await self.put(namespace=namespace, etag=etag, body=await fill())
+
+        lock_key = _lock_key(namespace, etag)
+        token = await acquire_lock(self._redis, lock_key, seconds=self._fill_lock_seconds)
+        if token is None:
+            # Another worker is filling: wait for its L2 write, up to the lock TTL.
+            deadline = time.monotonic() + self._fill_lock_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_FILL_LOCK_POLL_SECONDS)
+                try:
+                    held = bool(await self._redis.exists(lock_key))
+                except RedisError:
+                    held = False
+                # Read after the lock check: a successful holder writes L2 before releasing.
+                cached = await self.get(namespace=namespace, etag=etag)
+                if cached is not None:
+                    return cached
+                if not held:
+                    break  # The holder's fill raised; don't wait out the lock TTL.
+            return await self.put(namespace=namespace, etag=etag, body=await fill())
+
+        try:
+            return await self.put(namespace=namespace, etag=etag, body=await fill())
+        finally:
+            await release_lock(self._redis, lock_key, token)
+
+    def _l1_put(self, key: tuple[str, str], cached: CachedResponse) -> None:
+        if cached.size > self._l1_max_bytes:
+            return
+        previous = self._l1.pop(key, None)
+        if previous is not None:
+            self._l1_bytes -= previous.size
+        self._l1[key] = cached
+        self._l1_bytes += cached.size
+        while self._l1_bytes > self._l1_max_bytes:
+            _key, evicted = self._l1.popitem(last=False)
+            self._l1_bytes -= evicted.size
+
+
+async def drop_release_namespace(redis: Redis, *, dataset_release_id: str) -> int:
+    """Delete the L2 entries of a release; returns the number of keys removed."""
+    dropped = 0
+    try:
+        batch: list[bytes] = []
+        async for key in redis.scan_iter(match=_redis_key(dataset_release_id, "*"), count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                dropped += await redis.unlink(*batch)
+                batch.clear()
+        if batch:
+            dropped += await redis.unlink(*batch)
+    except RedisError as exc:
+        # Entries still expire through the L2 TTL.
+        get_logger(action="response_cache").warning(
+            "response_cache_drop_failed", dataset_release_id=dataset_release_id, error=str(exc)
+        )
+    return dropped
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip: its own q-value, else that of ``*``."""
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def cached_json_response(
+    request: Request,
+    cached: CachedResponse,
+    *,
+    etag: str,
+    cache_control: str,
+) -> Response:
+    return cached_response(
+        request,
+        cached,
+        etag=etag,
+        cache_control=cache_control,
+        media_type=RawJSONResponse.media_type,
+    )
+
+
+def cached_response(
+    request: Request,
+    cached: CachedResponse,
+    *,
+    etag: str,
+    cache_control: str,
+    media_type: str,
+) -> Response:
+    if cached.gzip_body is not None and _accepts_gzip(request.headers.get("accept-encoding", "")):
+        # GZipMiddleware leaves responses that already carry Content-Encoding alone.
+        res = Response(
+            content=cached.gzip_body,
+            status_code=cached.status_code,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            media_type=media_type,
+        )
+    else:
+        res = Response(content=cached.body, status_code=cached.status_code, media_type=media_type)
+        if cached.gzip_body is not None:
+            res.headers["Vary"] = "Accept-Encoding"
+    set_cache_headers(res, etag=etag, cache_control=cache_control)
+    return res
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from time import perf_counter
+from urllib.parse import quote
+
+from redis.asyncio import Redis
+from starlette.types import ASGIApp, Message
+
+from app.core.logging import get_logger
+from app.web.hot_keys import HotKeyTracker
+from app.web.redis_lock import acquire_lock, release_lock
+
+# Set in the ASGI scope state of replayed requests: skips rate limiting and tracking.
+WARMUP_STATE_KEY = "cache_warmup"
+
+# Held by the one worker replaying hot keys; the others skip the run.
+_WARMUP_LOCK_KEY = "cache-warmup-lock"
+
+
+async def _replay(app: ASGIApp, key: str) -> int:
+    path, _, query = key.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": quote(path).encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"warmup")],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+        "state": {WARMUP_STATE_KEY: True},
+    }
+    status = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_caches(
+    app: ASGIApp,
+    redis: Redis,
+    tracker: HotKeyTracker,
+    *,
+    limit: int,
+    concurrency: int,
+    lock_seconds: float = 0.0,
+) -> None:
+    """Replay the most requested keys through the app to prefill caches and DB buffers.
+
+    The caches it fills are shared through Redis, so with ``lock_seconds`` set only
+    one worker runs at a time; every other worker skips instead of repeating the
+    same page loads against the database.
+    """
+    logger = get_logger(action="cache_warmup")
+    if lock_seconds <= 0:
+        await _warm_caches(app, redis, tracker, limit=limit, concurrency=concurrency)
+        return
+
+    token = await acquire_lock(redis, _WARMUP_LOCK_KEY, seconds=lock_seconds)
+    if token is None:
+        logger.info("cache_warmup_skipped", reason="another_worker")
+        return
+    try:
+        await _warm_caches(app, redis, tracker, limit=limit, concurrency=concurrency)
+    finally:
+        await release_lock(redis, _WARMUP_LOCK_KEY, token)
+
+
+async def _warm_caches(
+    app: ASGIApp,
+    redis: Redis,
+    tracker: HotKeyTracker,
+    *,
+    limit: int,
+    concurrency: int,
+) -> None:
+    logger = get_logger(action="cache_warmup")
+    keys = await tracker.top_keys(redis, limit=limit)
+    if not keys:
+        logger.info("cache_warmup_skipped", reason="no_recent_traffic")
+        return
+
+    started = perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    report_every = max(1, len(keys) // 10)
+    done = 0
+    ok = 0
+
+    async def _warm(key: str) -> None:
+        nonlocal done, ok
+        async with semaphore:
+            try:
+                status = await _replay(app, key)
+            except Exception as exc:  # noqa: BLE001
+                status = 0
+                logger.warning("cache_warmup_request_failed", key=key, error=str(exc))
+        done += 1
+        if status == 200:
+            ok += 1
+        if done % report_every == 0:
+            logger.info("cache_warmup_progress", done=done, total=len(keys), ok=ok)
+
+    await asyncio.gather(*(_warm(key) for key in keys))
+    logger.info(
+        "cache_warmup_finished",
+        total=len(keys),
+        ok=ok,
+        duration_ms=round((perf_counter() - started) * 1000.0, 2),
+    )
+
+
+class CacheWarmer:
+    """Runs warm_caches in the background; a new run replaces one still in progress.
+
+    Every worker schedules a run on each activation. The one holding the warmup lock
+    is warming too and gets the same announcement, so it cancels, releases the lock
+    and retakes it for the new release; the others skip.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis: Redis,
+        tracker: HotKeyTracker,
+        *,
+        limit: int,
+        concurrency: int,
+        lock_seconds: float = 0.0,
+    ):
+        self._app = app
+        self._redis = redis
+        self._tracker = tracker
+        self._limit = limit
+        self._concurrency = concurrency
+        self._lock_seconds = lock_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def schedule(self) -> None:
+        if self._limit <= 0:
+            return
+        previous = self._task
+        if previous is not None:
+            # Warming the previous release is wasted work now.
+            previous.cancel()
+        self._task = asyncio.create_task(self._run(previous))
+
+    async def _run(self, previous: asyncio.Task[None] | None) -> None:
+        if previous is not None:
+            # Let it release the warmup lock before this run tries to take it.
+            await asyncio.wait([previous])
+        await warm_caches(
+            self._app,
+            self._redis,
+            self._tracker,
+            limit=self._limit,
+            concurrency=self._concurrency,
+            lock_seconds=self._lock_seconds,
+        )
+
+    async def aclose(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
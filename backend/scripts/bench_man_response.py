@@ -0,0 +1,141 @@
+"""Compare man page response encoding paths on a bash(1)-sized document.
+
+Usage: uv run python scripts/bench_man_response.py [--blocks 1500] [--rounds 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pydantic import TypeAdapter
+
+from app.api.v1.schemas import ManPageResponse
+from app.web.raw_json import dump_json_bytes, splice_json_object
+
+
+def _make_doc(blocks: int) -> dict:
+    toc: list[dict] = []
+    out: list[dict] = []
+    for i in range(blocks):
+        if i % 50 == 0:
+            heading_id = f"section-{i // 50}"
+            toc.append({"id": heading_id, "title": f"SECTION {i // 50}", "level": 2})
+            out.append({"type": "heading", "id": heading_id, "level": 2, "text": heading_id})
+        if i % 5 == 0:
+            out.append(
+                {
+                    "type": "definition_list",
+                    "items": [
+                        {
+                            "id": f"opt-{i}",
+                            "termInlines": [
+                                {
+                                    "type": "strong",
+                                    "inlines": [{"type": "text", "text": f"--option-{i}"}],
+                                }
+                            ],
+                            "definitionBlocks": [
+                                {
+                                    "type": "paragraph",
+                                    "inlines": [
+                                        {"type": "text", "text": "Enable the behaviour of "},
+                                        {"type": "code", "text": f"opt{i}"},
+                                        {"type": "text", "text": " for the current shell."},
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            )
+            continue
+        out.append(
+            {
+                "type": "paragraph",
+                "inlines": [
+                    {"type": "text", "text": "The shell reads commands from "},
+                    {"type": "emphasis", "inlines": [{"type": "text", "text": "file"}]},
+                    {"type": "text", "text": " and executes them; see "},
+                    {
+                        "type": "link",
+                        "href": "/man/sh/1",
+                        "inlines": [{"type": "text", "text": "sh(1)"}],
+                        "linkType": "internal",
+                    },
+                    {"type": "text", "text": " for details."},
+                ],
+            }
+        )
+    return {"toc": toc, "blocks": out}
+
+
+def _page() -> dict[str, str | None]:
+    return {
+        "locale": "en",
+        "distro": "debian",
+        "name": "bash",
+        "section": "1",
+        "title": "bash(1)",
+        "description": "GNU Bourne-Again SHell",
+        "sourcePackage": "bash",
+        "sourcePackageVersion": "5.2",
+    }
+
+
+def _variants() -> list[dict[str, str]]:
+    return [
+        {"distro": d, "contentSha256": "0" * 64} for d in ("debian", "ubuntu", "fedora", "arch")
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=1500)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    content = _make_doc(args.blocks)
+    content.update({"synopsis": ["bash [options] [command_string | file]"], "options": None})
+    content["seeAlso"] = None
+    # What Postgres hands back for the JSONB column / the ::text cast.
+    content_text = json.dumps(content, ensure_ascii=False)
+    adapter = TypeAdapter(ManPageResponse)
+
+    def validated() -> bytes:
+        # Old path: decode JSONB, validate against response_model, re-encode.
+        payload = {"page": _page(), "content": json.loads(content_text), "variants": _variants()}
+        return dump_json_bytes(adapter.dump_python(adapter.validate_python(payload), mode="json"))
+
+    def spliced() -> bytes:
+        return splice_json_object(
+            [
+                ("page", dump_json_bytes(_page())),
+                ("content", content_text.encode("utf-8")),
+                ("variants", dump_json_bytes(_variants())),
+            ]
+        )
+
+    assert json.loads(validated()) == json.loads(spliced())
+
+    print(f"body: {len(content_text) / 1024:.0f} KiB, rounds: {args.rounds}")
+    results: dict[str, float] = {}
+    for label, fn in (("validated", validated), ("spliced", spliced)):
+        fn()
+        started = time.process_time()
+        for _ in range(args.rounds):
+            fn()
+        results[label] = (time.process_time() - started) * 1000.0 / args.rounds
+        print(f"{label:>10}: {results[label]:8.2f} ms CPU/request")
+
+    saved = results["validated"] - results["spliced"]
+    print(f"{'saved':>10}: {saved:8.2f} ms CPU/request")
+
+
+if __name__ == "__main__":
+    main()
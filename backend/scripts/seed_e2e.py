@@ -16,6 +16,15 @@ from sqlalchemy.ext.asyncio import create_async_engine
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.core.config import Settings
+from app.datasets.activation import (
+    assign_rank_priors,
+    assign_sitemap_pages,
+    fill_search_documents,
+    hash_served_content,
+    rebuild_page_variants,
+    rebuild_release_stats,
+)
+from app.datasets.partitions import attach_search_partition, drop_search_partition
 
 
 def _stable_sha256(value: object) -> str:
@@ -308,11 +317,17 @@ async def _seed() -> None:
 
     try:
         async with engine.begin() as conn:
+            # TRUNCATE empties the old releases' search partitions but keeps them.
+            old_release_ids = (
+                await conn.execute(text("SELECT id FROM dataset_releases"))
+            ).scalars()
+            for old_release_id in list(old_release_ids):
+                await drop_search_partition(conn, release_id=old_release_id)
             await conn.execute(
                 text(
                     "TRUNCATE TABLE "
                     "man_page_license_map, man_page_links, man_page_search, man_page_content, "
-                    "man_pages, licenses, dataset_releases"
+                    "man_pages, man_page_variants, licenses, dataset_releases"
                 )
             )
 
@@ -363,12 +378,12 @@ async def _seed() -> None:
                             INSERT INTO man_pages (
                               id, dataset_release_id, name, section, title, description,
                               source_path, source_package, source_package_version,
-                              content_sha256, has_parse_warnings
+                              content_sha256, content_unchanged_since, has_parse_warnings
                             )
                             VALUES (
                               :id, :release_id, :name, :section, :title, :description,
                               :source_path, :source_package, :source_package_version,
-                              :content_sha256, FALSE
+                              :content_sha256, :dataset_release_id, FALSE
                             )
                             """
                         ),
@@ -383,6 +398,7 @@ async def _seed() -> None:
                             "source_package": None,
                             "source_package_version": None,
                             "content_sha256": page.content_sha256,
+                            "dataset_release_id": release_id,
                         },
                     )
 
@@ -435,6 +451,14 @@ async def _seed() -> None:
                     ),
                     {"from_id": tar_id, "to_id": gzip_id},
                 )
+                await hash_served_content(conn, release_id=release_uuid)
+                await fill_search_documents(conn, release_id=release_uuid)
+                await rebuild_release_stats(conn, release_id=release_uuid)
+                await assign_sitemap_pages(conn, release_id=release_uuid)
+                await assign_rank_priors(conn, release_id=release_uuid)
+                await attach_search_partition(conn, release_id=release_uuid)
+
+            await rebuild_page_variants(conn, locale="en")
 
     finally:
         await engine.dispose()
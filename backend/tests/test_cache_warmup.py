@@ -0,0 +1,152 @@
+import asyncio
+import types
+from collections import Counter
+
+import httpx
+
+from app.db.session import get_session
+from app.main import create_app
+from app.web.hot_keys import HotKeyTracker, request_key
+from app.web.http_cache import compute_weak_etag
+from app.web.warmup import warm_caches
+
+
+def test_request_key_is_canonical_and_limited_to_read_endpoints() -> None:
+    assert request_key("/api/v1/search", "q=tar&limit=20") == "/api/v1/search?limit=20&q=tar"
+    assert request_key("/api/v1/man/tar/1", "") == "/api/v1/man/tar/1"
+    assert request_key("/api/v1/suggest", "name=ta") is None
+    assert request_key("/healthz", "") is None
+
+
+async def test_tracked_requests_are_replayed_into_the_response_cache() -> None:
+    app = create_app()
+    app.dependency_overrides[get_session] = _sections_session_dep
+    # Real traffic would be rate limited; warmup requests must not be.
+    app.state.settings.rate_limit_page_per_minute = 0
+    redis = _ZSetRedis()
+    tracker = HotKeyTracker(window_hours=24)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        limited = await client.get("/api/v1/sections")
+    tracker.record("/api/v1/sections", "")
+    tracker.record("/api/v1/sections", "")
+    tracker.record("/api/v1/section/1", "limit=10")
+    await tracker.flush(redis)
+
+    assert limited.status_code == 429
+    assert await tracker.top_keys(redis, limit=1) == ["/api/v1/sections"]
+
+    await warm_caches(app, redis, tracker, limit=10, concurrency=2)
+
+    cache = app.state.response_cache
+    etag = compute_weak_etag("sections", "test-release")
+    assert await cache.get(namespace="test-release", etag=etag) is not None
+    # Replayed requests are not counted as traffic.
+    app_redis = _ZSetRedis()
+    await app.state.hot_keys.flush(app_redis)
+    assert app_redis.zsets == {}
+
+
+async def test_only_one_worker_replays_hot_keys() -> None:
+    # Two workers get the same activation announcement and share one Redis.
+    loads: Counter[int] = Counter()
+    workers = []
+    for worker in range(2):
+        app = create_app()
+        app.dependency_overrides[get_session] = _counting_session_dep(loads, worker)
+        workers.append(app)
+    redis = _ZSetRedis()
+    tracker = HotKeyTracker(window_hours=24)
+    tracker.record("/api/v1/sections", "")
+    await tracker.flush(redis)
+
+    await asyncio.gather(
+        *(
+            warm_caches(app, redis, tracker, limit=10, concurrency=2, lock_seconds=60)
+            for app in workers
+        )
+    )
+
+    assert len(loads) == 1
+    # Released when done: the next activation's run takes it again.
+    assert redis.values == {}
+    await warm_caches(workers[1], redis, tracker, limit=10, concurrency=2, lock_seconds=60)
+    assert len(loads) == 2
+
+
+class _ZSetRedis:
+    def __init__(self):
+        self.zsets: dict[str, Counter] = {}
+        self.values: dict[str, str] = {}
+
+    async def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, _script, _numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def zrevrange(self, key, start, end, withscores=False):
+        rows = self.zsets.get(key, Counter()).most_common()[start : end + 1]
+        return [(k.encode(), float(v)) for k, v in rows]
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return False
+
+    def zincrby(self, key, amount, member):
+        self._ops.append((key, amount, member))
+
+    def expire(self, *_args):
+        pass
+
+    async def execute(self):
+        for key, amount, member in self._ops:
+            self._redis.zsets.setdefault(key, Counter())[member] += amount
+
+
+def _counting_session_dep(loads: Counter[int], worker: int):
+    async def _dep():
+        async for session in _sections_session_dep():
+            loads[worker] += 1
+            yield session
+
+    return _dep
+
+
+async def _sections_session_dep():
+    class _Result:
+        def all(self):
+            return [
+                types.SimpleNamespace(section="1", label="User Commands", total=2),
+                types.SimpleNamespace(section="8", label="System Administration", total=1),
+            ]
+
+    class _DummySession:
+        async def scalar(self, statement, *_args, **_kwargs):
+            if "release_section_stats" in str(statement):
+                return None
+            return types.SimpleNamespace(
+                id="00000000-0000-0000-0000-000000000000",
+                dataset_release_id="test-release",
+            )
+
+        async def execute(self, *_args, **_kwargs):
+            return _Result()
+
+    yield _DummySession()
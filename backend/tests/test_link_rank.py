@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+
+from app.datasets.link_rank import link_rank
+
+
+def _ids(*names: str) -> dict[str, uuid.UUID]:
+    return {name: uuid.uuid5(uuid.NAMESPACE_URL, f"betterman:{name}") for name in names}
+
+
+def test_pages_linked_from_many_pages_rank_highest() -> None:
+    ids = _ids("gzip", "tar", "zip", "bzip2", "orphan")
+    links = [
+        (ids["tar"], ids["gzip"]),
+        (ids["zip"], ids["gzip"]),
+        (ids["bzip2"], ids["gzip"]),
+        (ids["gzip"], ids["tar"]),
+    ]
+
+    ranks = link_rank(list(ids.values()), links)
+
+    assert ranks[ids["gzip"]] == 1.0
+    assert ranks[ids["tar"]] > ranks[ids["zip"]]
+    assert ranks[ids["zip"]] == pytest.approx(ranks[ids["orphan"]])
+    assert all(0.0 < rank <= 1.0 for rank in ranks.values())
+
+
+def test_duplicate_self_and_foreign_links_are_ignored() -> None:
+    ids = _ids("tar", "gzip")
+    foreign = uuid.uuid4()
+    plain = link_rank(list(ids.values()), [(ids["tar"], ids["gzip"])])
+
+    noisy = link_rank(
+        list(ids.values()),
+        [
+            (ids["tar"], ids["gzip"]),
+            (ids["tar"], ids["gzip"]),
+            (ids["gzip"], ids["gzip"]),
+            (foreign, ids["tar"]),
+            (ids["tar"], foreign),
+        ],
+    )
+
+    assert noisy == plain
+    assert link_rank([], []) == {}
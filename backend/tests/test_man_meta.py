@@ -58,6 +58,7 @@ async def _dummy_session_dep():
                 source_package="bash",
                 source_package_version="5.2",
                 content_sha256="abc123",
+                content_unchanged_since="test-release",
             )
 
     class _DummySession:
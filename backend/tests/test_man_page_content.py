@@ -0,0 +1,321 @@
+import asyncio
+import collections
+import contextlib
+import hashlib
+import json
+import types
+
+import httpx
+
+from app.api.v1.schemas import ManPageEnvelopeResponse, ManPageResponse
+from app.db.session import get_session
+from app.main import create_app
+from app.security.deps import rate_limit_page
+
+_CONTENT_JSON = json.dumps(
+    {
+        "toc": [{"id": "description", "title": "DESCRIPTION", "level": 2}],
+        "blocks": [
+            {"type": "heading", "id": "description", "level": 2, "text": "DESCRIPTION"},
+            {"type": "paragraph", "inlines": [{"type": "text", "text": "Bash ⟪is⟫ a shell."}]},
+        ],
+        "synopsis": ["bash [options]"],
+        "options": None,
+        "seeAlso": None,
+    },
+    ensure_ascii=False,
+)
+
+
+async def test_man_page_splices_stored_content() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _dummy_session_dep
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/man/bash/1")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/json"
+    assert res.headers["ETag"].startswith('W/"')
+    assert "render" in res.headers["Server-Timing"]
+
+    payload = res.json()
+    assert payload["content"] == json.loads(_CONTENT_JSON)
+    assert payload["page"]["name"] == "bash"
+    assert payload["variants"] == [
+        {"distro": "debian", "contentSha256": "abc123"},
+        {"distro": "fedora", "contentSha256": "def456"},
+    ]
+    ManPageResponse.model_validate(payload)
+
+
+async def test_man_page_not_modified_skips_body() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _dummy_session_dep
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/v1/man/bash/1")
+        second = await client.get(
+            "/api/v1/man/bash/1",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+async def test_man_page_known_etag_skips_database() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _dummy_session_dep
+    app.state.db_sessionmaker = _etag_rows_sessionmaker(
+        [
+            types.SimpleNamespace(
+                **vars(_page("1")),
+                content_key=_VARIANTS_CONTENT_KEY,
+            )
+        ]
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Served from the page query; the etag index is built in the background.
+        first = await client.get("/api/v1/man/bash/1")
+        etag = first.headers["ETag"]
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # Anything reaching the page query now gets no rows (-> 503).
+        app.dependency_overrides[get_session] = _session_dep([])
+        revalidated = await client.get("/api/v1/man/bash/1", headers={"If-None-Match": etag})
+        refetched = await client.get("/api/v1/man/bash/1")
+
+    assert first.status_code == 200
+    assert "load_page" in first.headers["Server-Timing"]
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert "etag_index" in revalidated.headers["Server-Timing"]
+    assert refetched.status_code == 200
+    assert refetched.headers["ETag"] == etag
+    assert "response_cache" in refetched.headers["Server-Timing"]
+    assert refetched.content == first.content
+
+
+async def test_man_page_etag_and_body_survive_releases_with_unchanged_content() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        app.dependency_overrides[get_session] = _dummy_session_dep
+        before = await client.get("/api/v1/man/bash/1")
+        app.dependency_overrides[get_session] = _session_dep([_page_row("test-release-2")])
+        after = await client.get("/api/v1/man/bash/1")
+
+    # A 304 keeps the client on the old body, so nothing in it may name the release.
+    assert after.headers["ETag"] == before.headers["ETag"]
+    assert after.content == before.content
+    assert after.json()["page"]["contentUnchangedSince"] == "test-release"
+
+
+async def test_man_by_name_reports_ambiguous_sections() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _session_dep(
+        [
+            _Row(_release(), _page("1"), None, None, None, None),
+            _Row(_release(), _page("1p"), None, None, None, None),
+        ]
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/man/bash")
+
+    assert res.status_code == 409
+    payload = res.json()
+    assert payload["error"]["code"] == "AMBIGUOUS_PAGE"
+    assert [o["section"] for o in payload["options"]] == ["1", "1p"]
+
+
+async def test_man_page_missing_page_and_release() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        no_page = _Row(_release(), None, None, None, None, None)
+        app.dependency_overrides[get_session] = _session_dep([no_page])
+        missing_page = await client.get("/api/v1/man/bash/1")
+        app.dependency_overrides[get_session] = _session_dep([])
+        missing_release = await client.get("/api/v1/man/bash/1")
+
+    assert missing_page.status_code == 404
+    assert missing_release.status_code == 503
+
+
+async def test_man_page_envelope_references_immutable_content() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _dummy_session_dep
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        envelope = await client.get("/api/v1/man/bash/1/envelope")
+        app.dependency_overrides[get_session] = _content_session_dep(_CONTENT_JSON)
+        content = await client.get(envelope.json()["content"]["url"])
+        revalidated = await client.get(
+            envelope.json()["content"]["url"], headers={"If-None-Match": content.headers["ETag"]}
+        )
+
+    assert envelope.status_code == 200
+    assert envelope.headers["Cache-Control"] == "public, max-age=300"
+    payload = envelope.json()
+    assert payload["content"] == {
+        "sha256": _SERVED_SHA256,
+        "url": f"/api/v1/content/{_SERVED_SHA256}",
+    }
+    assert payload["page"]["name"] == "bash"
+    ManPageEnvelopeResponse.model_validate(payload)
+
+    assert content.status_code == 200
+    assert content.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert content.headers["ETag"] == f'"{_SERVED_SHA256}"'
+    assert hashlib.sha256(content.content).hexdigest() == _SERVED_SHA256
+    assert content.json() == json.loads(_CONTENT_JSON)
+    assert revalidated.status_code == 304
+
+
+async def test_content_rejects_bad_and_unknown_hashes() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _content_session_dep(None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        invalid = await client.get("/api/v1/content/not-a-hash")
+        unknown = await client.get(f"/api/v1/content/{'0' * 64}")
+
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "INVALID_CONTENT_HASH"
+    assert unknown.status_code == 404
+    assert unknown.json()["error"]["code"] == "CONTENT_NOT_FOUND"
+    assert "immutable" not in unknown.headers.get("Cache-Control", "")
+
+
+async def _noop() -> None:
+    return None
+
+
+_Row = collections.namedtuple(
+    "_Row",
+    [
+        "release",
+        "page",
+        "content_json",
+        "served_sha256",
+        "variants",
+        "variants_content_key",
+    ],
+)
+
+
+def _release(dataset_release_id: str = "test-release") -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        id="00000000-0000-0000-0000-000000000000",
+        dataset_release_id=dataset_release_id,
+        locale="en",
+        distro="debian",
+    )
+
+
+def _page(section: str) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        id="11111111-1111-1111-1111-111111111111",
+        name="bash",
+        section=section,
+        title=f"bash({section})",
+        description="GNU Bourne-Again SHell",
+        source_package="bash",
+        source_package_version="5.2",
+        content_sha256="abc123",
+        content_unchanged_since="test-release",
+    )
+
+
+def _session_dep(rows):
+    async def _dep():
+        class _Result:
+            def all(self):
+                return rows
+
+        class _DummySession:
+            def __init__(self):
+                self.calls = 0
+
+            async def execute(self, *_args, **_kwargs):
+                self.calls += 1
+                assert self.calls == 1, "page lookups must be a single round trip"
+                return _Result()
+
+            async def scalar(self, *_args, **_kwargs):
+                return _release()
+
+        yield _DummySession()
+
+    return _dep
+
+
+def _content_session_dep(content_json):
+    async def _dep():
+        class _Result:
+            def scalar_one_or_none(self):
+                return content_json
+
+        class _DummySession:
+            async def execute(self, *_args, **_kwargs):
+                return _Result()
+
+        yield _DummySession()
+
+    return _dep
+
+
+def _etag_rows_sessionmaker(rows):
+    class _Result:
+        def all(self):
+            return rows
+
+    class _DummySession:
+        async def execute(self, *_args, **_kwargs):
+            return _Result()
+
+    @contextlib.asynccontextmanager
+    async def _session():
+        yield _DummySession()
+
+    return _session
+
+
+_VARIANTS_CONTENT_KEY = "debian:abc123,fedora:def456"
+_SERVED_SHA256 = hashlib.sha256(_CONTENT_JSON.encode()).hexdigest()
+
+
+def _page_row(release_id: str = "test-release"):
+    return _Row(
+        _release(release_id),
+        _page("1"),
+        _CONTENT_JSON,
+        _SERVED_SHA256,
+        [
+            {"distro": "debian", "contentSha256": "abc123"},
+            {"distro": "fedora", "contentSha256": "def456"},
+        ],
+        _VARIANTS_CONTENT_KEY,
+    )
+
+
+_dummy_session_dep = _session_dep([_page_row()])
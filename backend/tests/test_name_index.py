@@ -0,0 +1,165 @@
+import os
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.session import get_session
+from app.main import create_app
+from app.man.name_index import NamedPage, NameIndex, trigrams
+from app.security.deps import rate_limit_search
+
+_RELEASE_ID = uuid.UUID("00000000-0000-0000-0000-000000000000")
+_DATABASE_URL = os.environ.get("BETTERMAN_TEST_DATABASE_URL")
+
+
+def test_trigrams_match_pg_trgm() -> None:
+    # SELECT show_trgm('Git-Commit')
+    assert trigrams("Git-Commit") == {
+        "  g",
+        " gi",
+        "git",
+        "it ",
+        "  c",
+        " co",
+        "com",
+        "omm",
+        "mmi",
+        "mit",
+    }
+    assert trigrams("--") == frozenset()
+
+
+def test_nearest_orders_by_distance_then_name_and_section() -> None:
+    index = NameIndex.from_pages(
+        [
+            _page("grep", "1"),
+            _page("grep", "1p"),
+            _page("egrep", "1"),
+            _page("grepdiff", "1"),
+            _page("tar", "1"),
+        ]
+    )
+
+    nearest = index.nearest("grep", threshold=0.3, limit=10)
+
+    # grep: 1.0; grepdiff: 4/10; egrep: 3/8; tar shares nothing.
+    assert [(p.name, p.section) for p in nearest] == [
+        ("grep", "1"),
+        ("grep", "1p"),
+        ("grepdiff", "1"),
+        ("egrep", "1"),
+    ]
+    assert [p.name for p in index.nearest("grep", threshold=0.38, limit=10)] == [
+        "grep",
+        "grep",
+        "grepdiff",
+    ]
+    assert len(index.nearest("grep", threshold=0.3, limit=2)) == 2
+    assert len(index) == 5
+    assert index.memory_bytes > 0
+
+
+def test_complete_returns_prefix_matches_in_name_order() -> None:
+    index = NameIndex.from_pages(
+        [_page(name, "1") for name in ["taskset", "tar", "tail", "tac", "tee", "t"]]
+        + [_page("tar", "5")]
+    )
+
+    assert [(p.name, p.section) for p in index.complete("ta", limit=10)] == [
+        ("tac", "1"),
+        ("tail", "1"),
+        ("tar", "1"),
+        ("tar", "5"),
+        ("taskset", "1"),
+    ]
+    assert [p.name for p in index.complete("ta", limit=3)] == ["tac", "tail", "tar"]
+    assert index.complete("tz", limit=10) == []
+
+
+async def test_complete_answers_from_the_name_index_without_the_database() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    app.dependency_overrides[get_session] = _release_only_session_dep
+    app.state.name_indexes.put(
+        _RELEASE_ID,
+        NameIndex.from_pages([_page("tar", "1"), _page("tail", "1"), _page("grep", "1")]),
+        generation=0,
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/complete", params={"prefix": "TA"})
+
+    assert res.status_code == 200
+    assert res.json() == {
+        "prefix": "ta",
+        "completions": [
+            {"name": "tail", "section": "1", "description": "tail(1)"},
+            {"name": "tar", "section": "1", "description": "tar(1)"},
+        ],
+    }
+    assert "etag" in res.headers
+
+
+async def test_suggest_answers_from_the_name_index_without_the_database() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    app.dependency_overrides[get_session] = _release_only_session_dep
+    app.state.name_indexes.put(
+        _RELEASE_ID,
+        NameIndex.from_pages([_page("grep", "1"), _page("tar", "1")]),
+        generation=0,
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/suggest", params={"name": "grpe"})
+
+    assert res.status_code == 200
+    assert res.json()["suggestions"] == [
+        {"name": "grep", "section": "1", "description": "grep(1)"},
+    ]
+
+
+@pytest.mark.skipif(not _DATABASE_URL, reason="BETTERMAN_TEST_DATABASE_URL is not set")
+async def test_similarity_matches_pg_trgm() -> None:
+    pairs = [("grpe", "grep"), ("grep", "egrep"), ("git-commit", "git"), ("ta", "tail")]
+    engine = create_async_engine(_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            for query, name in pairs:
+                expected = await conn.scalar(
+                    text("SELECT similarity(:query, :name)"), {"query": query, "name": name}
+                )
+                index = NameIndex.from_pages([_page(name, "1")])
+                nearest = index.nearest(query, threshold=expected - 1e-6, limit=1)
+                assert [p.name for p in nearest] == [name]
+                assert index.nearest(query, threshold=expected + 1e-6, limit=1) == []
+    finally:
+        await engine.dispose()
+
+
+def _page(name: str, section: str) -> NamedPage:
+    return NamedPage(name_norm=name, name=name, section=section, description=f"{name}({section})")
+
+
+async def _noop() -> None:
+    return None
+
+
+async def _release_only_session_dep():
+    class _Release:
+        id = _RELEASE_ID
+        dataset_release_id = "test-release"
+
+    class _Session:
+        async def scalar(self, *_args, **_kwargs):
+            return _Release()
+
+        async def execute(self, *_args, **_kwargs):
+            raise AssertionError("expected an answer from the name index")
+
+    yield _Session()
@@ -0,0 +1,110 @@
+import types
+import uuid
+
+import httpx
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.db.session import get_session, get_session_maker
+from app.main import create_app
+from app.man.query_cost import SEARCH_MAX_COST, estimate_query_cost, plan_cost
+from app.security.deps import rate_limit_search
+
+
+def test_ordinary_queries_cost_one_token() -> None:
+    for query in ("tar", "ls", "git commit", '"copy files" -rsync'):
+        cost = estimate_query_cost(query)
+        assert not cost.too_complex
+        assert cost.cost == 1, query
+
+
+def test_or_branches_and_short_terms_cost_more() -> None:
+    assert estimate_query_cost("tar or zip or gzip").cost == 3
+    assert estimate_query_cost("a b c d").cost == 3
+    assert estimate_query_cost("a or b or c or d").cost == SEARCH_MAX_COST
+
+
+def test_too_many_terms_or_operators_are_rejected() -> None:
+    assert estimate_query_cost(" ".join(f"word{i}" for i in range(13))).too_complex
+    assert estimate_query_cost(" or ".join(f"word{i}" for i in range(6))).too_complex
+    assert not estimate_query_cost(" or ".join(f"word{i}" for i in range(5))).too_complex
+
+
+async def test_plan_cost_keeps_the_query_a_bound_parameter() -> None:
+    query = "it's a \\' back\\slash"
+
+    class _Session:
+        statement = None
+
+        async def execute(self, statement, *_args, **_kwargs):
+            _Session.statement = statement
+            return types.SimpleNamespace(scalar_one=lambda: '[{"Plan": {"Total Cost": 42.5}}]')
+
+    cost = await plan_cost(_Session(), release_id=uuid.uuid4(), query=query)
+
+    assert cost == 42.5
+    compiled = _Session.statement.compile(dialect=asyncpg.dialect())
+    sql = str(compiled)
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT count(*)")
+    assert "slash" not in sql and "'" not in sql
+    assert query in compiled.params.values()
+
+
+async def test_search_rejects_pathological_queries_before_touching_the_database() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    app.dependency_overrides[get_session] = _unused_session_dep
+    app.dependency_overrides[get_session_maker] = lambda: None
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/search", params={"q": " or ".join("abcdefgh")})
+
+    assert res.status_code == 400
+    assert res.json()["error"]["code"] == "QUERY_TOO_COMPLEX"
+
+
+async def test_expensive_search_is_charged_extra_rate_limit_tokens() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    app.dependency_overrides[get_session] = _unused_session_dep
+    app.dependency_overrides[get_session_maker] = lambda: None
+    app.state.settings.rate_limit_search_per_minute = 3
+    app.state.redis = _CountingRedis()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/search", params={"q": "tar or zip or gzip or xz"})
+
+    # One token came from rate_limit_search; the other three push past the limit.
+    assert app.state.redis.charged == [3]
+    assert res.status_code == 429
+
+
+async def _noop() -> None:
+    return None
+
+
+async def _unused_session_dep():
+    class _Session:
+        async def scalar(self, *_args, **_kwargs):
+            return types.SimpleNamespace(
+                id="00000000-0000-0000-0000-000000000000",
+                dataset_release_id="test-release",
+            )
+
+        async def execute(self, *_args, **_kwargs):
+            raise AssertionError("rejected searches never run a query")
+
+    yield _Session()
+
+
+class _CountingRedis:
+    def __init__(self):
+        self.charged: list[int] = []
+
+    async def incrby(self, _key, amount):
+        self.charged.append(amount)
+        return 1 + sum(self.charged)
+
+    async def expire(self, *_args, **_kwargs):
+        return True
@@ -6,11 +6,11 @@ from app.security import rate_limit
 
 
 class _BrokenRedis:
-    async def incr(self, *_args, **_kwargs):
+    async def incrby(self, *_args, **_kwargs):
         raise RedisError("boom")
 
     async def expire(self, *_args, **_kwargs):
-        raise AssertionError("expire() should not be called when incr() fails")
+        raise AssertionError("expire() should not be called when incrby() fails")
 
 
 async def test_rate_limit_falls_back_to_memory(monkeypatch) -> None:
@@ -30,3 +30,16 @@ async def test_rate_limit_falls_back_to_memory(monkeypatch) -> None:
             window_seconds=60,
         )
     assert excinfo.value.status_code == 429
+
+
+async def test_costly_requests_use_up_the_memory_fallback_faster(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 1_700_000_000.0)
+    rate_limit._memory_buckets.clear()
+
+    redis = _BrokenRedis()
+
+    await rate_limit.enforce_rate_limit(redis=redis, key="ip:1.2.3.4", limit=4, cost=3)
+
+    with pytest.raises(APIError) as excinfo:
+        await rate_limit.enforce_rate_limit(redis=redis, key="ip:1.2.3.4", limit=4, cost=2)
+    assert excinfo.value.status_code == 429
@@ -0,0 +1,48 @@
+from redis.exceptions import RedisError
+
+from app.web.redis_lock import acquire_lock, release_lock
+
+
+class _DictRedis:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, _script, _numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+
+
+class _DownRedis:
+    async def set(self, *_args, **_kwargs):
+        raise RedisError("down")
+
+    async def eval(self, *_args):
+        raise RedisError("down")
+
+
+async def test_lock_is_held_until_its_owner_releases_it() -> None:
+    redis = _DictRedis()
+    token = await acquire_lock(redis, "lock", seconds=1)
+
+    assert token is not None
+    assert await acquire_lock(redis, "lock", seconds=1) is None
+
+    await release_lock(redis, "lock", "someone-else")
+    assert await acquire_lock(redis, "lock", seconds=1) is None
+
+    await release_lock(redis, "lock", token)
+    assert await acquire_lock(redis, "lock", seconds=1) is not None
+
+
+async def test_lock_is_granted_when_redis_is_down() -> None:
+    redis = _DownRedis()
+    token = await acquire_lock(redis, "lock", seconds=1)
+
+    assert token is not None
+    await release_lock(redis, "lock", token)
@@ -0,0 +1,59 @@
+import types
+
+from app.datasets.active import get_active_release
+from app.datasets.release_cache import ActiveReleaseCache
+
+
+class _CountingSession:
+    def __init__(self, release_id: str = "release-1"):
+        self.calls = 0
+        self.release_id = release_id
+
+    async def scalar(self, *_args, **_kwargs):
+        self.calls += 1
+        return types.SimpleNamespace(id=self.calls, dataset_release_id=self.release_id)
+
+
+async def test_cached_release_skips_database() -> None:
+    cache = ActiveReleaseCache(ttl_seconds=60)
+    session = _CountingSession()
+
+    first = await get_active_release(session, distro="debian", cache=cache)
+    second = await get_active_release(session, distro="debian", cache=cache)
+    other = await get_active_release(session, distro="fedora", cache=cache)
+
+    assert first is second
+    assert other is not first
+    assert session.calls == 2
+
+
+async def test_invalidate_reloads_release() -> None:
+    cache = ActiveReleaseCache(ttl_seconds=60)
+    session = _CountingSession()
+
+    await get_active_release(session, distro="debian", cache=cache)
+    session.release_id = "release-2"
+    cache.invalidate()
+    reloaded = await get_active_release(session, distro="debian", cache=cache)
+
+    assert reloaded.dataset_release_id == "release-2"
+    assert session.calls == 2
+
+
+async def test_expired_entries_are_reloaded() -> None:
+    cache = ActiveReleaseCache(ttl_seconds=0)
+    session = _CountingSession()
+
+    await get_active_release(session, distro="debian", cache=cache)
+    await get_active_release(session, distro="debian", cache=cache)
+
+    assert session.calls == 2
+
+
+def test_stale_put_after_invalidation_is_dropped() -> None:
+    cache = ActiveReleaseCache(ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate()
+    cache.put(locale="en", distro="debian", release=None, generation=generation)
+
+    assert cache.get(locale="en", distro="debian") == (False, None)
@@ -0,0 +1,171 @@
+import asyncio
+import gzip
+import time
+import types
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.web.response_cache import ResponseCache, cached_json_response
+
+
+class _DictRedis:
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def eval(self, _script, _numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+
+
+class _DownRedis:
+    async def get(self, _key):
+        raise RedisError("down")
+
+    async def set(self, _key, _value, ex=None, nx=False, px=None):
+        raise RedisError("down")
+
+    async def exists(self, _key):
+        raise RedisError("down")
+
+    async def eval(self, *_args):
+        raise RedisError("down")
+
+
+async def test_l1_evicts_least_recently_used_within_budget() -> None:
+    cache = ResponseCache(_DownRedis(), l1_max_bytes=250, l2_ttl_seconds=60)
+
+    await cache.put(namespace="r1", etag="a", body=b"a" * 100)
+    await cache.put(namespace="r1", etag="b", body=b"b" * 100)
+    assert await cache.get(namespace="r1", etag="a") is not None
+    await cache.put(namespace="r1", etag="c", body=b"c" * 100)
+
+    assert await cache.get(namespace="r1", etag="a") is not None
+    assert await cache.get(namespace="r1", etag="b") is None
+    assert await cache.get(namespace="r1", etag="c") is not None
+
+
+async def test_l2_is_shared_across_workers_and_release_scoped() -> None:
+    redis = _DictRedis()
+    writer = ResponseCache(redis, l1_max_bytes=1024, l2_ttl_seconds=60)
+    reader = ResponseCache(redis, l1_max_bytes=1024, l2_ttl_seconds=60)
+
+    await writer.put(namespace="r1", etag='W/"x"', body=b'{"error":1}', status_code=409)
+    cached = await reader.get(namespace="r1", etag='W/"x"')
+
+    assert list(redis.values) == ['rc:r1:W/"x"']
+    assert cached is not None
+    assert (cached.status_code, cached.body) == (409, b'{"error":1}')
+    assert await reader.get(namespace="r2", etag='W/"x"') is None
+
+
+async def test_large_bodies_are_served_precompressed() -> None:
+    cache = ResponseCache(_DownRedis(), l1_max_bytes=1 << 20, l2_ttl_seconds=60)
+    body = b"[" + b",".join(b'"grep"' for _ in range(500)) + b"]"
+    cached = await cache.put(namespace="r1", etag='W/"x"', body=body)
+
+    request = types.SimpleNamespace(headers={"accept-encoding": "gzip, br"})
+    res = cached_json_response(request, cached, etag='W/"x"', cache_control="public")
+    plain = cached_json_response(
+        types.SimpleNamespace(headers={}), cached, etag='W/"x"', cache_control="public"
+    )
+
+    assert res.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(res.body) == body
+    assert res.headers["ETag"] == 'W/"x"'
+    assert plain.body == body
+    assert "content-encoding" not in plain.headers
+
+
+async def test_gzip_refused_with_q_zero_is_not_sent() -> None:
+    cache = ResponseCache(_DownRedis(), l1_max_bytes=1 << 20, l2_ttl_seconds=60)
+    body = b"[" + b",".join(b'"grep"' for _ in range(500)) + b"]"
+    cached = await cache.put(namespace="r1", etag='W/"x"', body=body)
+
+    def _encoding(accept_encoding: str) -> str | None:
+        request = types.SimpleNamespace(headers={"accept-encoding": accept_encoding})
+        res = cached_json_response(request, cached, etag='W/"x"', cache_control="public")
+        return res.headers.get("content-encoding")
+
+    assert _encoding("gzip;q=0") is None
+    assert _encoding("identity, gzip;q=0") is None
+    assert _encoding("*;q=0.5, gzip; q=0.0") is None
+    assert _encoding("br") is None
+    assert _encoding("gzip;q=0.5") == "gzip"
+    assert _encoding("br, *") == "gzip"
+    assert _encoding("GZIP") == "gzip"
+
+
+async def test_concurrent_misses_fill_once() -> None:
+    cache = ResponseCache(_DownRedis(), l1_max_bytes=1024, l2_ttl_seconds=60, fill_lock_seconds=1)
+    calls = 0
+
+    async def _fill() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"[]"
+
+    results = await asyncio.gather(
+        *(cache.get_or_fill(namespace="r1", etag="e", fill=_fill) for _ in range(5))
+    )
+
+    assert calls == 1
+    assert {r.body for r in results} == {b"[]"}
+
+
+async def test_fill_waits_for_other_worker_holding_the_lock() -> None:
+    redis = _DictRedis()
+    other_worker = ResponseCache(redis, l1_max_bytes=1024, l2_ttl_seconds=60)
+    cache = ResponseCache(redis, l1_max_bytes=1024, l2_ttl_seconds=60, fill_lock_seconds=1)
+    redis.values["rc-lock:r1:e"] = "other-worker"
+
+    async def _fill() -> bytes:
+        raise AssertionError("the lock holder fills this key")
+
+    async def _other_worker_fills() -> None:
+        await asyncio.sleep(0.02)
+        await other_worker.put(namespace="r1", etag="e", body=b"[1]")
+
+    filler = asyncio.create_task(_other_worker_fills())
+    cached = await cache.get_or_fill(namespace="r1", etag="e", fill=_fill)
+    await filler
+
+    assert cached.body == b"[1]"
+
+
+async def test_fill_stops_waiting_when_the_lock_holder_fails() -> None:
+    redis = _DictRedis()
+    first = ResponseCache(redis, l1_max_bytes=1024, l2_ttl_seconds=60, fill_lock_seconds=5)
+    second = ResponseCache(redis, l1_max_bytes=1024, l2_ttl_seconds=60, fill_lock_seconds=5)
+
+    async def _failing_fill() -> bytes:
+        await asyncio.sleep(0.02)
+        raise RuntimeError("database went away")
+
+    async def _fill() -> bytes:
+        return b"[2]"
+
+    holder = asyncio.create_task(first.get_or_fill(namespace="r1", etag="e", fill=_failing_fill))
+    await asyncio.sleep(0)
+    assert "rc-lock:r1:e" in redis.values
+
+    started = time.monotonic()
+    cached = await second.get_or_fill(namespace="r1", etag="e", fill=_fill)
+
+    assert cached.body == b"[2]"
+    assert time.monotonic() - started < 1
+    with pytest.raises(RuntimeError):
+        await holder
@@ -1,10 +1,12 @@
+import asyncio
 import types
 import uuid
+from contextlib import asynccontextmanager
 
 import httpx
 from sqlalchemy.exc import ProgrammingError
 
-from app.db.session import get_session
+from app.db.session import get_session, get_session_maker
 from app.main import create_app
 from app.security.deps import rate_limit_search
 
@@ -12,7 +14,7 @@ from app.security.deps import rate_limit_search
 async def test_search_invalid_query_returns_400() -> None:
     app = create_app()
     app.dependency_overrides[rate_limit_search] = _noop
-    app.dependency_overrides[get_session] = _dummy_session_dep
+    _override_sessions(app, _dummy_session_dep)
 
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
@@ -23,10 +25,31 @@ async def test_search_invalid_query_returns_400() -> None:
     assert payload["error"]["code"] == "INVALID_QUERY"
 
 
+async def test_failed_ranking_cancels_the_suggestions_query() -> None:
+    suggestions_session = _BlockingSession()
+
+    @asynccontextmanager
+    async def _make_session():
+        yield suggestions_session
+
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    app.dependency_overrides[get_session] = _dummy_session_dep
+    app.dependency_overrides[get_session_maker] = lambda: _make_session
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/search", params={"q": "tar"})
+
+    assert res.status_code == 400
+    assert res.json()["error"]["code"] == "INVALID_QUERY"
+    assert suggestions_session.cancelled
+
+
 async def test_search_response_reports_has_more() -> None:
     app = create_app()
     app.dependency_overrides[rate_limit_search] = _noop
-    app.dependency_overrides[get_session] = _search_session_dep
+    _override_sessions(app, _search_session_dep)
 
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
@@ -57,6 +80,18 @@ async def _noop() -> None:
     return None
 
 
+def _override_sessions(app, session_dep) -> None:
+    """The request session and every session of the search fan-out come from session_dep."""
+
+    @asynccontextmanager
+    async def _make_session():
+        async for session in session_dep():
+            yield session
+
+    app.dependency_overrides[get_session] = session_dep
+    app.dependency_overrides[get_session_maker] = lambda: _make_session
+
+
 async def _dummy_session_dep():
     class _DummySession:
         async def scalar(self, *_args, **_kwargs):
@@ -71,6 +106,23 @@ async def _dummy_session_dep():
     yield _DummySession()
 
 
+class _BlockingSession:
+    """A suggestions query that never finishes unless cancelled."""
+
+    def __init__(self):
+        self.cancelled = False
+
+    async def scalar(self, *_args, **_kwargs):
+        return None
+
+    async def execute(self, *_args, **_kwargs):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
 async def _search_session_dep():
     class _SuggestionResult:
         def scalars(self):
@@ -91,6 +143,9 @@ async def _search_session_dep():
                     section="1",
                     title="tar(1)",
                     description="archive utility",
+                    tier=0,
+                    score=1100.5,
+                    name_length=3,
                 ),
                 types.SimpleNamespace(
                     id=page_ids["tarcat"],
@@ -98,6 +153,9 @@ async def _search_session_dep():
                     section="1",
                     title="tarcat(1)",
                     description="inspect tar archives",
+                    tier=1,
+                    score=100.25,
+                    name_length=6,
                 ),
                 types.SimpleNamespace(
                     id=page_ids["tarchive"],
@@ -105,6 +163,9 @@ async def _search_session_dep():
                     section="1",
                     title="tarchive(1)",
                     description="extra result",
+                    tier=1,
+                    score=100.0,
+                    name_length=8,
                 ),
             ]
 
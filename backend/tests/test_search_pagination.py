@@ -1,9 +1,10 @@
 import types
 import uuid
+from contextlib import asynccontextmanager
 
 import httpx
 
-from app.db.session import get_session
+from app.db.session import get_session, get_session_maker
 from app.main import create_app
 from app.security.deps import rate_limit_search
 
@@ -11,12 +12,13 @@ from app.security.deps import rate_limit_search
 async def test_search_reports_has_more_when_extra_results_exist() -> None:
     app = create_app()
     app.dependency_overrides[rate_limit_search] = _noop
-    app.dependency_overrides[get_session] = _dummy_session_dep_with_rows(
+    session_dep = _dummy_session_dep_with_rows(
         [
             ("tar", "1", "tar(1)", "archive utility", "tar snippets"),
             ("tar-split", "1", "tar-split(1)", "split tar archives", "more snippets"),
         ]
     )
+    _override_sessions(app, session_dep)
 
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
@@ -32,9 +34,10 @@ async def test_search_reports_has_more_when_extra_results_exist() -> None:
 async def test_search_reports_has_more_false_at_end() -> None:
     app = create_app()
     app.dependency_overrides[rate_limit_search] = _noop
-    app.dependency_overrides[get_session] = _dummy_session_dep_with_rows(
+    session_dep = _dummy_session_dep_with_rows(
         [("tar", "1", "tar(1)", "archive utility", "tar snippets")]
     )
+    _override_sessions(app, session_dep)
 
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
@@ -50,7 +53,7 @@ async def test_search_reports_has_more_false_at_end() -> None:
 async def test_search_reports_has_more_false_on_last_page_with_offset() -> None:
     app = create_app()
     app.dependency_overrides[rate_limit_search] = _noop
-    app.dependency_overrides[get_session] = _dummy_session_dep_with_rows(
+    session_dep = _dummy_session_dep_with_rows(
         [
             ("tar", "1", "tar(1)", "archive utility", "tar snippets"),
             ("tar-split", "1", "tar-split(1)", "split tar archives", "more snippets"),
@@ -58,6 +61,7 @@ async def test_search_reports_has_more_false_on_last_page_with_offset() -> None:
         ],
         search_offset=2,
     )
+    _override_sessions(app, session_dep)
 
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
@@ -73,10 +77,49 @@ async def test_search_reports_has_more_false_on_last_page_with_offset() -> None:
     assert payload["results"][0]["title"] == "tarsnap(1)"
 
 
+async def test_search_next_cursor_round_trips() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    session_dep = _dummy_session_dep_with_rows(
+        [
+            ("tar", "1", "tar(1)", "archive utility", "tar snippets"),
+            ("tar-split", "1", "tar-split(1)", "split tar archives", "more snippets"),
+        ]
+    )
+    _override_sessions(app, session_dep)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/v1/search", params={"q": "tar", "limit": 1})
+        cursor = first.json()["nextCursor"]
+        second = await client.get(
+            "/api/v1/search", params={"q": "tar", "limit": 1, "cursor": cursor}
+        )
+        invalid = await client.get("/api/v1/search", params={"q": "tar", "cursor": "bogus"})
+
+    assert isinstance(cursor, str)
+    assert second.status_code == 200
+    assert second.json()["nextOffset"] is None
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "INVALID_CURSOR"
+
+
 async def _noop() -> None:
     return None
 
 
+def _override_sessions(app, session_dep) -> None:
+    """The request session and every session of the search fan-out come from session_dep."""
+
+    @asynccontextmanager
+    async def _make_session():
+        async for session in session_dep():
+            yield session
+
+    app.dependency_overrides[get_session] = session_dep
+    app.dependency_overrides[get_session_maker] = lambda: _make_session
+
+
 def _dummy_session_dep_with_rows(
     rows: list[tuple[str, str, str, str, str]],
     *,
@@ -99,7 +142,7 @@ def _dummy_session_dep_with_rows(
 
         class _DummySession:
             def __init__(self):
-                self.calls = 0
+                self.rank_calls = 0
 
             async def scalar(self, *_args, **_kwargs):
                 return types.SimpleNamespace(
@@ -107,24 +150,9 @@ def _dummy_session_dep_with_rows(
                     dataset_release_id="test-release",
                 )
 
-            async def execute(self, *_args, **_kwargs):
-                self.calls += 1
-                if self.calls == 1:
-                    visible_rows = rows[search_offset:]
-                    return _Result(
-                        [
-                            types.SimpleNamespace(
-                                id=uuid.uuid5(uuid.NAMESPACE_URL, f"betterman:{name}:{section}"),
-                                name=name,
-                                section=section,
-                                title=title,
-                                description=description,
-                            )
-                            for name, section, title, description, highlight in visible_rows
-                        ],
-                        suggestions=[],
-                    )
-                if self.calls == 2:
+            async def execute(self, stmt, *_args, **_kwargs):
+                rendered = str(stmt)
+                if "ts_headline" in rendered:
                     visible_rows = rows[search_offset:]
                     return _Result(
                         [
@@ -139,7 +167,30 @@ def _dummy_session_dep_with_rows(
                             if highlight
                         ]
                     )
-                return _Result([], suggestions=["tar"])
+                if "SELECT man_page_search.name_norm" in rendered:
+                    return _Result([], suggestions=["tar"])
+
+                # Search tiers: the first one holds every row, later ones are empty.
+                self.rank_calls += 1
+                if self.rank_calls == 1:
+                    visible_rows = rows[search_offset:]
+                    return _Result(
+                        [
+                            types.SimpleNamespace(
+                                id=uuid.uuid5(uuid.NAMESPACE_URL, f"betterman:{name}:{section}"),
+                                name=name,
+                                section=section,
+                                title=title,
+                                description=description,
+                                tier=0,
+                                score=1000.0,
+                                name_length=len(name),
+                            )
+                            for name, section, title, description, highlight in visible_rows
+                        ],
+                        suggestions=[],
+                    )
+                return _Result([])
 
         yield _DummySession()
 
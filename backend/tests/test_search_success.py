@@ -1,9 +1,10 @@
 import types
 import uuid
+from contextlib import asynccontextmanager
 
 import httpx
 
-from app.db.session import get_session
+from app.db.session import get_session, get_session_maker
 from app.main import create_app
 from app.security.deps import rate_limit_search
 
@@ -11,7 +12,7 @@ from app.security.deps import rate_limit_search
 async def test_search_returns_results_and_server_timing() -> None:
     app = create_app()
     app.dependency_overrides[rate_limit_search] = _noop
-    app.dependency_overrides[get_session] = _dummy_session_dep
+    _override_sessions(app, _dummy_session_dep)
 
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
@@ -28,12 +29,50 @@ async def test_search_returns_results_and_server_timing() -> None:
     assert "search_rank" in server_timing
     assert "search_headline" in server_timing
     assert "search_suggest" in server_timing
+    assert "search_fanout" in server_timing
+
+
+async def test_search_returns_section_facets_on_request() -> None:
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    _override_sessions(app, _dummy_session_dep)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        plain = await client.get("/api/v1/search", params={"q": "tar"})
+        faceted = await client.get("/api/v1/search", params={"q": "tar", "facets": "section"})
+        invalid = await client.get("/api/v1/search", params={"q": "tar", "facets": "distro"})
+
+    assert plain.json()["facets"] is None
+    assert faceted.status_code == 200
+    assert faceted.json()["facets"] == {
+        "section": [
+            {"section": "1", "label": "User Commands", "count": 3},
+            {"section": "3ssl", "label": "Library Calls (OpenSSL)", "count": 2},
+            {"section": "8", "label": "System Administration", "count": 1},
+        ]
+    }
+    assert faceted.headers["ETag"] != plain.headers["ETag"]
+    assert "search_facets" in faceted.headers["Server-Timing"]
+    assert invalid.status_code == 400
 
 
 async def _noop() -> None:
     return None
 
 
+def _override_sessions(app, session_dep) -> None:
+    """The request session and every session of the search fan-out come from session_dep."""
+
+    @asynccontextmanager
+    async def _make_session():
+        async for session in session_dep():
+            yield session
+
+    app.dependency_overrides[get_session] = session_dep
+    app.dependency_overrides[get_session_maker] = lambda: _make_session
+
+
 async def _dummy_session_dep():
     page_id = uuid.UUID("22222222-2222-2222-2222-222222222222")
 
@@ -53,7 +92,7 @@ async def _dummy_session_dep():
 
     class _DummySession:
         def __init__(self):
-            self._execute_calls = 0
+            self._rank_calls = 0
 
         async def scalar(self, *_args, **_kwargs):
             return types.SimpleNamespace(
@@ -61,32 +100,42 @@ async def _dummy_session_dep():
                 dataset_release_id="test-release",
             )
 
-        async def execute(self, *_args, **_kwargs):
-            self._execute_calls += 1
-
-            if self._execute_calls == 1:
+        async def execute(self, stmt, *_args, **_kwargs):
+            rendered = str(stmt)
+            if "ts_headline" in rendered:
+                # Highlights come from the bounded snippet, never the full plain text.
+                assert "man_page_search.snippet_text" in rendered
+                assert "man_page_content" not in rendered
                 return _Rows(
                     [
                         types.SimpleNamespace(
-                            id=page_id,
-                            name="tar",
-                            section="1",
-                            title="tar",
-                            description="manipulate tape archives",
+                            man_page_id=page_id,
+                            hl="tar archive utility",
                         )
                     ]
                 )
-
-            if self._execute_calls == 2:
+            if "GROUP BY man_page_search.section" in rendered:
+                # Facet counts cover every tier, whatever the section filter.
+                assert "man_page_search.name_norm %" in rendered
+                return _Rows([("8", 1), ("1", 3), ("3ssl", 2)])
+            if "SELECT man_page_search.name_norm" in rendered:
+                return _Scalars(["tar", "tar", "tarball"])
+
+            # Search tiers: the first one finds the page, later ones find nothing new.
+            self._rank_calls += 1
+            if self._rank_calls == 1:
                 return _Rows(
                     [
                         types.SimpleNamespace(
-                            man_page_id=page_id,
-                            hl="tar archive utility",
+                            id=page_id,
+                            name="tar",
+                            section="1",
+                            title="tar",
+                            description="manipulate tape archives",
                         )
                     ]
                 )
 
-            return _Scalars(["tar", "tar", "tarball"])
+            return _Rows([])
 
     yield _DummySession()
@@ -0,0 +1,144 @@
+import types
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.man.search import SearchKey, run_tiered_search
+
+_RELEASE_ID = uuid.UUID("00000000-0000-0000-0000-000000000000")
+
+
+async def test_exact_match_filling_the_page_skips_later_tiers() -> None:
+    session = _ScriptedSession([[_row("tar", "1"), _row("tar", "5")]])
+    server_timing: list[tuple[str, float]] = []
+
+    rows = await run_tiered_search(
+        session,
+        release_id=_RELEASE_ID,
+        query="tar",
+        section_norm=None,
+        limit=2,
+        offset=0,
+        server_timing=server_timing,
+    )
+
+    assert [(r.name, r.section) for r in rows] == [("tar", "1"), ("tar", "5")]
+    assert len(session.statements) == 1
+    assert [name for name, _ in server_timing] == ["search_exact"]
+    # One relation: the search rows carry the release and display fields themselves.
+    assert "man_pages" not in str(session.statements[0].compile(dialect=postgresql.dialect()))
+
+
+async def test_tiers_fill_the_page_in_order_and_offset_skips_whole_tiers() -> None:
+    # Two exact matches, then prefix matches; the page starts at the third result.
+    session = _ScriptedSession(
+        [
+            [],  # exact tier, offset 3: nothing left on this page
+            2,  # exact tier count
+            [_row("tarsnap", "1")],  # prefix tier, offset 1
+            [_row("bsdtar", "1")],  # full-text and fuzzy tier
+        ]
+    )
+    server_timing: list[tuple[str, float]] = []
+
+    rows = await run_tiered_search(
+        session,
+        release_id=_RELEASE_ID,
+        query="tar",
+        section_norm="1",
+        limit=2,
+        offset=3,
+        server_timing=server_timing,
+    )
+
+    assert [r.name for r in rows] == ["tarsnap", "bsdtar"]
+    assert [name for name, _ in server_timing] == [
+        "search_exact",
+        "search_prefix",
+        "search_text",
+    ]
+    offsets = [s._offset_clause.value for s in session.statements if s._offset_clause is not None]
+    assert offsets == [3, 1, 0]
+
+
+async def test_cursor_resumes_inside_its_tier_without_offset() -> None:
+    after = SearchKey(
+        tier=1,
+        score=100.5,
+        name_length=7,
+        section="1",
+        id=uuid.UUID("11111111-1111-1111-1111-111111111111"),
+    )
+    session = _ScriptedSession([[_row("tarsnap", "1")], []])
+    server_timing: list[tuple[str, float]] = []
+
+    rows = await run_tiered_search(
+        session,
+        release_id=_RELEASE_ID,
+        query="tar",
+        section_norm=None,
+        limit=3,
+        offset=0,
+        after=after,
+        server_timing=server_timing,
+    )
+
+    assert [r.name for r in rows] == ["tarsnap"]
+    # The exact tier lies entirely before the cursor and is never queried.
+    assert [name for name, _ in server_timing] == ["search_prefix", "search_text"]
+    prefix_sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert (
+        "(length(man_page_search.name), man_page_search.section, man_page_search.man_page_id) >"
+        in prefix_sql
+    )
+    text_sql = str(session.statements[1].compile(dialect=postgresql.dialect()))
+    assert "man_page_id) >" not in text_sql
+
+
+async def test_full_text_and_fuzzy_matches_are_ranked_together() -> None:
+    session = _ScriptedSession([[], [], [_row("grep", "1"), _row("egrpe", "1")]])
+
+    await run_tiered_search(
+        session,
+        release_id=_RELEASE_ID,
+        query="grpe",
+        section_norm=None,
+        limit=2,
+        offset=0,
+        server_timing=[],
+    )
+
+    # One statement, so a close name can rank above a weak full-text match.
+    assert len(session.statements) == 3
+    text_sql = str(session.statements[2].compile(dialect=postgresql.dialect()))
+    assert "@@ websearch_to_tsquery" in text_sql
+    assert "man_page_search.name_norm %" in text_sql
+
+
+def _row(name: str, section: str) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        id=uuid.uuid5(uuid.NAMESPACE_URL, f"betterman:{name}:{section}"),
+        name=name,
+        section=section,
+        title=f"{name}({section})",
+        description="",
+    )
+
+
+class _ScriptedSession:
+    def __init__(self, results):
+        self._results = list(results)
+        self.statements = []
+
+    async def execute(self, statement, *_args, **_kwargs):
+        self.statements.append(statement)
+        result = self._results.pop(0)
+
+        class _Result:
+            def all(self):
+                return result
+
+            def scalar_one(self):
+                return result
+
+        return _Result()
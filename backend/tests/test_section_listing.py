@@ -0,0 +1,123 @@
+import types
+import uuid
+
+import httpx
+from sqlalchemy.dialects import postgresql
+
+from app.db.session import get_session
+from app.main import create_app
+from app.security.deps import rate_limit_page
+
+
+async def test_section_listing_pages_by_cursor() -> None:
+    session = _SectionSession(["awk", "bash", "cat"])
+
+    async def _session_dep():
+        yield session
+
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _session_dep
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/v1/section/1", params={"limit": 2})
+        cursor = first.json()["nextCursor"]
+        second = await client.get("/api/v1/section/1", params={"limit": 2, "cursor": cursor})
+
+    assert first.status_code == 200
+    assert [r["name"] for r in first.json()["results"]] == ["awk", "bash"]
+    assert second.status_code == 200
+    assert [r["name"] for r in second.json()["results"]] == ["cat"]
+    assert second.json()["nextCursor"] is None
+
+    first_sql, second_sql = session.listings
+    assert "OFFSET" in first_sql
+    assert "(man_pages.name, man_pages.id) > ('bash'" in second_sql
+    assert "OFFSET" not in second_sql
+
+
+async def test_sections_are_listed_from_release_stats() -> None:
+    session = _SectionSession([])
+
+    async def _session_dep():
+        yield session
+
+    app = create_app()
+    app.dependency_overrides[rate_limit_page] = _noop
+    app.dependency_overrides[get_session] = _session_dep
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/sections")
+
+    assert res.status_code == 200
+    assert res.json() == [
+        {"section": "1", "label": "User Commands"},
+        {"section": "3p", "label": "Library Functions (POSIX)"},
+        {"section": "8", "label": "System Administration"},
+    ]
+    (sql,) = session.listings
+    assert "FROM release_section_stats" in sql
+    assert "man_pages" not in sql
+
+
+async def _noop() -> None:
+    return None
+
+
+def _page(name: str) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        id=uuid.uuid5(uuid.NAMESPACE_URL, f"betterman:{name}:1"),
+        name=name,
+        section="1",
+        title=f"{name}(1)",
+        description="",
+    )
+
+
+class _SectionSession:
+    """Serves a section of ``names``, honouring the keyset condition of the query."""
+
+    def __init__(self, names: list[str]):
+        self._pages = [_page(name) for name in names]
+        self.listings: list[str] = []
+
+    async def scalar(self, statement, *_args, **_kwargs):
+        if "release_section_stats" in str(statement):
+            return len(self._pages)
+        return types.SimpleNamespace(
+            id="00000000-0000-0000-0000-000000000000",
+            dataset_release_id="test-release",
+        )
+
+    async def execute(self, statement, *_args, **_kwargs):
+
+        sql = str(
+            statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        )
+        self.listings.append(sql)
+        if "release_section_stats" in sql:
+            # Stored in arbitrary order; the endpoint sorts by section.
+            stat_rows = [
+                types.SimpleNamespace(section="8", label="System Administration", total=4),
+                types.SimpleNamespace(section="3p", label="Library Functions (POSIX)", total=2),
+                types.SimpleNamespace(section="1", label="User Commands", total=9),
+            ]
+
+            class _StatsResult:
+                def all(self):
+                    return stat_rows
+
+            return _StatsResult()
+        pages = self._pages
+        if "(man_pages.name, man_pages.id) > ('bash'" in sql:
+            pages = [p for p in pages if p.name > "bash"]
+        limit = statement._limit_clause.value
+        rows = pages[:limit]
+
+        class _Result:
+            def scalars(self):
+                return iter(rows)
+
+        return _Result()
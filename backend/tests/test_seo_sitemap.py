@@ -0,0 +1,138 @@
+import types
+
+import httpx
+from sqlalchemy.dialects import postgresql
+
+from app.db.session import get_session
+from app.main import create_app
+
+
+async def test_sitemap_page_reads_its_shard_without_offset() -> None:
+    session = _SitemapSession([("tar", "1"), ("tar", "5")])
+    app = _app(session)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/seo/sitemap-page", params={"distro": "debian", "page": 3})
+
+    assert res.status_code == 200
+    assert res.json() == {
+        "items": [{"name": "tar", "section": "1"}, {"name": "tar", "section": "5"}],
+        "page": 3,
+    }
+    (sql,) = session.statements
+    assert "man_pages.sitemap_page = 3" in sql
+    assert "OFFSET" not in sql
+
+
+async def test_sitemap_page_xml_is_served_gzipped() -> None:
+    session = _SitemapSession([("tar", "1")] * 100)
+    app = _app(session)
+    app.state.settings.public_base_url = "https://betterman.example"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get(
+            "/api/v1/seo/sitemap-page.xml",
+            params={"distro": "ubuntu", "page": 1},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/xml; charset=utf-8"
+    assert res.headers["content-encoding"] == "gzip"
+    # httpx has already decoded the gzip body.
+    body = res.text
+    assert body.startswith('<?xml version="1.0" encoding="UTF-8"?>')
+    assert "<loc>https://betterman.example/man/tar/1?distro=ubuntu</loc>" in body
+
+
+async def test_sitemap_page_xml_ignores_the_host_header() -> None:
+    session = _SitemapSession([("tar", "1")])
+    app = _app(session)
+    app.state.settings.public_base_url = "https://betterman.example"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        forged = await client.get(
+            "/api/v1/seo/sitemap-page.xml",
+            params={"distro": "debian", "page": 1},
+            headers={"Host": "evil.example"},
+        )
+        honest = await client.get(
+            "/api/v1/seo/sitemap-page.xml", params={"distro": "debian", "page": 1}
+        )
+
+    assert forged.status_code == 200
+    assert "evil.example" not in forged.text
+    assert "<loc>https://betterman.example/man/tar/1</loc>" in forged.text
+    assert honest.headers["etag"] == forged.headers["etag"]
+    assert honest.text == forged.text
+
+
+async def test_sitemap_page_xml_needs_a_public_base_url() -> None:
+    session = _SitemapSession([("tar", "1")])
+    app = _app(session)
+    app.state.settings.public_base_url = None
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get(
+            "/api/v1/seo/sitemap-page.xml",
+            params={"distro": "debian", "page": 1},
+            headers={"Host": "evil.example"},
+        )
+
+    assert res.status_code == 503
+    assert res.json()["error"]["code"] == "PUBLIC_BASE_URL_UNSET"
+    assert session.statements == []
+
+
+async def test_missing_sitemap_page_xml_is_not_found() -> None:
+    app = _app(_SitemapSession([]))
+    app.state.settings.public_base_url = "https://betterman.example"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get(
+            "/api/v1/seo/sitemap-page.xml", params={"distro": "debian", "page": 9}
+        )
+
+    assert res.status_code == 404
+
+
+def _app(session):
+    async def _session_dep():
+        yield session
+
+    app = create_app()
+    app.dependency_overrides[get_session] = _session_dep
+    return app
+
+
+class _SitemapSession:
+    def __init__(self, items: list[tuple[str, str]]):
+        self._items = items
+        self.statements: list[str] = []
+
+    async def scalar(self, *_args, **_kwargs):
+        return types.SimpleNamespace(
+            id="00000000-0000-0000-0000-000000000000",
+            dataset_release_id="test-release",
+        )
+
+    async def execute(self, statement, *_args, **_kwargs):
+        self.statements.append(
+            str(
+                statement.compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+            )
+        )
+        items = self._items
+
+        class _Result:
+            def all(self):
+                return items
+
+        return _Result()
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.core.errors import APIError
+from app.web.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_run() -> None:
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def _load() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "page"
+
+    tasks = [asyncio.create_task(flight.do("bash/1", _load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["page"] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+async def test_errors_reach_every_waiter_and_are_not_kept() -> None:
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def _missing() -> str:
+        await release.wait()
+        raise APIError(status_code=404, code="PAGE_NOT_FOUND", message="Page not found")
+
+    tasks = [asyncio.create_task(flight.do("bash/9", _missing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, APIError) and r.status_code == 404 for r in results)
+    assert await flight.do("bash/9", _ok) == "ok"
+
+
+async def test_cancelled_leader_hands_over_to_a_waiter() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def _slow() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01 if calls > 1 else 10)
+        return "page"
+
+    leader = asyncio.create_task(flight.do("bash/1", _slow))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flight.do("bash/1", _slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "page"
+    assert calls == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def _ok() -> str:
+    return "ok"
@@ -1,6 +1,7 @@
 import types
 
 import httpx
+from sqlalchemy.dialects import postgresql
 
 from app.db.session import get_session
 from app.main import create_app
@@ -27,26 +28,60 @@ async def test_suggest_returns_suggestions() -> None:
     assert expected in payload["suggestions"]
 
 
+async def test_suggest_uses_indexable_trigram_operators() -> None:
+    session = _DummySession()
+
+    async def _session_dep():
+        yield session
+
+    app = create_app()
+    app.dependency_overrides[rate_limit_search] = _noop
+    app.dependency_overrides[get_session] = _session_dep
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        res = await client.get("/api/v1/suggest", params={"name": "grpe"})
+
+    assert res.status_code == 200
+    compiled = [
+        str(s.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        for s in session.statements
+    ]
+    threshold = next(sql for sql in compiled if "set_config" in sql)
+    assert "'pg_trgm.similarity_threshold', '0.2'" in threshold
+    lookup = compiled[-1]
+    assert "man_page_search.name_norm %% 'grpe'" in lookup
+    assert "<-> 'grpe'" in lookup
+    assert "similarity(" not in lookup
+
+
 async def _noop() -> None:
     return None
 
 
-async def _dummy_session_dep():
-    class _Result:
-        def all(self):
-            return [
-                ("grep", "1", "print lines that match patterns"),
-                ("groups", "1", "print the groups a user is in"),
-            ]
-
-    class _DummySession:
-        async def scalar(self, *_args, **_kwargs):
-            return types.SimpleNamespace(
-                id="00000000-0000-0000-0000-000000000000",
-                dataset_release_id="test-release",
-            )
-
-        async def execute(self, *_args, **_kwargs):
-            return _Result()
+class _Result:
+    def all(self):
+        return [
+            ("grep", "1", "print lines that match patterns"),
+            ("groups", "1", "print the groups a user is in"),
+        ]
+
+
+class _DummySession:
+    def __init__(self):
+        self.statements = []
 
+    async def scalar(self, statement, *_args, **_kwargs):
+        self.statements.append(statement)
+        return types.SimpleNamespace(
+            id="00000000-0000-0000-0000-000000000000",
+            dataset_release_id="test-release",
+        )
+
+    async def execute(self, statement, *_args, **_kwargs):
+        self.statements.append(statement)
+        return _Result()
+
+
+async def _dummy_session_dep():
     yield _DummySession()
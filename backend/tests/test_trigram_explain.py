@@ -0,0 +1,247 @@
+"""Query plans of the search and suggest paths, against a real database.
+
+Needs a migrated Postgres (``alembic upgrade head``) in BETTERMAN_TEST_DATABASE_URL;
+everything runs in a transaction that is rolled back.
+"""
+
+import asyncio
+import os
+import re
+import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.datasets.activation import fill_search_documents
+from app.datasets.partitions import attach_search_partition, search_partition_name
+from app.db.session import get_session, get_session_maker
+from app.main import create_app
+from app.man.query_cost import plan_cost
+from app.security.deps import rate_limit_search
+
+_DATABASE_URL = os.environ.get("BETTERMAN_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not _DATABASE_URL, reason="BETTERMAN_TEST_DATABASE_URL is not set")
+
+
+async def test_suggest_uses_trigram_index() -> None:
+    plans = await _plans("/api/v1/suggest", {"name": "grpe"})
+
+    assert len(plans) == 1
+    _assert_index(plans[0][1], "_trgm")
+
+
+async def test_search_tiers_use_their_indexes() -> None:
+    plans = await _plans("/api/v1/search", {"q": "grep"})
+
+    exact_plan = next(plan for sql, plan in plans if "name_norm = 'grep'" in sql)
+    fuzzy_plan = next(plan for sql, plan in plans if "name_norm % 'grep'" in sql)
+    suggestions_plan = next(plan for sql, plan in plans if "<->" in sql)
+    # The release/name index.
+    _assert_index(exact_plan, "Index")
+    assert all("man_pages" not in sql for sql, _plan in plans)
+    _assert_index(fuzzy_plan, "_trgm")
+    _assert_index(suggestions_plan, "_trgm")
+
+
+async def test_search_prunes_to_the_release_partition() -> None:
+    plans = await _plans("/api/v1/search", {"q": "grep"})
+
+    search_plans = [plan for sql, plan in plans if "man_page_search" in sql]
+    assert search_plans
+    for plan in search_plans:
+        partitions = set(re.findall(r"\bman_page_search_(?:[0-9a-f]{32}|default)\b", plan))
+        assert len(partitions) == 1, plan
+        assert "man_page_search_default" not in partitions, plan
+
+
+async def test_attached_partition_adopts_its_prebuilt_indexes() -> None:
+    engine = create_async_engine(_DATABASE_URL)
+    try:
+        async with engine.connect() as conn, conn.begin() as transaction:
+            release_id = await _seed(conn)
+            partition = search_partition_name(release_id)
+            indexes = (
+                await conn.execute(
+                    text(
+                        "SELECT indexrelid::regclass::text, "
+                        "pg_index.indexrelid IN (SELECT inhrelid FROM pg_inherits) "
+                        "FROM pg_index WHERE indrelid = CAST(:partition AS regclass)"
+                    ),
+                    {"partition": partition},
+                )
+            ).all()
+            leftover_checks = await conn.scalar(
+                text(
+                    "SELECT count(*) FROM pg_constraint WHERE contype = 'c' AND conrelid IN "
+                    "(CAST(:partition AS regclass), 'man_page_search_default'::regclass)"
+                ),
+                {"partition": partition},
+            )
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    # Only the indexes built before ATTACH, each now part of the parent's index.
+    assert {name for name, _attached in indexes} == {
+        f"{partition}_pkey",
+        *(
+            f"ix_search_{release_id.hex}_{suffix}"
+            for suffix in ("tsv", "release_name_norm", "name_trgm", "name_trgm_gist", "desc_trgm")
+        ),
+    }
+    assert all(attached for _name, attached in indexes)
+    assert leftover_checks == 0
+
+
+async def test_plan_cost_binds_quotes_and_backslashes() -> None:
+    engine = create_async_engine(_DATABASE_URL)
+    try:
+        async with engine.connect() as conn, conn.begin() as transaction:
+            release_id = await _seed(conn)
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            cost = await plan_cost(session, release_id=release_id, query="it's \\' grep\\")
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    assert cost > 0
+
+
+def _assert_index(plan: str, index_name: str) -> None:
+    assert "Seq Scan on man_page_search" not in plan, plan
+    assert index_name in plan, plan
+
+
+async def _plans(path: str, params: dict[str, str]) -> list[tuple[str, str]]:
+    engine = create_async_engine(_DATABASE_URL)
+    try:
+        async with engine.connect() as conn, conn.begin() as transaction:
+            await _seed(conn)
+            # A handful of rows is always cheaper to scan; ask for the plan at scale.
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            explaining = _ExplainingSession(session)
+
+            async def _session_dep():
+                yield explaining
+
+            # The search fan-out shares the one connection that sees the seed data.
+            @asynccontextmanager
+            async def _make_session():
+                yield explaining
+
+            app = create_app()
+            app.dependency_overrides[rate_limit_search] = _noop
+            app.dependency_overrides[get_session] = _session_dep
+            app.dependency_overrides[get_session_maker] = lambda: _make_session
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                res = await client.get(path, params=params)
+            assert res.status_code == 200, res.text
+
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+    return explaining.plans
+
+
+class _ExplainingSession:
+    """Records (sql, plan) of every statement passed to execute(), then runs it.
+
+    Calls are serialized: concurrent callers share one connection.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._lock = asyncio.Lock()
+        self.plans: list[tuple[str, str]] = []
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+    async def scalar(self, statement, *args, **kwargs):
+        async with self._lock:
+            return await self._session.scalar(statement, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        async with self._lock:
+            conn = await self._session.connection()
+            # The driver's own dialect: no pyformat escaping of `%`.
+            compiled = statement.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = await conn.exec_driver_sql(f"EXPLAIN {compiled}")
+            self.plans.append((str(compiled), "\n".join(row[0] for row in plan)))
+            return await self._session.execute(statement, *args, **kwargs)
+
+
+async def _seed(conn) -> uuid.UUID:
+    release_id = uuid.uuid4()
+    await conn.execute(text("UPDATE dataset_releases SET is_active = FALSE WHERE locale = 'en'"))
+    await conn.execute(
+        text(
+            """
+            INSERT INTO dataset_releases (
+              id, dataset_release_id, locale, distro, image_ref, image_digest, is_active
+            )
+            VALUES (:id, :dataset_release_id, 'en', 'debian', 'test', 'test', TRUE)
+            """
+        ),
+        {"id": release_id, "dataset_release_id": f"explain-{release_id}"},
+    )
+    for name, description in [
+        ("grep", "print lines that match patterns"),
+        ("groups", "print the groups a user is in"),
+        ("tar", "an archiving utility"),
+    ]:
+        page_id = uuid.uuid4()
+        await conn.execute(
+            text(
+                """
+                INSERT INTO man_pages (
+                  id, dataset_release_id, name, section, title, description,
+                  source_path, content_sha256, has_parse_warnings
+                )
+                VALUES (
+                  :id, :release_id, :name, '1', :name, :description,
+                  :source_path, 'explain', FALSE
+                )
+                """
+            ),
+            {
+                "id": page_id,
+                "release_id": release_id,
+                "name": name,
+                "description": description,
+                "source_path": f"/explain/{name}.1",
+            },
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO man_page_content (man_page_id, doc, plain_text)
+                VALUES (:id, '{}'::jsonb, :description)
+                """
+            ),
+            {"id": page_id, "description": description},
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO man_page_search (man_page_id, tsv, name_norm, desc_norm)
+                VALUES (:id, to_tsvector('simple', :description), :name, :description)
+                """
+            ),
+            {"id": page_id, "name": name, "description": description},
+        )
+    await fill_search_documents(conn, release_id=release_id)
+    await attach_search_partition(conn, release_id=release_id)
+    return release_id
+
+
+async def _noop() -> None:
+    return None
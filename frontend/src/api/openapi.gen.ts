@@ -4,6 +4,40 @@
  */
 
 export interface paths {
+    "/api/v1/complete": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /** Complete */
+        get: operations["complete_api_v1_complete_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/v1/content/{sha256}": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /** Get Content */
+        get: operations["get_content_api_v1_content__sha256__get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/info": {
         parameters: {
             query?: never;
@@ -89,6 +123,23 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/v1/man/{name}/{section}/envelope": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /** Get Man Envelope By Name And Section */
+        get: operations["get_man_envelope_by_name_and_section_api_v1_man__name___section__envelope_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/man/{name}/{section}/meta": {
         parameters: {
             query?: never;
@@ -253,6 +304,20 @@ export interface components {
              */
             type: "code";
         };
+        /** CompleteResponse */
+        CompleteResponse: {
+            /** Completions */
+            completions: components["schemas"]["Suggestion"][];
+            /** Prefix */
+            prefix: string;
+        };
+        /** ContentRef */
+        ContentRef: {
+            /** Sha256 */
+            sha256: string;
+            /** Url */
+            url: string;
+        };
         /** DefinitionListBlock */
         DefinitionListBlock: {
             /** Items */
@@ -399,14 +464,12 @@ export interface components {
         };
         /** ManPage */
         ManPage: {
-            /** Datasetreleaseid */
-            datasetReleaseId: string;
+            /** Contentunchangedsince */
+            contentUnchangedSince?: string | null;
             /** Description */
             description: string;
             /** Distro */
             distro: string;
-            /** Id */
-            id: string;
             /** Locale */
             locale: string;
             /** Name */
@@ -433,6 +496,13 @@ export interface components {
             /** Toc */
             toc: components["schemas"]["TocItem"][];
         };
+        /** ManPageEnvelopeResponse */
+        ManPageEnvelopeResponse: {
+            content: components["schemas"]["ContentRef"];
+            page: components["schemas"]["ManPage"];
+            /** Variants */
+            variants: components["schemas"]["ManPageVariant"][];
+        };
         /** ManPageMetaResponse */
         ManPageMetaResponse: {
             page: components["schemas"]["ManPage"];
@@ -448,8 +518,6 @@ export interface components {
         ManPageVariant: {
             /** Contentsha256 */
             contentSha256: string;
-            /** Datasetreleaseid */
-            datasetReleaseId: string;
             /** Distro */
             distro: string;
         };
@@ -479,10 +547,18 @@ export interface components {
             /** Items */
             items: components["schemas"]["SectionPage"][];
         };
+        /** SearchFacets */
+        SearchFacets: {
+            /** Section */
+            section: components["schemas"]["SectionFacet"][];
+        };
         /** SearchResponse */
         SearchResponse: {
+            facets?: components["schemas"]["SearchFacets"] | null;
             /** Hasmore */
             hasMore: boolean;
+            /** Nextcursor */
+            nextCursor?: string | null;
             /** Nextoffset */
             nextOffset?: number | null;
             /** Query */
@@ -505,6 +581,15 @@ export interface components {
             /** Title */
             title: string;
         };
+        /** SectionFacet */
+        SectionFacet: {
+            /** Count */
+            count: number;
+            /** Label */
+            label: string;
+            /** Section */
+            section: string;
+        };
         /** SectionLabel */
         SectionLabel: {
             /** Label */
@@ -529,6 +614,8 @@ export interface components {
             label: string;
             /** Limit */
             limit: number;
+            /** Nextcursor */
+            nextCursor?: string | null;
             /** Offset */
             offset: number;
             /** Results */
@@ -626,6 +713,70 @@ export interface components {
 }
 export type $defs = Record<string, never>;
 export interface operations {
+    complete_api_v1_complete_get: {
+        parameters: {
+            query: {
+                prefix: string;
+                limit?: number;
+                distro?: string | null;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CompleteResponse"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    get_content_api_v1_content__sha256__get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                sha256: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["ManPageContent"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_info_api_v1_info_get: {
         parameters: {
             query?: {
@@ -797,6 +948,40 @@ export interface operations {
             };
         };
     };
+    get_man_envelope_by_name_and_section_api_v1_man__name___section__envelope_get: {
+        parameters: {
+            query?: {
+                distro?: string | null;
+            };
+            header?: never;
+            path: {
+                name: string;
+                section: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["ManPageEnvelopeResponse"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_man_meta_by_name_and_section_api_v1_man__name___section__meta_get: {
         parameters: {
             query?: {
@@ -872,7 +1057,9 @@ export interface operations {
                 section?: string | null;
                 limit?: number;
                 offset?: number;
+                cursor?: string | null;
                 distro?: string | null;
+                facets?: "section" | null;
             };
             header?: never;
             path?: never;
@@ -905,6 +1092,7 @@ export interface operations {
             query?: {
                 limit?: number;
                 offset?: number;
+                cursor?: string | null;
                 distro?: string | null;
             };
             header?: never;
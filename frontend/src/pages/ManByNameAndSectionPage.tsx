@@ -52,7 +52,6 @@ export default function ManByNameAndSectionPage() {
   })
 
   const tocItems = pageQuery.data?.content.toc
-  const recentId = pageQuery.data?.page.id
   const recentName = pageQuery.data?.page.name
   const recentSection = pageQuery.data?.page.section
   const recentDescription = pageQuery.data?.page.description
@@ -63,13 +62,13 @@ export default function ManByNameAndSectionPage() {
   }, [setItems, tocItems])
 
   useEffect(() => {
-    if (!recentId || !recentName || !recentSection) return
+    if (!recentName || !recentSection) return
     recordRecentPage({
       name: recentName,
       section: recentSection,
       description: recentDescription,
     })
-  }, [recentDescription, recentId, recentName, recentSection])
+  }, [recentDescription, recentName, recentSection])
 
   if (pageQuery.isLoading) {
     return (
@@ -176,7 +175,7 @@ export default function ManByNameAndSectionPage() {
     headline: `${page.name}(${page.section}) - ${page.title}`,
     name: `${page.name}(${page.section})`,
     description: pageDescription,
-    dateModified: page.datasetReleaseId.split('+')[0] ?? undefined,
+    dateModified: page.contentUnchangedSince?.split('+')[0] ?? undefined,
     author: {
       '@type': 'Organization',
       name: `${page.sourcePackage || page.name} maintainers`,
@@ -199,7 +198,7 @@ export default function ManByNameAndSectionPage() {
         ) : null}
       </Helmet>
       <ManPageView
-        key={page.id}
+        key={`${page.distro}/${page.name}/${page.section}`}
         page={page}
         content={content}
         variants={variants}
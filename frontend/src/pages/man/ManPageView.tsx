@@ -151,7 +151,7 @@ export function ManPageView({
 
     for (const el of els) observer.observe(el)
     return () => observer.disconnect()
-  }, [content.toc, isVirtualized, page.id])
+  }, [content.toc, isVirtualized, page.name, page.section])
 
   useEffect(() => {
     const options = content.options ?? []
@@ -186,7 +186,7 @@ export function ManPageView({
     applyHash()
     window.addEventListener('hashchange', applyHash)
     return () => window.removeEventListener('hashchange', applyHash)
-  }, [content.options, page.id, scrollBehavior])
+  }, [content.options, page.name, page.section, scrollBehavior])
 
   const focusFindInput = () => {
     const isDesktop = window.matchMedia('(min-width: 1024px)').matches
@@ -335,9 +335,11 @@ export function ManPageView({
                 {page.sourcePackageVersion ? `@${page.sourcePackageVersion}` : ''}
               </span>
             ) : null}
-            <span className="min-w-0 max-w-full break-words rounded-full border border-[var(--bm-border)] bg-[color:var(--bm-bg)/0.35] px-3 py-1 font-mono">
-              dataset {page.datasetReleaseId}
-            </span>
+            {page.contentUnchangedSince ? (
+              <span className="min-w-0 max-w-full break-words rounded-full border border-[var(--bm-border)] bg-[color:var(--bm-bg)/0.35] px-3 py-1 font-mono">
+                unchanged since {page.contentUnchangedSince}
+              </span>
+            ) : null}
           </div>
 
           {content.synopsis?.length ? (
@@ -63,7 +63,6 @@ describe('public API timing and metadata', () => {
   it('serves metadata without loading full page content', async () => {
     apiMocks.fetchManMetaByNameAndSection.mockResolvedValue({
       page: {
-        id: 'page-1',
         locale: 'en',
         distro: 'debian',
         name: 'bash',
@@ -72,7 +71,6 @@ describe('public API timing and metadata', () => {
         description: 'command language interpreter',
         sourcePackage: 'bash',
         sourcePackageVersion: '5.2',
-        datasetReleaseId: 'debian:test',
       },
     })
 
@@ -119,7 +119,7 @@ export default async function ManByNameAndSectionPage({
         pageData.page.description ||
         pageData.page.title ||
         `${pageData.page.name}(${pageData.page.section}) man page.`,
-      dateModified: pageData.page.datasetReleaseId.split('+')[0] ?? undefined,
+      dateModified: pageData.page.contentUnchangedSince?.split('+')[0] ?? undefined,
       author: {
         '@type': 'Organization',
         name: `${pageData.page.sourcePackage || pageData.page.name} maintainers`,
@@ -129,12 +129,12 @@ export default async function ManByNameAndSectionPage({
     return (
       <>
         <JsonLdHead
-          id={`bm-jsonld:${pageData.page.id}`}
+          id={`bm-jsonld:${pageData.page.distro}/${pageData.page.name}/${pageData.page.section}`}
           nonce={nonce}
           jsonLd={jsonLd}
         />
         <ManPageView
-          key={pageData.page.id}
+          key={`${pageData.page.distro}/${pageData.page.name}/${pageData.page.section}`}
           page={pageData.page}
           content={pageData.content}
           variants={pageData.variants}
@@ -142,9 +142,11 @@ export function ManPageHeaderCard({
           </span>
         ) : null}
 
-        <span className="min-w-0 max-w-full break-words">
-          dataset <span className="text-muted">{page.datasetReleaseId}</span>
-        </span>
+        {page.contentUnchangedSince ? (
+          <span className="min-w-0 max-w-full break-words">
+            unchanged since <span className="text-muted">{page.contentUnchangedSince}</span>
+          </span>
+        ) : null}
       </div>
 
       {synopsis?.length ? (
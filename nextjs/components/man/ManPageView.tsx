@@ -111,7 +111,7 @@ export function ManPageView({
 
     for (const el of els) observer.observe(el)
     return () => observer.disconnect()
-  }, [content.toc, shouldVirtualize, page.id])
+  }, [content.toc, shouldVirtualize, page.name, page.section])
 
   useEffect(() => {
     const options = content.options ?? []
@@ -147,7 +147,7 @@ export function ManPageView({
     applyHash()
     window.addEventListener('hashchange', applyHash)
     return () => window.removeEventListener('hashchange', applyHash)
-  }, [content.options, page.id])
+  }, [content.options, page.name, page.section])
 
   useEffect(() => {
     const controller = new AbortController()